@@ -0,0 +1,76 @@
+from argparse import ArgumentParser
+from resource import getrusage, RUSAGE_SELF
+from subprocess import run
+from sys import executable
+from tempfile import NamedTemporaryFile
+from time import perf_counter
+from typing import Tuple
+from benchmarks.workload import sample_program
+from lp.lexer import BufferLexer, Lexer
+from lp.source import map_source
+from lp.token import TokenType
+
+_MODES = ['texto', 'buffer']
+
+def _anonymous_resident_mb() -> float:
+  with open('/proc/self/status') as status:
+    for line in status:
+      if line.startswith('RssAnon:'):
+        return int(line.split()[1]) / 1024
+      
+  return 0.0
+
+def _lex_text(path: str) -> Tuple[int, float]:
+  with open(path, encoding='utf-8') as file:
+    source = file.read()
+    
+  lexer: Lexer = Lexer(source)
+  count: int = 0
+  
+  while lexer.next_token().token_type != TokenType.EOF:
+    count += 1
+    
+  return count, _anonymous_resident_mb()
+
+def _lex_buffer(path: str) -> Tuple[int, float]:
+  with map_source(path) as buffer:
+    lexer: BufferLexer = BufferLexer(buffer)
+    count: int = 0
+    
+    while lexer.next_span()[0] != TokenType.EOF:
+      count += 1
+    
+    anonymous_mb = _anonymous_resident_mb()
+    del lexer
+  
+  return count, anonymous_mb
+
+def _run_mode(mode: str, path: str) -> None:
+  start = perf_counter()
+  tokens, anonymous_mb = _lex_text(path) if mode == 'texto' else _lex_buffer(path)
+  elapsed = perf_counter() - start
+  peak_kb = getrusage(RUSAGE_SELF).ru_maxrss
+  
+  print(f'{mode:>8} {tokens:>10} {elapsed:>9.3f} {tokens / elapsed:>12.0f} {peak_kb / 1024:>10.1f} {anonymous_mb:>10.1f}')
+
+def main() -> None:
+  parser = ArgumentParser()
+  parser.add_argument('--size', type=int, default=20_000_000)
+  parser.add_argument('--run', choices=_MODES)
+  parser.add_argument('path', nargs='?')
+  args = parser.parse_args()
+  
+  if args.run:
+    _run_mode(args.run, args.path)
+    return
+  
+  with NamedTemporaryFile('w', suffix='.lp', encoding='utf-8') as file:
+    file.write(sample_program(args.size))
+    file.flush()
+    
+    print(f'{"mode":>8} {"tokens":>10} {"seconds":>9} {"tokens/s":>12} {"peak MB":>10} {"anon MB":>10}')
+    for mode in _MODES:
+      run([executable, '-m', 'benchmarks.buffer_lexer_benchmark', '--run', mode, file.name], check=True)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,43 @@
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from benchmarks.workload import sample_program
+from lp.cache import ProgramCache
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+_DEFAULT_SIZE = 1_000_000
+_RUNS = 5
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  source = sample_program(size)
+
+  parse = float('inf')
+  for _ in range(_RUNS):
+    start = perf_counter()
+    Parser(Lexer(source)).parse_program()
+    parse = min(parse, perf_counter() - start)
+
+  with TemporaryDirectory() as directory:
+    cache: ProgramCache = ProgramCache(directory)
+
+    start = perf_counter()
+    cache.parse_program(source)
+    cold = perf_counter() - start
+
+    warm = float('inf')
+    for _ in range(_RUNS):
+      start = perf_counter()
+      cache.parse_program(source)
+      warm = min(warm, perf_counter() - start)
+
+    print(f'{len(source)} characters')
+    print(f'{"parse":<22} {parse:>8.3f} s')
+    print(f'{"cache miss (+ store)":<22} {cold:>8.3f} s')
+    print(f'{"cache hit":<22} {warm:>8.3f} s')
+    print(f'{cache.hits} hits, {cache.misses} misses, {cache.evictions} evictions')
+
+if __name__ == '__main__':
+  main()
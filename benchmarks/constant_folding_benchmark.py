@@ -0,0 +1,55 @@
+from sys import argv
+from time import perf_counter
+from typing import Callable
+
+from lp.ast import Program
+from lp.constant_folding import fold_constants
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+
+_DEFAULT_CALLS = 20_000
+_REPEAT = 5
+
+_FUNCTION: str = '''
+variable escala = procedimiento(x) {
+  si (longitud("abc") > 2) {
+    regresa x * (2 * (5 - 3)) + longitud("hola" + " mundo") - (10 / 3);
+  } si_no {
+    regresa -1;
+  }
+};
+'''
+
+def _best_time(run: Callable[[], object]) -> float:
+  best: float = float('inf')
+
+  for _ in range(_REPEAT):
+    start = perf_counter()
+    run()
+    best = min(best, perf_counter() - start)
+
+  return best
+
+def main() -> None:
+  calls = int(argv[1]) if len(argv) > 1 else _DEFAULT_CALLS
+  source: str = _FUNCTION + ''.join(f'escala({n});\n' for n in range(calls))
+
+  plain: Program = Parser(Lexer(source)).parse_program()
+  folded: Program = Parser(Lexer(source)).parse_program()
+
+  began = perf_counter()
+  fold_constants(folded)
+  fold_time = perf_counter() - began
+
+  plain_time = _best_time(lambda: evaluate(plain, Environment()) and None)
+  folded_time = _best_time(lambda: evaluate(folded, Environment()) and None)
+
+  print(f'{calls} calls')
+  print(f'{"fold pass":<12} {fold_time:>8.3f} s')
+  print(f'{"evaluate":<12} {plain_time:>8.3f} s')
+  print(f'{"folded":<12} {folded_time:>8.3f} s ({plain_time / folded_time:.2f}x)')
+
+if __name__ == '__main__':
+  main()
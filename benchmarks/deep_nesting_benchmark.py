@@ -0,0 +1,38 @@
+from sys import argv
+from time import perf_counter
+from typing import Callable, Dict, List, Type
+
+from lp.lexer import Lexer
+from lp.parser import Parser
+from lp.stack_parser import StackParser
+
+_DEFAULT_DEPTHS = [100, 1_000, 10_000]
+
+_SHAPES: Dict[str, Callable[[int], str]] = {
+  'parentheses': lambda depth: '(' * depth + '1' + ')' * depth + ';',
+  'prefixes': lambda depth: '-' * depth + '1;',
+  'si blocks': lambda depth: 'si (x) { ' * depth + '1' + ' }' * depth,
+  'right operands': lambda depth: ''.join(f'{n} + (' for n in range(depth)) + '1' + ')' * depth + ';',
+}
+
+def _time(parser_class: Type[Parser], source: str) -> str:
+  start = perf_counter()
+  try:
+    parser_class(Lexer(source)).parse_program()
+  except RecursionError:
+    return 'RecursionError'
+
+  return f'{(perf_counter() - start) * 1000:.2f} ms'
+
+def main() -> None:
+  depths: List[int] = [int(depth) for depth in argv[1:]] or _DEFAULT_DEPTHS
+
+  print(f'{"shape":<16} {"depth":>7} {"Parser":>16} {"StackParser":>16}')
+  for shape, generate in _SHAPES.items():
+    for depth in depths:
+      source = generate(depth)
+
+      print(f'{shape:<16} {depth:>7} {_time(Parser, source):>16} {_time(StackParser, source):>16}')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,52 @@
+from sys import argv
+from time import perf_counter
+from typing import List, Tuple
+
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+
+_DEFAULT_EVALUATIONS = 200_000
+_REPEAT = 5
+
+# One expression per node type, small enough that evaluating it is mostly
+# the dispatch to it and to its leaves.
+_SAMPLES: List[Tuple[str, str]] = [
+  ('Integer', '5'),
+  ('Boolean', 'verdadero'),
+  ('StringLiteral', '"a"'),
+  ('Identifier', 'g'),
+  ('Prefix', '-5'),
+  ('Infix +', '1 + 2'),
+  ('Infix >=', '1 >= 2'),
+  ('Infix string', '"a" == "b"'),
+  ('If', 'si (verdadero) { 1 }'),
+  ('Function', 'procedimiento(x) { x }'),
+  ('Call', 'f(1)'),
+]
+
+def main() -> None:
+  evaluations = int(argv[1]) if len(argv) > 1 else _DEFAULT_EVALUATIONS
+  env: Environment = Environment()
+  evaluate(Parser(Lexer('variable g = 1; variable f = procedimiento(x) { x };')).parse_program(), env)
+
+  print(f'{"node":<14} {"ns/evaluation":>14}')
+  for name, source in _SAMPLES:
+    program: Program = Parser(Lexer(source + ';')).parse_program()
+    evaluate(program, env)
+    node = program.statements[0].expression  # type: ignore
+    nodes = [node] * evaluations
+    best: float = float('inf')
+
+    for _ in range(_REPEAT):
+      start = perf_counter()
+      for node in nodes:
+        evaluate(node, env)
+      best = min(best, perf_counter() - start)
+
+    print(f'{name:<14} {best / evaluations * 1e9:>14.0f}')
+
+if __name__ == '__main__':
+  main()
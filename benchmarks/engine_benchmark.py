@@ -0,0 +1,65 @@
+from sys import argv
+from time import perf_counter
+from typing import Dict
+
+from lp.ast import Program
+from lp.engines import ENGINES
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+
+_REPEAT = 5
+
+# Programs whose time goes into running rather than parsing; scale sets
+# how much work each one does, without recursing deeper than the evaluator
+# can.
+def _programs(scale: int) -> Dict[str, str]:
+  return {
+    'fib': f'''
+      variable fib = procedimiento(n) {{ si (n < 2) {{ n }} si_no {{ fib(n - 1) + fib(n - 2) }} }};
+      fib({14 + scale});
+    ''',
+    'strings': f'''
+      variable repite = procedimiento(texto, n) {{
+        si (n == 0) {{ "" }} si_no {{ texto + "," + repite(texto, n - 1) }}
+      }};
+      variable total = procedimiento() {{ longitud(repite("ab", 80)) }};
+      {"total();" * 20 * scale}
+    ''',
+    'closures': f'''
+      variable sumador = procedimiento(base) {{ procedimiento(x) {{ base + x }} }};
+      variable compone = procedimiento(f, g) {{ procedimiento(x) {{ f(g(x)) }} }};
+      variable aplica = procedimiento(f, n) {{ si (n == 0) {{ 0 }} si_no {{ f(n) + aplica(f, n - 1) }} }};
+      variable ronda = procedimiento(n) {{ aplica(compone(sumador(n), sumador(1)), 80) }};
+      {"ronda(3);" * 20 * scale}
+    ''',
+  }
+
+def main() -> None:
+  scale = int(argv[1]) if len(argv) > 1 else 4
+  engines = list(ENGINES)
+
+  print(f'{"program":<10}' + ''.join(f'{engine:>12}' for engine in engines))
+  for name, source in _programs(scale).items():
+    program: Program = Parser(Lexer(source)).parse_program()
+    times: Dict[str, float] = {}
+
+    for engine in engines:
+      results = set()
+      best: float = float('inf')
+
+      for _ in range(_REPEAT):
+        start = perf_counter()
+        result = ENGINES[engine](program, Environment())
+        best = min(best, perf_counter() - start)
+        results.add(result.inspect() if result is not None else None)
+
+      assert len(results) == 1
+      times[engine] = best
+
+    baseline: float = times[engines[0]]
+    print(f'{name:<10}' + ''.join(f'{times[engine]:>8.3f} s' for engine in engines))
+    print(f'{"":<10}' + ''.join(f'{baseline / times[engine]:>11.2f}x' for engine in engines))
+
+if __name__ == '__main__':
+  main()
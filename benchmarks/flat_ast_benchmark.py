@@ -0,0 +1,56 @@
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from benchmarks.workload import sample_program
+from lp.flat_ast import FlatAST
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+_DEFAULT_SIZE = 1_000_000
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  source = sample_program(size)
+
+  began = perf_counter()
+  program = Parser(Lexer(source)).parse_program()
+  parse_time = perf_counter() - began
+
+  began = perf_counter()
+  flat: FlatAST = FlatAST(program)
+  flatten_time = perf_counter() - began
+
+  began = perf_counter()
+  FlatAST.parse(Parser(Lexer(source)))
+  parse_flat_time = perf_counter() - began
+
+  began = perf_counter()
+  flat.program()
+  materialize_time = perf_counter() - began
+
+  del program
+  start()
+  program = Parser(Lexer(source)).parse_program()
+  classes_bytes, classes_peak = get_traced_memory()
+  stop()
+
+  del program
+  start()
+  FlatAST.parse(Parser(Lexer(source)))
+  _, flat_peak = get_traced_memory()
+  stop()
+
+  nodes = len(flat)
+  print(f'{len(source)} characters, {nodes} nodes')
+  print(f'{"classes":<10} {classes_bytes / nodes:>8.1f} bytes/node {classes_bytes / 2**20:>8.2f} MiB')
+  print(f'{"flat":<10} {flat.nbytes() / nodes:>8.1f} bytes/node {flat.nbytes() / 2**20:>8.2f} MiB')
+  print(f'{"peak parsing to classes":<28} {classes_peak / 2**20:>8.2f} MiB')
+  print(f'{"peak parsing to flat":<28} {flat_peak / 2**20:>8.2f} MiB')
+  print(f'{"parse to classes":<28} {parse_time:>8.3f} s')
+  print(f'{"flatten classes":<28} {flatten_time:>8.3f} s')
+  print(f'{"parse to flat":<28} {parse_flat_time:>8.3f} s')
+  print(f'{"materialize flat to classes":<28} {materialize_time:>8.3f} s (function bodies stay lazy)')
+
+if __name__ == '__main__':
+  main()
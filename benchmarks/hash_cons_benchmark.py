@@ -0,0 +1,44 @@
+from gc import collect
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from benchmarks.workload import duplicated_program
+from lp.hash_cons import HashConser
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+_DEFAULT_SIZE = 1_000_000
+
+def _retained(source: str, hash_cons: bool) -> int:
+  collect()
+  start()
+  program = Parser(Lexer(source), hash_cons=hash_cons).parse_program()
+  collect()
+  retained, _ = get_traced_memory()
+  stop()
+  del program
+
+  return retained
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  source = duplicated_program(size)
+
+  program = Parser(Lexer(source)).parse_program()
+  conser: HashConser = HashConser()
+  began = perf_counter()
+  conser.program(program)
+  pass_time = perf_counter() - began
+
+  plain_bytes = _retained(source, False)
+  shared_bytes = _retained(source, True)
+
+  print(f'{len(source)} characters')
+  print(f'{"nodes":<10} {conser.visited:>10} -> {conser.unique:>8} ({conser.visited / conser.unique:.0f}x fewer)')
+  print(f'{"memory":<10} {plain_bytes / 2**20:>8.2f} MiB -> {shared_bytes / 2**20:.2f} MiB '
+    f'({plain_bytes / shared_bytes:.1f}x less)')
+  print(f'{"pass":<10} {pass_time:>8.3f} s')
+
+if __name__ == '__main__':
+  main()
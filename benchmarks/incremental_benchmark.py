@@ -0,0 +1,44 @@
+from sys import argv
+from time import perf_counter
+from typing import List
+
+from benchmarks.workload import sample_program
+from lp.incremental import IncrementalDocument
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+_DEFAULT_LINES = 50_000
+
+def _program_with_lines(lines: int) -> str:
+  source = sample_program(lines * 40)
+  
+  return '\n'.join(source.split('\n')[:lines])
+
+def main() -> None:
+  lines = int(argv[1]) if len(argv) > 1 else _DEFAULT_LINES
+  source = _program_with_lines(lines)
+  
+  start = perf_counter()
+  Parser(Lexer(source)).parse_program()
+  full = perf_counter() - start
+  
+  document: IncrementalDocument = IncrementalDocument(source)
+  print(f'{lines} lines, {len(source)} characters')
+  print(f'{"full re-parse":<28} {full * 1000:>10.2f} ms')
+  
+  middle = source.index('regresa x + y', len(source) // 2)
+  edits: List[tuple] = [
+    ('insert one character', middle + len('regresa x'), 0, '2'),
+    ('replace a statement', middle, len('regresa x + y'), 'regresa (x - y) * 3'),
+    ('insert a statement', middle, 0, 'variable nueva = "texto"; '),
+  ]
+  
+  for label, offset, removed, inserted in edits:
+    start = perf_counter()
+    document.edit(offset, removed, inserted)
+    elapsed = perf_counter() - start
+    
+    print(f'{label:<28} {elapsed * 1000:>10.2f} ms')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,56 @@
+from sys import argv
+from time import perf_counter
+from typing import Callable
+
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.inliner import Inliner
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+
+_DEFAULT_CALLS = 5_000
+_REPEAT = 5
+
+_HELPERS: str = '''
+variable doble = procedimiento(x) { x * 2 };
+variable incrementa = procedimiento(x) { x + 1 };
+variable es_par = procedimiento(n) { n % 2 == 0 };
+variable cuadrado = procedimiento(x) { x * x };
+variable calcula = procedimiento(n) {
+  si (es_par(n)) { doble(incrementa(n)) } si_no { cuadrado(n) + doble(n) }
+};
+'''
+
+def _best_time(run: Callable[[], object]) -> float:
+  best: float = float('inf')
+
+  for _ in range(_REPEAT):
+    start = perf_counter()
+    run()
+    best = min(best, perf_counter() - start)
+
+  return best
+
+def main() -> None:
+  calls = int(argv[1]) if len(argv) > 1 else _DEFAULT_CALLS
+  source: str = _HELPERS + ''.join(f'calcula({n});\n' for n in range(calls))
+
+  plain: Program = Parser(Lexer(source)).parse_program()
+  inlined: Program = Parser(Lexer(source)).parse_program()
+
+  began = perf_counter()
+  inliner: Inliner = Inliner(inlined)
+  inliner.visit(inlined)
+  inline_time = perf_counter() - began
+
+  plain_time = _best_time(lambda: evaluate(plain, Environment()) and None)
+  inlined_time = _best_time(lambda: evaluate(inlined, Environment()) and None)
+
+  print(f'{calls} calls, {inliner.inlined} call sites inlined')
+  print(f'{"inline pass":<12} {inline_time:>8.3f} s')
+  print(f'{"evaluate":<12} {plain_time:>8.3f} s')
+  print(f'{"inlined":<12} {inlined_time:>8.3f} s ({plain_time / inlined_time:.2f}x)')
+
+if __name__ == '__main__':
+  main()
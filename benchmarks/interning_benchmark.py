@@ -0,0 +1,85 @@
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import List
+
+from lp.lexer import Lexer
+from lp.object import Environment, Integer
+from lp.parser import Parser
+from lp.token import Token, TokenType
+
+_DEFAULT_STATEMENTS = 20_000
+_NAMES = ['total', 'valor', 'contador', 'resultado', 'indice', 'acumulado']
+_DEPTH = 8
+_LOOKUPS = 1_000_000
+
+class _CopyingLexer(Lexer):
+  # Gives every identifier occurrence its own string, as before interning.
+  def next_token(self) -> Token:
+    token = super().next_token()
+
+    if token.token_type == TokenType.IDENT:
+      return token._replace(literal=(token.literal + ' ')[:-1])
+
+    return token
+
+def _repeated_names_program(statements: int) -> str:
+  lines: List[str] = []
+
+  for n in range(statements):
+    name = _NAMES[n % len(_NAMES)]
+    other = _NAMES[(n + 1) % len(_NAMES)]
+    lines.append(f'variable {name} = {other} + {name} * {other} - {name};')
+
+  return '\n'.join(lines)
+
+def _ast_memory(lexer: Lexer) -> int:
+  start()
+  program = Parser(lexer).parse_program()
+  current, _ = get_traced_memory()
+  stop()
+  del program
+
+  return current
+
+def _lookup(env: Environment, names: List[str]) -> float:
+  began = perf_counter()
+
+  for _ in range(_LOOKUPS // len(names)):
+    for name in names:
+      env[name]
+
+  return perf_counter() - began
+
+def _tokens(source: str) -> List[Token]:
+  lexer: Lexer = Lexer(source)
+  tokens: List[Token] = []
+
+  while (token := lexer.next_token()).token_type != TokenType.EOF:
+    tokens.append(token)
+
+  return tokens
+
+def main() -> None:
+  statements = int(argv[1]) if len(argv) > 1 else _DEFAULT_STATEMENTS
+  source = _repeated_names_program(statements)
+
+  print(f'{statements} statements, {len(source)} characters')
+  for label, lexer in [('copied names', _CopyingLexer(source)), ('interned names', Lexer(source))]:
+    print(f'{label:<16} {_ast_memory(lexer) / 2**20:>7.2f} MiB of AST')
+
+  env: Environment = Environment()
+  for name in _NAMES:
+    env[name] = Integer(1)
+  for _ in range(_DEPTH):
+    env = Environment(outer=env)
+
+  interned: List[str] = [token.literal for token in _tokens(' '.join(_NAMES))]
+  copied: List[str] = [(name + ' ')[:-1] for name in _NAMES]
+
+  for label, names in [('copied names', copied), ('interned names', interned)]:
+    elapsed = min(_lookup(env, names) for _ in range(3))
+    print(f'{label:<16} {elapsed / _LOOKUPS * 1e9:>7.1f} ns per lookup {_DEPTH} scopes deep')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,33 @@
+from sys import argv
+from time import perf_counter
+from typing import Type
+
+from benchmarks.workload import functions_program
+from lp.evaluator import evaluate
+from lp.lazy_parser import LazyParser
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+
+_DEFAULT_SIZE = 1_000_000
+_REPEAT = 3
+
+def _startup(parser_class: Type[Parser], source: str) -> float:
+  start = perf_counter()
+  program = parser_class(Lexer(source)).parse_program()
+  evaluate(program, Environment())
+
+  return perf_counter() - start
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  prelude = functions_program(size, statements=8)
+  source = prelude + 'f_0(1, 2, 3, 4) + f_1(5, 6, 7, 8);'
+
+  print(f'prelude of {len(prelude)} characters, {prelude.count("procedimiento")} functions, 2 called')
+  for parser_class in [Parser, LazyParser]:
+    elapsed = min(_startup(parser_class, source) for _ in range(_REPEAT))
+    print(f'{parser_class.__name__:<12} {elapsed:>8.3f} s to parse and run')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,36 @@
+from sys import argv
+from time import perf_counter
+
+from benchmarks.workload import sample_program
+from lp.lexer import Lexer
+from lp.token import TokenType
+
+_DEFAULT_SIZES = [1_000_000, 4_000_000]
+_REPEAT = 5
+
+def _count_tokens(source: str) -> int:
+  lexer: Lexer = Lexer(source)
+  count: int = 0
+
+  while lexer.next_token().token_type != TokenType.EOF:
+    count += 1
+
+  return count
+
+def main() -> None:
+  sizes = [int(size) for size in argv[1:]] or _DEFAULT_SIZES
+
+  print(f'{"bytes":>12} {"tokens":>10} {"seconds":>9} {"tokens/s":>12}')
+  for size in sizes:
+    source = sample_program(size)
+
+    elapsed = float('inf')
+    for _ in range(_REPEAT):
+      start = perf_counter()
+      tokens = _count_tokens(source)
+      elapsed = min(elapsed, perf_counter() - start)
+
+    print(f'{len(source):>12} {tokens:>10} {elapsed:>9.3f} {tokens / elapsed:>12.0f}')
+
+if __name__ == '__main__':
+  main()
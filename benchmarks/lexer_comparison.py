@@ -0,0 +1,98 @@
+from argparse import ArgumentParser
+from importlib import import_module
+from pathlib import Path
+from subprocess import run
+from sys import modules, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from types import ModuleType
+from typing import Dict, List, Tuple
+
+from benchmarks.workload import sample_program
+from lp.source import LineIndex
+
+# Times the lexer of a git revision against the working tree's on the same
+# source, each loaded from its own copy of the lp modules it needs. Given
+# the revision before the master pattern lexer, it compares that lexer with
+# the per-character one it replaced:
+#
+#   python -m benchmarks.lexer_comparison 4a004f7 --size 1000000 4000000
+_REPOSITORY = Path(__file__).resolve().parent.parent
+_MODULES = ['lp/__init__.py', 'lp/token.py', 'lp/lexer.py']
+
+def _load_lexer_module(root: str) -> ModuleType:
+  for name in [name for name in modules if name == 'lp' or name.startswith('lp.')]:
+    del modules[name]
+  
+  path.insert(0, root)
+  try:
+    return import_module('lp.lexer')
+  finally:
+    path.remove(root)
+
+def _checkout(revision: str, directory: str) -> None:
+  (Path(directory) / 'lp').mkdir()
+  
+  for module in _MODULES:
+    content = run(
+      ['git', 'show', f'{revision}:{module}'],
+      cwd=_REPOSITORY, capture_output=True, check=True
+    ).stdout
+    (Path(directory) / module).write_bytes(content)
+
+# Seconds to lex the source, and the tokens it gave.
+def _lex(lexer_module: ModuleType, source: str) -> Tuple[float, int]:
+  eof = lexer_module.TokenType.EOF
+  start = perf_counter()
+  lexer = lexer_module.Lexer(source)
+  tokens: int = 0
+  
+  while lexer.next_token().token_type != eof:
+    tokens += 1
+  
+  return perf_counter() - start, tokens
+
+def main() -> None:
+  parser = ArgumentParser()
+  parser.add_argument('revision', nargs='?', default='HEAD')
+  parser.add_argument('--size', type=int, nargs='+', default=[1_000_000])
+  parser.add_argument('--repeat', type=int, default=10)
+  args = parser.parse_args()
+  
+  with TemporaryDirectory() as directory:
+    _checkout(args.revision, directory)
+    lexers: Dict[str, ModuleType] = {
+      args.revision: _load_lexer_module(directory),
+      'working tree': _load_lexer_module(str(_REPOSITORY)),
+    }
+    
+    for size in args.size:
+      source = sample_program(size)
+      best: Dict[str, float] = {name: float('inf') for name in lexers}
+      tokens: Dict[str, int] = {}
+      for _ in range(args.repeat):
+        for name, lexer_module in lexers.items():
+          seconds, tokens[name] = _lex(lexer_module, source)
+          best[name] = min(best[name], seconds)
+      
+      print(f'{len(source)} characters')
+      for name, seconds in best.items():
+        print(f'  {name:<14} {seconds:>8.3f} s {tokens[name] / seconds:>12,.0f} tok/s')
+      
+      baseline, current = best[args.revision], best['working tree']
+      print(f'  {"overhead":<14} {(current / baseline - 1) * 100:>+8.1f} % ({baseline / current:.2f}x as fast)')
+  
+  start = perf_counter()
+  lines: LineIndex = LineIndex(source)
+  build = perf_counter() - start
+  
+  positions: List[int] = list(range(0, len(source), max(1, len(source) // 10_000)))
+  start = perf_counter()
+  for position in positions:
+    lines.location(position)
+  lookup = (perf_counter() - start) / len(positions)
+  
+  print(f'{"line index":<14} {build:>8.3f} s to build, {lookup * 1e6:.2f} us per lookup')
+
+if __name__ == '__main__':
+  main()
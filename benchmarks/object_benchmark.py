@@ -0,0 +1,75 @@
+from sys import getsizeof, setrecursionlimit
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import Callable, List, Tuple
+
+from lp.ast import Block, Token
+from lp.builtins import longitud
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import (
+  Boolean,
+  Builtin,
+  Environment,
+  Error,
+  Function,
+  Integer,
+  Object,
+  Return,
+  String,
+)
+from lp.parser import Parser
+from lp.token import TokenType
+
+_FIB: str = '''
+variable fib = procedimiento(n) {
+  si (n < 2) {
+    regresa n;
+  } si_no {
+    regresa fib(n - 1) + fib(n - 2);
+  }
+};
+fib(25);
+'''
+_REPEAT = 3
+
+_INSTANCES = 10_000
+
+def _object_size(create: Callable[[], Object]) -> float:
+  start()
+  objects: List[Object] = [create() for _ in range(_INSTANCES)]
+  current, _ = get_traced_memory()
+  stop()
+
+  return (current - getsizeof(objects)) / len(objects)
+
+def main() -> None:
+  body = Block(Token(TokenType.LBRACE, '{'), [])
+  env = Environment()
+  value = Integer(1_000)
+  objects: List[Tuple[str, Callable[[], Object]]] = [
+    ('Integer', lambda: Integer(1_000)),
+    ('Boolean', lambda: Boolean(True)),
+    ('String', lambda: String('hola')),
+    ('Return', lambda: Return(value)),
+    ('Error', lambda: Error('mensaje')),
+    ('Function', lambda: Function([], body, env)),
+    ('Builtin', lambda: Builtin(longitud)),
+  ]
+
+  for name, create in objects:
+    print(f'{name:<10} {_object_size(create):>7.1f} bytes')
+
+  setrecursionlimit(10_000)
+  program = Parser(Lexer(_FIB)).parse_program()
+  elapsed = float('inf')
+  for _ in range(_REPEAT):
+    began = perf_counter()
+    result = evaluate(program, Environment())
+    elapsed = min(elapsed, perf_counter() - began)
+
+  assert result is not None
+  print(f'fib(25) = {result.inspect()} in {elapsed:.3f} s')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,49 @@
+from sys import argv
+from time import perf_counter
+from typing import Callable
+
+from benchmarks.inlining_benchmark import _HELPERS
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.optimizer import LEVELS, Optimizer
+from lp.parser import Parser
+
+_DEFAULT_CALLS = 5_000
+_REPEAT = 5
+
+_KERNEL: str = '''
+variable norma = procedimiento(a, b) {
+  regresa (a * a + b * b) * 1 + (a * a + b * b) / 2 - (a - b) * 0;
+  a;
+};
+'''
+
+def _best_time(run: Callable[[], object]) -> float:
+  best: float = float('inf')
+
+  for _ in range(_REPEAT):
+    start = perf_counter()
+    run()
+    best = min(best, perf_counter() - start)
+
+  return best
+
+def main() -> None:
+  calls = int(argv[1]) if len(argv) > 1 else _DEFAULT_CALLS
+  source: str = _HELPERS + _KERNEL + ''.join(f'norma(calcula({n}), {n});\n' for n in range(calls))
+  baseline: float = 0.0
+
+  for level in LEVELS:
+    optimizer: Optimizer = Optimizer(level)
+    program: Program = optimizer.optimize(Parser(Lexer(source)).parse_program())
+    seconds: float = _best_time(lambda: evaluate(program, Environment()) and None)
+    baseline = baseline or seconds
+
+    print(f'-O{level} {seconds:>8.3f} s ({baseline / seconds:.2f}x)')
+    for report in optimizer.reports:
+      print(f'  {report.name:<22} {report.seconds * 1000:>8.1f} ms {report.changed:>6} nodos')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,36 @@
+from os import cpu_count
+from sys import argv
+from time import perf_counter
+
+from benchmarks.workload import sample_program
+from lp.lexer import Lexer
+from lp.parallel import ParallelParser
+from lp.parser import Parser
+
+_DEFAULT_SIZE = 5_000_000
+_WORKERS = (1, 2, 4, 8)
+_REPEAT = 3
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  source = sample_program(size)
+  print(f'{len(source)} characters, {cpu_count()} CPUs')
+  
+  sequential = float('inf')
+  for _ in range(_REPEAT):
+    start = perf_counter()
+    Parser(Lexer(source)).parse_program()
+    sequential = min(sequential, perf_counter() - start)
+  print(f'{"sequential":<12} {sequential:>8.3f} s')
+  
+  for workers in _WORKERS:
+    best = float('inf')
+    for _ in range(_REPEAT):
+      start = perf_counter()
+      ParallelParser(source, workers).parse_program()
+      best = min(best, perf_counter() - start)
+      
+    print(f'{workers:>2} workers   {best:>8.3f} s   {sequential / best:>5.2f}x')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,44 @@
+from sys import argv
+from time import perf_counter
+from typing import Optional, Tuple
+
+from benchmarks.engine_benchmark import _programs
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.parser import Parser
+from lp.quickening import Quickener
+
+_REPEAT = 5
+
+# Parses the program again for every run, since nodes keep their variants
+# between runs and only a fresh tree shows what warming up costs.
+def _time(source: str, quickening: bool) -> Tuple[float, Optional[str], Tuple[int, int]]:
+  best: float = float('inf')
+  result: Optional[Object] = None
+  counts: Tuple[int, int] = (0, 0)
+
+  for _ in range(_REPEAT):
+    program = Parser(Lexer(source)).parse_program()
+    quickener: Quickener = Quickener()
+
+    start = perf_counter()
+    result = quickener.evaluate(program, Environment()) if quickening else evaluate(program, Environment())
+    best = min(best, perf_counter() - start)
+    counts = (quickener.specialized, quickener.deoptimized)
+
+  return best, result.inspect() if result is not None else None, counts
+
+def main() -> None:
+  scale = int(argv[1]) if len(argv) > 1 else 4
+
+  print(f'{"program":<10}{"arbol":>10}{"adaptativo":>12}{"speedup":>9}{"specialized":>13}{"deoptimized":>13}')
+  for name, source in _programs(scale).items():
+    tree, expected, _ = _time(source, False)
+    quickened, result, (specialized, deoptimized) = _time(source, True)
+
+    assert result == expected
+    print(f'{name:<10}{tree:>8.3f} s{quickened:>10.3f} s{tree / quickened:>8.2f}x{specialized:>13}{deoptimized:>13}')
+
+if __name__ == '__main__':
+  main()
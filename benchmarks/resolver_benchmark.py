@@ -0,0 +1,46 @@
+from sys import argv
+from time import perf_counter
+from typing import List
+
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+
+_DEPTHS = [1, 4, 16, 64]
+_DEFAULT_CALLS = 200
+_ACCESSES = 100
+_REPEAT = 3
+
+# depth closures nested inside each other; the innermost one reads the
+# outermost parameter and a global over and over.
+def _program(depth: int, calls: int) -> str:
+  opening: str = ''.join(f'procedimiento(a{level}) {{ ' for level in range(depth))
+  body: str = ''.join('a0 + g; ' for _ in range(_ACCESSES))
+  closure: str = 'f' + ''.join(f'({level})' for level in range(depth - 1))
+
+  return (
+    f'variable g = 1;\n'
+    f'variable f = {opening}{body}{" }" * depth};\n'
+    f'variable interior = {closure};\n'
+    + 'interior(0);\n' * calls
+  )
+
+def main() -> None:
+  calls = int(argv[1]) if len(argv) > 1 else _DEFAULT_CALLS
+
+  print(f'{"depth":>6} {"seconds":>9} {"ns/access":>10}')
+  for depth in _DEPTHS:
+    program = Parser(Lexer(_program(depth, calls))).parse_program()
+    times: List[float] = []
+
+    for _ in range(_REPEAT):
+      start = perf_counter()
+      evaluate(program, Environment())
+      times.append(perf_counter() - start)
+
+    elapsed = min(times)
+    print(f'{depth:>6} {elapsed:>9.3f} {elapsed / (calls * _ACCESSES * 2) * 1e9:>10.0f}')
+
+if __name__ == '__main__':
+  main()
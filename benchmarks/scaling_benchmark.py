@@ -0,0 +1,67 @@
+from argparse import ArgumentParser
+from sys import exit
+from time import perf_counter
+from typing import Callable, List
+
+from benchmarks.workload import SHAPES
+from lp.lexer import Lexer
+from lp.parser import Parser
+from lp.token import TokenType
+
+_MULTIPLIERS = [1, 10, 100]
+
+def _lex(source: str) -> None:
+  lexer: Lexer = Lexer(source)
+
+  while lexer.next_token().token_type != TokenType.EOF:
+    pass
+
+def _parse(source: str) -> None:
+  Parser(Lexer(source)).parse_program()
+
+def _best_time(run: Callable[[str], None], source: str, repeat: int) -> float:
+  best: float = float('inf')
+
+  for _ in range(repeat):
+    start = perf_counter()
+    run(source)
+    best = min(best, perf_counter() - start)
+
+  return best
+
+def main() -> None:
+  parser = ArgumentParser()
+  parser.add_argument('shapes', nargs='*', default=list(SHAPES))
+  parser.add_argument('--size', type=int, default=10_000, help='characters at 1x')
+  parser.add_argument('--repeat', type=int, default=3)
+  parser.add_argument(
+    '--tolerance', type=float, default=2.0,
+    help='allowed slowdown per character between 1x and the largest size'
+  )
+  args = parser.parse_args()
+
+  failures: List[str] = []
+  print(f'{"shape":<16} {"stage":<7} {"size":>10} {"seconds":>9} {"MB/s":>8}')
+
+  for shape in args.shapes:
+    for stage, run in [('lexer', _lex), ('parser', _parse)]:
+      times: List[float] = []
+
+      for multiplier in _MULTIPLIERS:
+        source = SHAPES[shape](args.size * multiplier)
+        elapsed = _best_time(run, source, args.repeat)
+        times.append(elapsed / len(source))
+
+        print(f'{shape:<16} {stage:<7} {len(source):>10} {elapsed:>9.4f} {len(source) / elapsed / 1e6:>8.2f}')
+
+      growth = times[-1] / times[0]
+      if growth > args.tolerance:
+        failures.append(f'{shape} {stage}: time per character grew {growth:.2f}x')
+
+  for failure in failures:
+    print(f'super-linear: {failure}')
+
+  exit(1 if failures else 0)
+
+if __name__ == '__main__':
+  main()
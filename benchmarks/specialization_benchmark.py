@@ -0,0 +1,57 @@
+from sys import argv
+from time import perf_counter
+from typing import Callable
+
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+from lp.specializer import Specializer
+
+_DEFAULT_CALLS = 2_000
+_REPEAT = 5
+
+_LIBRARY: str = '''
+variable potencia = procedimiento(x, n) {
+  si (n == 0) { 1 } si_no { si (n % 2 == 0) { potencia(x * x, n / 2) } si_no { x * potencia(x, n - 1) } }
+};
+variable formatear = procedimiento(formato, fila) {
+  si (formato == "csv") { fila + "," } si_no { si (formato == "tsv") { fila + "\t" } si_no { fila + " " } }
+};
+variable cubo = procedimiento(x) { potencia(x, 3) };
+variable linea = procedimiento(x) { longitud(formatear("csv", "fila")) + potencia(x, 10) };
+'''
+
+def _best_time(run: Callable[[], object]) -> float:
+  best: float = float('inf')
+
+  for _ in range(_REPEAT):
+    start = perf_counter()
+    run()
+    best = min(best, perf_counter() - start)
+
+  return best
+
+def main() -> None:
+  calls = int(argv[1]) if len(argv) > 1 else _DEFAULT_CALLS
+  source: str = _LIBRARY + ''.join(f'cubo({n}) + linea({n});\n' for n in range(calls))
+
+  plain: Program = Parser(Lexer(source)).parse_program()
+  specialized: Program = Parser(Lexer(source)).parse_program()
+
+  began = perf_counter()
+  specializer: Specializer = Specializer(specialized)
+  specializer.visit(specialized)
+  specialize_time = perf_counter() - began
+
+  plain_time = _best_time(lambda: evaluate(plain, Environment()) and None)
+  specialized_time = _best_time(lambda: evaluate(specialized, Environment()) and None)
+
+  print(f'{calls} calls, {specializer.specialized} call sites specialized, {specializer.copies} copies')
+  print(f'{"specialize":<12} {specialize_time:>8.3f} s')
+  print(f'{"evaluate":<12} {plain_time:>8.3f} s')
+  print(f'{"specialized":<12} {specialized_time:>8.3f} s ({plain_time / specialized_time:.2f}x)')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,60 @@
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import List
+
+from benchmarks.workload import sample_program
+from lp.lexer import Lexer
+from lp.parser import Parser
+from lp.token import Token, TokenType
+from lp.token_buffer import TokenBuffer
+
+_DEFAULT_SIZE = 2_000_000
+
+def _token_list(source: str) -> List[Token]:
+  lexer: Lexer = Lexer(source)
+  tokens: List[Token] = []
+  
+  while (token := lexer.next_token()).token_type != TokenType.EOF:
+    tokens.append(token)
+  tokens.append(token)
+    
+  return tokens
+
+def _traced_bytes(source: str, build) -> int:
+  start()
+  result = build(source)
+  current, _ = get_traced_memory()
+  stop()
+  del result
+  
+  return current
+
+def _timed(function) -> float:
+  begin = perf_counter()
+  function()
+  
+  return perf_counter() - begin
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  source = sample_program(size)
+  buffer: TokenBuffer = TokenBuffer(source)
+  count = len(buffer)
+  
+  list_bytes = _traced_bytes(source, _token_list)
+  buffer_bytes = _traced_bytes(source, TokenBuffer)
+  
+  print(f'{count} tokens over {len(source)} characters')
+  print(f'{"storage":<14} {"bytes/token":>12}')
+  print(f'{"List[Token]":<14} {list_bytes / count:>12.1f}')
+  print(f'{"TokenBuffer":<14} {buffer_bytes / count:>12.1f}')
+  print()
+  print(f'{"step":<24} {"seconds":>9}')
+  print(f'{"lex into List[Token]":<24} {_timed(lambda: _token_list(source)):>9.3f}')
+  print(f'{"lex into TokenBuffer":<24} {_timed(lambda: TokenBuffer(source)):>9.3f}')
+  print(f'{"parse from Lexer":<24} {_timed(lambda: Parser(Lexer(source)).parse_program()):>9.3f}')
+  print(f'{"re-parse from buffer":<24} {_timed(lambda: Parser(buffer.reader()).parse_program()):>9.3f}')
+
+if __name__ == '__main__':
+  main()
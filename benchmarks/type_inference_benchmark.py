@@ -0,0 +1,66 @@
+from sys import argv
+from time import perf_counter
+from typing import Callable, Dict
+
+from benchmarks.inlining_benchmark import _HELPERS
+from benchmarks.workload import SHAPES
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+from lp.type_inference import TypeInference
+
+_DEFAULT_SIZE = 50_000
+_REPEAT = 5
+
+_ARITHMETIC: str = '''
+variable potencia = procedimiento(base, exponente, acumulado) {
+  si (exponente < 1) { acumulado } si_no { potencia(base, exponente - 1, acumulado * base % 1000003) }
+};
+variable mezcla = procedimiento(a, b) { (a * 31 + b) % 65521 - (a / 7) + b * b };
+'''
+
+def _best_time(run: Callable[[], object]) -> float:
+  best: float = float('inf')
+
+  for _ in range(_REPEAT):
+    start = perf_counter()
+    run()
+    best = min(best, perf_counter() - start)
+
+  return best
+
+def main() -> None:
+  size = int(argv[1]) if len(argv) > 1 else _DEFAULT_SIZE
+  corpus: Dict[str, str] = {shape: generate(size) for shape, generate in SHAPES.items()}
+  corpus['helpers'] = _HELPERS + ''.join(f'calcula({n});\n' for n in range(size // 20))
+  corpus['arithmetic'] = _ARITHMETIC + ''.join(
+    f'potencia({n}, 20, 1);\nmezcla({n}, {n + 1});\n' for n in range(size // 50)
+  )
+
+  operations: int = 0
+  specialized: int = 0
+  print(f'{"program":<16} {"operations":>10} {"specialized":>11}')
+
+  for name, source in corpus.items():
+    inference: TypeInference = TypeInference()
+    inference.program(Parser(Lexer(source)).parse_program())
+    operations += inference.operations
+    specialized += inference.specialized
+    share = inference.specialized / inference.operations if inference.operations else 0.0
+
+    print(f'{name:<16} {inference.operations:>10} {inference.specialized:>11} {share:>7.1%}')
+
+  print(f'{"total":<16} {operations:>10} {specialized:>11} {specialized / operations:>7.1%}')
+
+  plain: Program = Parser(Lexer(corpus['arithmetic'])).parse_program()
+  typed: Program = TypeInference().program(Parser(Lexer(corpus['arithmetic'])).parse_program())
+  plain_time = _best_time(lambda: evaluate(plain, Environment()) and None)
+  typed_time = _best_time(lambda: evaluate(typed, Environment()) and None)
+
+  print(f'{"evaluate":<16} {plain_time:>8.3f} s')
+  print(f'{"typed":<16} {typed_time:>8.3f} s ({plain_time / typed_time:.2f}x)')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,70 @@
+from typing import Callable, Dict, List
+
+_SNIPPET: str = '''
+variable suma_{n} = procedimiento(x, y) {{
+  regresa x + y * {n} - (x / 2);
+}};
+variable saludo_{n} = "Hola mundo numero {n}";
+si (suma_{n}(1, 2) >= 10) {{
+  longitud(saludo_{n});
+}} si_no {{
+  !verdadero != falso;
+}}
+'''
+
+def _repeat(size: int, unit: Callable[[int], str]) -> str:
+  chunks: List[str] = []
+  length: int = 0
+  n: int = 0
+
+  while length < size:
+    chunk = unit(n)
+    chunks.append(chunk)
+    length += len(chunk)
+    n += 1
+
+  return ''.join(chunks)
+
+def sample_program(size: int) -> str:
+  return _repeat(size, lambda n: _SNIPPET.format(n=n))
+
+def nested_program(size: int, depth: int = 40) -> str:
+  def unit(n: int) -> str:
+    opening = ''.join(f'si ((x + {level}) > {n}) {{ ' for level in range(depth))
+
+    return f'variable x = {n};\n{opening}x{" }" * depth}\n'
+
+  return _repeat(size, unit)
+
+def addition_chain_program(size: int, terms: int = 500) -> str:
+  return _repeat(size, lambda n: f'variable total_{n} = {" + ".join(str(term) for term in range(terms))};\n')
+
+def functions_program(size: int, parameters: int = 4, statements: int = 1) -> str:
+  names: str = ', '.join(f'p{index}' for index in range(parameters))
+  total: str = ' + '.join(f'p{index}' for index in range(parameters))
+  body: str = ''.join(f'variable t{index} = ({total}) * {index}; ' for index in range(statements - 1))
+
+  return _repeat(size, lambda n: f'variable f_{n} = procedimiento({names}) {{ {body}regresa {total} * {n}; }};\n')
+
+def string_program(size: int, length: int = 5_000) -> str:
+  text: str = ('lorem ipsum {dolor} (sit); amet ' * (length // 32 + 1))[:length]
+
+  return _repeat(size, lambda n: f'variable texto_{n} = "{text}";\n')
+
+# What a code generator tends to emit: the same bodies over and over, with
+# only the names changing.
+def duplicated_program(size: int) -> str:
+  return _repeat(size, lambda n: (
+    f'variable f_{n} = procedimiento(x, y) {{ '
+    'si (x > y) { regresa (x - y) * 2 + longitud("generado"); } '
+    'si_no { regresa (y - x) * 2 + longitud("generado"); } };\n'
+  ))
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+  'mixed': sample_program,
+  'nested': nested_program,
+  'addition_chain': addition_chain_program,
+  'functions': functions_program,
+  'strings': string_program,
+  'duplicated': duplicated_program,
+}
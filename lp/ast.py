@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
 from lp.token import Token
@@ -31,6 +31,9 @@ class Expression(ASTNode):
     return f'{self.token_literal()}'
 
 class Program(ASTNode):
+  # Set by lp.resolver once every Identifier below has been resolved.
+  resolved: bool = False
+  
   def __init__(self, statements: List[Statement]) -> None:
     self.statements = statements
     
@@ -52,6 +55,10 @@ class Program(ASTNode):
   
 
 class Identifier(Expression):
+  # Filled in by lp.resolver: how many function frames up the variable lives
+  # and its slot there, or -1 for a global or builtin looked up by name.
+  depth: int = -1
+  slot: int = -1
   
   def __init__(self, token: Token, value: str) -> None:
     super().__init__(token)
@@ -114,6 +121,9 @@ class Integer(Expression):
     return str(self.value)
 
 class Prefix(Expression):
+  # Set by lp.type_inference to the ObjectType name the operand always has,
+  # so the evaluator can skip checking it, or '' when nothing is proven.
+  operands: str = ''
   
   def __init__(
     self, 
@@ -130,6 +140,12 @@ class Prefix(Expression):
   
     
 class Infix(Expression):
+  # Set by lp.type_inference to the ObjectType name both operands always
+  # have, 'INTEGER' or 'STRING', or '' when nothing is proven.
+  operands: str = ''
+  # Set by lp.quickening: how many times the node ran before rewriting
+  # itself, or the specialized variant it rewrote itself into.
+  quick: Any = 0
   
   def __init__(
     self,
@@ -160,6 +176,10 @@ class Boolean(Expression):
     return self.token_literal()
 
 class Block(Statement):
+  # For a function body, the lp.resolver.Scope laying out its call frame.
+  scope: Any = None
+  # Only on a body left for later by LazyParser or FlatAST, until it runs.
+  _parse_statements: Callable[[], List[Statement]]
   
   def __init__(
     self,
@@ -169,6 +189,18 @@ class Block(Statement):
     super().__init__(token)
     self.statements = statements
     
+  def __getattr__(self, name: str) -> Any:
+    # Only reached for missing attributes: a body skipped by LazyParser gets
+    # its statements parsed the first time anything reads them.
+    parse_statements = self.__dict__.get('_parse_statements')
+    
+    if name != 'statements' or parse_statements is None:
+      raise AttributeError(name)
+    
+    del self._parse_statements
+    self.statements = parse_statements()
+    return self.statements
+    
   def __str__(self) -> str:
     out: List[str] = [str(statement) for statement in self.statements]
     
@@ -216,6 +248,8 @@ class Function(Expression):
     return f'{self.token_literal()}({params}) {str(self.body)}'
 
 class Call(Expression):
+  # Set by lp.quickening, as for Infix.
+  quick: Any = 0
   
   def __init__(
     self,
@@ -242,3 +276,37 @@ class StringLiteral(Expression):
 
   def __str__(self) -> str:
     return super().__str__()
+
+# Stands in for the statements of a body LazyParser could only parse once it
+# was used, and found errors in: evaluating it gives the first one, where a
+# full parse would have refused the whole program.
+class ParseFailure(Expression):
+
+  def __init__(self, token: Token, message: str, position: int) -> None:
+    super().__init__(token)
+    self.message = message
+    self.position = position
+
+  def __str__(self) -> str:
+    return ''
+
+# Per node type: the plain fields that take part in its identity, the fields
+# holding one child and the fields holding a list of children (or None).
+# Passes that walk the whole tree go through this table.
+NODE_FIELDS: Dict[type, Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = {
+  Program: ((), (), ('statements',)),
+  LetStatement: ((), ('name', 'value'), ()),
+  ReturnStatement: ((), ('return_value',), ()),
+  ExpressionStatement: ((), ('expression',), ()),
+  Block: ((), (), ('statements',)),
+  Identifier: (('value',), (), ()),
+  Integer: (('value',), (), ()),
+  Boolean: (('value',), (), ()),
+  StringLiteral: (('value',), (), ()),
+  Prefix: (('operator',), ('right',), ()),
+  Infix: (('operator',), ('left', 'right'), ()),
+  If: ((), ('condition', 'consequence', 'alternative'), ()),
+  Function: ((), ('body',), ('parameters',)),
+  Call: ((), ('function',), ('arguments',)),
+  ParseFailure: (('message', 'position'), (), ()),
+}
@@ -1,6 +1,7 @@
 from typing import (
   cast,
-  Dict
+  Dict,
+  FrozenSet
 )
 
 from lp.object import (
@@ -8,7 +9,8 @@ from lp.object import (
   Error,
   Integer,
   Object,
-  String
+  String,
+  new_integer,
 )
 
 _WRONG_NUMBER_OF_ARGS = 'Numero incorrecto de argumentos para longitud, se recibieron {}, se requieren {}'
@@ -20,11 +22,15 @@ def longitud(*args: Object) -> Object:
   elif type(args[0]) == String:
     argument = cast(String, args[0])
     
-    return Integer(len(argument.value))
+    return new_integer(len(argument.value))
   else:
-    return Error(_UNSUPPORTED_ARGUMENT_TYPE.format(args[0].type().name))
+    return Error(_UNSUPPORTED_ARGUMENT_TYPE.format(args[0].object_type.name))
   return Integer(22)
 
 BUILTINS: Dict[str, Builtin] = {
   'longitud': Builtin(fn=longitud)
-}
\ No newline at end of file
+}
+
+# Builtins whose result depends only on their arguments, so a call with
+# constant arguments can be evaluated ahead of time.
+PURE_BUILTINS: FrozenSet[str] = frozenset(['longitud'])
@@ -0,0 +1,190 @@
+from array import array
+from hashlib import sha256
+from os import getpid, replace, scandir, utime
+from pathlib import Path
+from struct import calcsize, error as StructError, pack, unpack_from
+from sys import byteorder
+from typing import List, Optional, Tuple
+from zlib import crc32
+
+from lp import __version__
+from lp.ast import Program
+from lp.flat_ast import FORMAT_VERSION, FlatAST
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+_MAGIC: bytes = b'LPC\0'
+# Magic, format version, CRC-32 of everything after the header, size of the
+# flat AST and number of errors.
+_HEADER: str = '<4sHIII'
+_SUFFIX: str = '.lpc'
+
+# A cached entry: the flat AST plus the errors the parser reported.
+CacheEntry = Tuple[FlatAST, List[str], List[int]]
+
+class ProgramCache:
+
+  def __init__(self, directory: str, max_bytes: int = 64 * 2**20) -> None:
+    self._directory: Path = Path(directory)
+    self._max_bytes: int = max_bytes
+    self._hits: int = 0
+    self._misses: int = 0
+    self._evictions: int = 0
+    self._errors: List[str] = []
+    self._error_positions: List[int] = []
+
+    self._directory.mkdir(parents=True, exist_ok=True)
+
+  @property
+  def errors(self) -> List[str]:
+    return self._errors
+
+  @property
+  def error_positions(self) -> List[int]:
+    return self._error_positions
+
+  @property
+  def evictions(self) -> int:
+    return self._evictions
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  # The interpreter version, the format version and the byte order of the
+  # stored arrays are part of the key, so entries from other builds or
+  # machines are never read back.
+  def key(self, source: str) -> str:
+    digest = sha256(f'{__version__}\0{FORMAT_VERSION}\0{byteorder}\0'.encode())
+    digest.update(source.encode('utf-8', 'surrogatepass'))
+
+    return digest.hexdigest()
+
+  def load(self, source: str) -> Optional[CacheEntry]:
+    loaded = self._load(source, False)
+
+    return None if loaded is None else loaded[0]
+
+  def parse_program(self, source: str) -> Program:
+    loaded = self._load(source, True)
+
+    if loaded is None:
+      parser: Parser = Parser(Lexer(source))
+      program: Program = parser.parse_program()
+      entry: CacheEntry = FlatAST(program), parser.errors, parser.error_positions
+
+      self.store(source, *entry)
+    else:
+      entry, built = loaded
+      assert built is not None
+      program = built
+
+    self._errors, self._error_positions = entry[1], entry[2]
+    return program
+
+  # A corrupt entry is a miss and is removed, even when it only fails while
+  # its Program is built.
+  def _load(self, source: str, build: bool) -> Optional[Tuple[CacheEntry, Optional[Program]]]:
+    path: Path = self._path(source)
+
+    try:
+      data: bytes = path.read_bytes()
+      entry: CacheEntry = self._decode(data)
+      program: Optional[Program] = entry[0].program() if build else None
+    except FileNotFoundError:
+      self._misses += 1
+      return None
+    except (StructError, UnicodeDecodeError, ValueError, IndexError):
+      path.unlink(missing_ok=True)
+      self._misses += 1
+      return None
+
+    # Another run may have evicted the file since it was read.
+    try:
+      utime(path)
+    except FileNotFoundError:
+      pass
+
+    self._hits += 1
+    return entry, program
+
+  def store(self, source: str, flat: FlatAST, errors: List[str], error_positions: List[int]) -> None:
+    path: Path = self._path(source)
+    temporary: Path = path.with_suffix(f'.{getpid()}.tmp')
+
+    temporary.write_bytes(self._encode(flat, errors, error_positions))
+    replace(temporary, path)
+
+    self._evict()
+
+  def _decode(self, data: bytes) -> CacheEntry:
+    magic, version, checksum, flat_size, error_count = unpack_from(_HEADER, data)
+    if magic != _MAGIC or version != FORMAT_VERSION:
+      raise ValueError('Not a cache entry for this format version')
+
+    offset: int = calcsize(_HEADER)
+    if crc32(memoryview(data)[offset:]) != checksum:
+      raise ValueError('Corrupt cache entry')
+
+    flat: FlatAST = FlatAST.from_bytes(data[offset:offset + flat_size])
+    offset += flat_size
+
+    positions: array = array('i')
+    lengths: array = array('I')
+    for column in (positions, lengths):
+      end = offset + error_count * column.itemsize
+      column.frombytes(data[offset:end])
+      offset = end
+
+    errors: List[str] = []
+    for length in lengths:
+      errors.append(str(data[offset:offset + length], 'utf-8', 'surrogatepass'))
+      offset += length
+
+    if len(errors) != error_count or offset != len(data):
+      raise ValueError('Truncated cache entry')
+
+    return flat, errors, positions.tolist()
+
+  def _encode(self, flat: FlatAST, errors: List[str], error_positions: List[int]) -> bytes:
+    flat_bytes: bytes = flat.to_bytes()
+    encoded: List[bytes] = [error.encode('utf-8', 'surrogatepass') for error in errors]
+    payload: bytes = b''.join([
+      flat_bytes,
+      array('i', error_positions).tobytes(),
+      array('I', map(len, encoded)).tobytes(),
+      *encoded,
+    ])
+
+    return pack(_HEADER, _MAGIC, FORMAT_VERSION, crc32(payload), len(flat_bytes), len(errors)) + payload
+
+  # Least recently used first: loads touch the file's modification time.
+  # Entries another run removes meanwhile are skipped.
+  def _evict(self) -> None:
+    entries: List[Tuple[int, int, str]] = []
+    for entry in scandir(self._directory):
+      if not entry.name.endswith(_SUFFIX):
+        continue
+
+      try:
+        stat = entry.stat()
+      except FileNotFoundError:
+        continue
+      entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total: int = sum(size for _, size, _ in entries)
+
+    for _, size, path in sorted(entries):
+      if total <= self._max_bytes:
+        break
+
+      total -= size
+      Path(path).unlink(missing_ok=True)
+      self._evictions += 1
+
+  def _path(self, source: str) -> Path:
+    return self._directory / (self.key(source) + _SUFFIX)
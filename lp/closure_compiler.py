@@ -0,0 +1,322 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, cast
+
+import lp.ast as ast
+from lp.evaluator import (
+  Env,
+  FALSE,
+  NULL,
+  TRUE,
+  _INTEGER_OPERATIONS,
+  _NOT_A_FUNCTION,
+  _STRING_OPERATIONS,
+  _TYPED_OPERATIONS,
+  _evaluate_bang_operator_expression,
+  _evaluate_global,
+  _evaluate_infix_expression,
+  _evaluate_prefix_expression,
+  _evaluate_unset_local,
+  _extend_function_environment,
+  _is_truthy,
+  _locate_error,
+  _new_error,
+  _unwrap_return_value,
+)
+from lp.object import (
+  Builtin,
+  Environment,
+  Error,
+  Frame,
+  Function,
+  Object,
+  ObjectType,
+  Return,
+  new_integer,
+  new_string,
+)
+from lp.resolver import resolve
+
+# A compiled node: called with the environment, it does what evaluating the
+# node in it would.
+Code = Callable[[Env], Optional[Object]]
+
+# A compiled expression, which unlike a statement always gives an Object; Any
+# stands for the subclass lp.type_inference may have proven it to be.
+ExpressionCode = Callable[[Env], Any]
+
+_INTEGER = ObjectType.INTEGER
+_STRING = ObjectType.STRING
+_RETURN = ObjectType.RETURN
+_ERROR = ObjectType.ERROR
+
+# Compiles a program once into nested closures, one per node, with its
+# children, variable slots and operator functions already picked, so running
+# it repeats none of the evaluator's dispatch. Values, Errors and their
+# positions are exactly the evaluator's, whose helpers it shares.
+#
+# Procedimientos are still lp.object.Function values; a body is compiled the
+# first time one of them is called, so bodies left lazy by LazyParser or
+# FlatAST are only parsed then, like with the evaluator.
+class ClosureCompiler:
+
+  def __init__(self) -> None:
+    self._compilers: Dict[Type, Callable[[Any], Code]] = {
+      ast.Program: self._program,
+      ast.ExpressionStatement: self._expression_statement,
+      ast.Integer: self._integer,
+      ast.Boolean: self._boolean,
+      ast.StringLiteral: self._string,
+      ast.Prefix: self._prefix,
+      ast.Infix: self._infix,
+      ast.Block: self._block,
+      ast.If: self._if,
+      ast.ReturnStatement: self._return_statement,
+      ast.LetStatement: self._let_statement,
+      ast.Identifier: self._identifier,
+      ast.Function: self._function,
+      ast.Call: self._call,
+      ast.ParseFailure: self._parse_failure,
+    }
+    # Keeps the block alive too, so its id can't be reused.
+    self._bodies: Dict[int, Tuple[ast.Block, Code]] = {}
+
+  def compile(self, node: ast.ASTNode) -> Code:
+    if type(node) == ast.Program and not node.resolved:
+      resolve(node)
+
+    return self._compile(node)
+
+  # Handlers compile their children through the table too, so each level of
+  # nesting takes a single Python frame, as in the evaluator.
+  def _compile(self, node: Any) -> Code:
+    compiler = self._compilers.get(type(node))
+    if compiler is None:
+      return _nothing
+
+    return compiler(node)
+
+  def _body(self, block: ast.Block) -> Code:
+    compiled = self._bodies.get(id(block))
+    if compiled is None:
+      compiled = self._bodies[id(block)] = (block, self._block(block))
+
+    return compiled[1]
+
+  def _program(self, node: ast.Program) -> Code:
+    statements: List[Code] = [self._compile(statement) for statement in node.statements]
+
+    def program(env: Env) -> Optional[Object]:
+      result: Optional[Object] = None
+
+      for statement in statements:
+        result = statement(env)
+
+        if type(result) == Return:
+          return cast(Return, result).value
+        elif type(result) == Error:
+          return result
+
+      return result
+
+    return program
+
+  def _expression_statement(self, node: ast.ExpressionStatement) -> Code:
+    return self._compilers[type(node.expression)](node.expression)
+
+  def _integer(self, node: ast.Integer) -> Code:
+    assert node.value is not None
+    value: Object = new_integer(node.value)
+
+    return lambda env: value
+
+  def _boolean(self, node: ast.Boolean) -> Code:
+    value: Object = TRUE if node.value else FALSE
+
+    return lambda env: value
+
+  def _string(self, node: ast.StringLiteral) -> Code:
+    value: Object = new_string(node.value)
+
+    return lambda env: value
+
+  def _parse_failure(self, node: ast.ParseFailure) -> Code:
+    message, position = node.message, node.position
+
+    return lambda env: Error(message, position)
+
+  def _prefix(self, node: ast.Prefix) -> Code:
+    right: ExpressionCode = self._compilers[type(node.right)](node.right)
+    operator: str = node.operator
+
+    if node.operands:
+      return lambda env: new_integer(-right(env).value)
+    elif operator == '!':
+      return lambda env: _evaluate_bang_operator_expression(right(env))
+
+    def prefix(env: Env) -> Object:
+      result = _evaluate_prefix_expression(operator, right(env))
+
+      if type(result) == Error:
+        _locate_error(result, node)
+      return result
+
+    return prefix
+
+  def _infix(self, node: ast.Infix) -> Code:
+    left: ExpressionCode = self._compilers[type(node.left)](node.left)
+    right: ExpressionCode = self._compilers[type(node.right)](node.right)
+    operator: str = node.operator
+
+    if node.operands:
+      operation = _TYPED_OPERATIONS[node.operands][operator]
+      return lambda env: operation(left(env).value, right(env).value)
+
+    integer_operation = _INTEGER_OPERATIONS.get(operator)
+    string_operation = _STRING_OPERATIONS.get(operator)
+
+    def infix(env: Env) -> Object:
+      left_value: Any = left(env)
+      right_value: Any = right(env)
+      left_type = left_value.object_type
+      right_type = right_value.object_type
+
+      if left_type is _INTEGER and right_type is _INTEGER and integer_operation is not None:
+        return integer_operation(left_value.value, right_value.value)
+      elif left_type is _STRING and right_type is _STRING and string_operation is not None:
+        return string_operation(left_value.value, right_value.value)
+
+      result = _evaluate_infix_expression(operator, left_value, right_value)
+      if type(result) == Error:
+        _locate_error(result, node)
+      return result
+
+    return infix
+
+  def _block(self, node: ast.Block) -> Code:
+    statements: List[Code] = [self._compile(statement) for statement in node.statements]
+
+    def block(env: Env) -> Optional[Object]:
+      result: Optional[Object] = None
+
+      for statement in statements:
+        result = statement(env)
+
+        if result is not None and (result.object_type is _RETURN or result.object_type is _ERROR):
+          return result
+
+      return result
+
+    return block
+
+  def _if(self, node: ast.If) -> Code:
+    condition: ExpressionCode = self._compilers[type(node.condition)](node.condition)
+    assert node.consequence is not None
+    consequence: Code = self._block(node.consequence)
+    alternative: Optional[Code] = None if node.alternative is None else self._block(node.alternative)
+
+    def if_expression(env: Env) -> Optional[Object]:
+      if _is_truthy(condition(env)):
+        return consequence(env)
+      elif alternative is not None:
+        return alternative(env)
+
+      return NULL
+
+    return if_expression
+
+  def _return_statement(self, node: ast.ReturnStatement) -> Code:
+    value: ExpressionCode = self._compilers[type(node.return_value)](node.return_value)
+
+    return lambda env: Return(value(env))
+
+  def _let_statement(self, node: ast.LetStatement) -> Code:
+    value: Code = self._compilers[type(node.value)](node.value)
+    assert node.name is not None
+    name: str = node.name.value
+    slot: int = node.name.slot
+
+    if node.name.depth == 0:
+      def let_local(env: Env) -> None:
+        cast(Frame, env).values[slot] = value(env)
+
+      return let_local
+
+    def let_global(env: Env) -> None:
+      cast(Environment, env)[name] = value(env)
+
+    return let_global
+
+  def _identifier(self, node: ast.Identifier) -> Code:
+    name: str = node.value
+    depth: int = node.depth
+    slot: int = node.slot
+
+    if depth < 0:
+      def global_variable(env: Env) -> Object:
+        result = _evaluate_global(name, env.globals)
+
+        if type(result) == Error:
+          _locate_error(result, node)
+        return result
+
+      return global_variable
+
+    def local_variable(env: Env) -> Object:
+      frame = cast(Frame, env)
+      if depth:
+        frame = frame.display[depth - 1]
+
+      value = frame.values[slot]
+      if value is not None:
+        return value
+
+      result = _evaluate_unset_local(name, frame.outer)
+      if type(result) == Error:
+        _locate_error(result, node)
+      return result
+
+    return local_variable
+
+  def _function(self, node: ast.Function) -> Code:
+    parameters: List[ast.Identifier] = node.parameters
+    assert node.body is not None
+    body: ast.Block = node.body
+
+    return lambda env: Function(parameters, body, env)
+
+  def _call(self, node: ast.Call) -> Code:
+    function: ExpressionCode = self._compilers[type(node.function)](node.function)
+    assert node.arguments is not None
+    arguments: List[ExpressionCode] = [self._compile(argument) for argument in node.arguments]
+    bodies: Dict[int, Tuple[ast.Block, Code]] = self._bodies
+
+    def call(env: Env) -> Object:
+      fn: Any = function(env)
+      args: List[Object] = [argument(env) for argument in arguments]
+
+      if type(fn) == Function:
+        compiled = bodies.get(id(fn.body))
+        body: Code = self._body(fn.body) if compiled is None else compiled[1]
+
+        evaluated = body(_extend_function_environment(fn, args))
+        assert evaluated is not None
+        result = _unwrap_return_value(evaluated)
+      elif type(fn) == Builtin:
+        result = fn.fn(*args)
+      else:
+        result = _new_error(_NOT_A_FUNCTION, [fn.object_type.name])
+
+      if type(result) == Error:
+        _locate_error(result, node)
+      return result
+
+    return call
+
+def compile_program(program: ast.Program) -> Code:
+  return ClosureCompiler().compile(program)
+
+# Runs the program the way evaluate(program, env) does.
+def execute(program: ast.Program, env: Env) -> Optional[Object]:
+  return compile_program(program)(env)
+
+def _nothing(env: Env) -> None:
+  return None
@@ -0,0 +1,189 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import lp.ast as ast
+from lp.token import Token, TokenType
+from lp.transformer import Transformer
+
+_LITERALS = (ast.Integer, ast.Boolean, ast.StringLiteral)
+
+# Computes once the pure expressions, operators over names and literals,
+# that a statement inside a procedimiento evaluates more than once. The
+# first copy moves to a new local variable right before the statement and
+# every copy reads it.
+#
+# Only copies the statement always evaluates count, so none inside a si
+# branch, and statements with a variable statement nested in them are
+# skipped, so no name changes between the temporary and its uses. Errors are values in lp, so one
+# computed early is the same Error at the same position. Temporaries are
+# named `$n`, which the lexer never produces, and stay out of the globals.
+class CommonSubexpressionEliminator(Transformer):
+
+  def __init__(self) -> None:
+    super().__init__()
+    self._functions: int = 0
+    self._temporaries: int = 0
+    self._eliminated: int = 0
+
+  @property
+  def eliminated(self) -> int:
+    return self._eliminated
+
+  def visit_Program(self, node: ast.Program) -> ast.Program:
+    if self._temporaries:
+      node.resolved = False
+
+    return node
+
+  def enter_Function(self, node: ast.Function) -> None:
+    self._functions += 1
+
+  def visit_Function(self, node: ast.Function) -> ast.Function:
+    self._functions -= 1
+
+    return node
+
+  def visit_Block(self, node: ast.Block) -> ast.Block:
+    if not self._functions:
+      return node
+
+    statements: List[ast.Statement] = []
+    for statement in node.statements:
+      statements.extend(self._hoist(statement))
+    node.statements = statements
+
+    return node
+
+  def _hoist(self, statement: ast.Statement) -> List[ast.Statement]:
+    if _binds(statement):
+      return [statement]
+
+    keys: Dict[int, Optional[int]] = _keys(statement)
+    counts: Counter = Counter()
+    _count(statement, keys, counts)
+
+    temporaries: Dict[int, ast.Identifier] = {}
+    hoisted: List[ast.Statement] = []
+
+    # Top-down, so the largest repeated expression is the one replaced.
+    # Entries are where a node sits: a node and field, or a list and index.
+    stack: List[Tuple[Any, Any]] = _children(statement)
+    while stack:
+      container, slot = stack.pop()
+      in_list: bool = type(container) == list
+      node = container[slot] if in_list else getattr(container, slot)
+      key = keys.get(id(node))
+
+      if key is not None and type(node) != ast.Identifier and counts[key] > 1:
+        temporary = temporaries.get(key)
+
+        if temporary is None:
+          name: str = f'${self._temporaries}'
+          self._temporaries += 1
+          temporary = temporaries[key] = ast.Identifier(Token(TokenType.IDENT, name, node.token.position), name)
+          hoisted.append(ast.LetStatement(Token(TokenType.LET, 'variable', node.token.position), temporary, node))
+        else:
+          self._eliminated += 1
+
+        use = ast.Identifier(temporary.token, temporary.value)
+        if in_list:
+          container[slot] = use
+        else:
+          setattr(container, slot, use)
+      elif node is not None and type(node) != ast.Block:
+        stack.extend(_children(node))
+
+    return hoisted + [statement]
+
+def eliminate_common_subexpressions(program: ast.Program) -> ast.Program:
+  return CommonSubexpressionEliminator().visit(program)
+
+# The structural identity of every pure expression in the statement outside
+# si branches, operators over names and literals, by node id. Nodes are
+# collected top-down and keyed in reverse, so operands are keyed first. Each
+# distinct structure gets a number, so a key costs the same to compare
+# however deep the expression is.
+def _keys(statement: ast.Statement) -> Dict[int, Optional[int]]:
+  nodes: List[Any] = []
+  stack: List[Any] = [statement]
+
+  while stack:
+    node = stack.pop()
+    if node is not None and type(node) != ast.Block:
+      nodes.append(node)
+      stack.extend(
+        container[slot] if type(container) == list else getattr(container, slot)
+        for container, slot in _children(node)
+      )
+
+  numbers: Dict[Tuple[Any, ...], int] = {}
+  keys: Dict[int, Optional[int]] = {}
+  for node in reversed(nodes):
+    node_type = type(node)
+    structure: Optional[Tuple[Any, ...]] = None
+
+    if node_type == ast.Identifier or node_type in _LITERALS:
+      structure = None if node.value is None else (node_type, node.value)
+    elif node_type == ast.Prefix:
+      right = keys.get(id(node.right))
+      structure = None if right is None else (node_type, node.operator, right)
+    elif node_type == ast.Infix:
+      left, right = keys.get(id(node.left)), keys.get(id(node.right))
+      structure = None if left is None or right is None else (node_type, node.operator, left, right)
+
+    keys[id(node)] = None if structure is None else numbers.setdefault(structure, len(numbers))
+
+  return keys
+
+# Counts the pure expressions evaluated every time the statement is, which
+# leaves out si branches.
+def _count(node: Any, keys: Dict[int, Optional[int]], counts: Counter) -> None:
+  stack: List[Any] = [node]
+
+  while stack:
+    node = stack.pop()
+    key = keys.get(id(node))
+
+    if key is not None:
+      counts[key] += 1
+    if node is not None and type(node) != ast.Block:
+      stack.extend(
+        container[slot] if type(container) == list else getattr(container, slot)
+        for container, slot in _children(node)
+      )
+
+def _children(node: Any) -> List[Tuple[Any, Any]]:
+  _, child_fields, list_fields = ast.NODE_FIELDS[type(node)]
+  children: List[Tuple[Any, Any]] = [(node, field) for field in child_fields]
+
+  for field in list_fields:
+    items = getattr(node, field)
+    if items is not None:
+      children.extend((items, index) for index in range(len(items)))
+
+  return children
+
+# Whether a variable statement nested in the statement, as in a si branch,
+# could rebind a name between the temporary and a use. The statement's own
+# binding happens after its value, and a procedimiento binds in its frame.
+def _binds(statement: ast.Statement) -> bool:
+  stack: List[Any] = [
+    container[slot] if type(container) == list else getattr(container, slot)
+    for container, slot in _children(statement)
+  ]
+
+  while stack:
+    node = stack.pop()
+    node_type = type(node)
+
+    if node_type == ast.LetStatement:
+      return True
+    elif node is None or node_type == ast.Function:
+      continue
+
+    _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+    stack.extend(getattr(node, field) for field in child_fields)
+    for field in list_fields:
+      stack.extend(getattr(node, field) or ())
+
+  return False
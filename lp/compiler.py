@@ -0,0 +1,346 @@
+from array import array
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import lp.ast as ast
+from lp.evaluator import (
+  FALSE,
+  NULL,
+  TRUE,
+  _INTEGER_OPERATIONS,
+  _STRING_OPERATIONS,
+  _TYPED_OPERATIONS,
+)
+from lp.object import Error, new_integer, new_string
+from lp.resolver import resolve
+
+class Opcode(IntEnum):
+  # Pushes constants[a].
+  CONSTANT = 0
+  # Pushes None, the result of a variable statement.
+  NONE = 1
+  POP = 2
+  # Pushes the variable in slot a of the current frame, or of the frame b
+  # levels up for GET_OUTER; the last operand is the name's constant, for
+  # when the slot is still empty.
+  GET_LOCAL = 3
+  GET_OUTER = 4
+  GET_GLOBAL = 5
+  SET_LOCAL = 6
+  SET_GLOBAL = 7
+  # constants[a] is the operator and its integer and string operations.
+  INFIX = 8
+  # constants[a] is the operation; lp.type_inference proved its operands.
+  TYPED_INFIX = 9
+  # constants[a] is the operator.
+  PREFIX = 10
+  BANG = 11
+  TYPED_MINUS = 12
+  JUMP = 13
+  # Pops the condition and jumps to a when it is falsy.
+  JUMP_IF_FALSE = 14
+  # Ends a list of statements early: jumps to a, keeping the value, when it
+  # is a Return or an Error, and pops it otherwise.
+  STOP = 15
+  # Wraps the value in a Return, as regresa does.
+  RETURN_WRAP = 16
+  # Pushes a Function for the ast.Function in constants[a].
+  FUNCTION = 17
+  # Calls the value below the a arguments on top of the stack.
+  CALL = 18
+  # Ends a procedimiento's body, and HALT the program.
+  RETURN = 19
+  HALT = 20
+
+OPERANDS: Dict[Opcode, int] = {opcode: 0 for opcode in Opcode}
+OPERANDS.update({
+  Opcode.CONSTANT: 1,
+  Opcode.GET_LOCAL: 2,
+  Opcode.GET_OUTER: 3,
+  Opcode.GET_GLOBAL: 1,
+  Opcode.SET_LOCAL: 1,
+  Opcode.SET_GLOBAL: 1,
+  Opcode.INFIX: 1,
+  Opcode.TYPED_INFIX: 1,
+  Opcode.PREFIX: 1,
+  Opcode.JUMP: 1,
+  Opcode.JUMP_IF_FALSE: 1,
+  Opcode.STOP: 1,
+  Opcode.FUNCTION: 1,
+  Opcode.CALL: 1,
+})
+
+# A compiled program or procedimiento body. instructions holds each opcode
+# followed by its operands; positions has the source position of every
+# instruction that can give an Error, for the Errors it gives.
+class Bytecode:
+  __slots__ = ('instructions', 'constants', 'positions')
+
+  def __init__(self, instructions: array, constants: List[Any], positions: Dict[int, int]) -> None:
+    self.instructions = instructions
+    self.constants = constants
+    self.positions = positions
+
+# Lowers a Program to Bytecode for lp.vm. Each procedimiento body is compiled
+# the first time compile_body is asked for it, which the VM does on its first
+# call, so bodies left lazy by LazyParser or FlatAST are only parsed then.
+#
+# Statement lists compile to what the evaluator does with them: every value
+# but the last is dropped, unless it is a Return or an Error, which ends the
+# list; a procedimiento unwraps the Return when its body ends.
+class Compiler:
+
+  def __init__(self) -> None:
+    self._compilers: _Compilers = _Compilers({
+      type(None): self._nothing,
+      ast.ExpressionStatement: self._expression_statement,
+      ast.Integer: self._integer,
+      ast.Boolean: self._boolean,
+      ast.StringLiteral: self._string,
+      ast.Prefix: self._prefix,
+      ast.Infix: self._infix,
+      ast.If: self._if,
+      ast.Block: self._block,
+      ast.Identifier: self._identifier,
+      ast.Function: self._function,
+      ast.Call: self._call,
+      ast.ParseFailure: self._parse_failure,
+    })
+    # Keeps the block alive too, so its id can't be reused.
+    self._bodies: Dict[int, Tuple[ast.Block, Bytecode]] = {}
+    self._instructions: List[int] = []
+    self._constants: List[Any] = []
+    self._constant_indexes: Dict[Any, int] = {}
+    self._positions: Dict[int, int] = {}
+
+  def compile(self, program: ast.Program) -> Bytecode:
+    if not program.resolved:
+      resolve(program)
+
+    self._statements(program.statements)
+    self._emit(Opcode.HALT)
+
+    return self._assemble()
+
+  def compile_body(self, block: ast.Block) -> Bytecode:
+    compiled = self._bodies.get(id(block))
+    if compiled is not None:
+      return compiled[1]
+
+    # A body is compiled while no other code is being.
+    self._statements(block.statements)
+    self._emit(Opcode.RETURN)
+    bytecode: Bytecode = self._assemble()
+    self._bodies[id(block)] = (block, bytecode)
+
+    return bytecode
+
+  def _assemble(self) -> Bytecode:
+    bytecode: Bytecode = Bytecode(array('I', self._instructions), self._constants, self._positions)
+    self._instructions, self._constants, self._constant_indexes, self._positions = [], [], {}, {}
+
+    return bytecode
+
+  def _emit(self, opcode: Opcode, *operands: int, position: int = -1) -> int:
+    offset: int = len(self._instructions)
+    self._instructions.append(opcode)
+    self._instructions.extend(operands)
+
+    if position >= 0:
+      self._positions[offset] = position
+    return offset
+
+  # Points the jump emitted at offset to where the next instruction goes.
+  def _patch(self, offset: int) -> None:
+    self._instructions[offset + 1] = len(self._instructions)
+
+  def _constant(self, value: Any, key: Optional[Any] = None) -> int:
+    if key is None:
+      self._constants.append(value)
+      return len(self._constants) - 1
+
+    index = self._constant_indexes.get(key)
+    if index is None:
+      index = self._constant_indexes[key] = len(self._constants)
+      self._constants.append(value)
+
+    return index
+
+  def _name(self, name: str) -> int:
+    return self._constant(name, (str, name))
+
+  def _statements(self, statements: List[ast.Statement]) -> None:
+    if not statements:
+      self._emit(Opcode.NONE)
+      return
+
+    ends: List[int] = []
+    last: int = len(statements) - 1
+
+    for index, statement in enumerate(statements):
+      if type(statement) == ast.LetStatement:
+        self._let_statement(statement)
+        if index == last:
+          self._emit(Opcode.NONE)
+      elif type(statement) == ast.ReturnStatement:
+        self._compile(statement.return_value)
+        self._emit(Opcode.RETURN_WRAP)
+
+        # Nothing after a regresa runs.
+        if index != last:
+          ends.append(self._emit(Opcode.JUMP, 0))
+        break
+      else:
+        self._compile(statement)
+        if index != last:
+          ends.append(self._emit(Opcode.STOP, 0))
+
+    for offset in ends:
+      self._patch(offset)
+
+  # Handlers compile their children through the table too, so each level of
+  # nesting takes a single Python frame, as in the evaluator.
+  def _compile(self, node: Any) -> None:
+    self._compilers[type(node)](node)
+
+  # A missing node gives None, as in the evaluator.
+  def _nothing(self, node: None) -> None:
+    self._emit(Opcode.NONE)
+
+  def _expression_statement(self, node: ast.ExpressionStatement) -> None:
+    self._compilers[type(node.expression)](node.expression)
+
+  def _integer(self, node: ast.Integer) -> None:
+    assert node.value is not None
+    self._emit(Opcode.CONSTANT, self._constant(new_integer(node.value), (int, node.value)))
+
+  def _boolean(self, node: ast.Boolean) -> None:
+    value = TRUE if node.value else FALSE
+    self._emit(Opcode.CONSTANT, self._constant(value, (bool, node.value)))
+
+  def _string(self, node: ast.StringLiteral) -> None:
+    self._emit(Opcode.CONSTANT, self._constant(new_string(node.value), ('string', node.value)))
+
+  def _parse_failure(self, node: ast.ParseFailure) -> None:
+    self._emit(Opcode.CONSTANT, self._constant(Error(node.message, node.position)))
+
+  def _prefix(self, node: ast.Prefix) -> None:
+    self._compilers[type(node.right)](node.right)
+
+    if node.operands:
+      self._emit(Opcode.TYPED_MINUS)
+    elif node.operator == '!':
+      self._emit(Opcode.BANG)
+    else:
+      self._emit(Opcode.PREFIX, self._name(node.operator), position=node.token.position)
+
+  def _infix(self, node: ast.Infix) -> None:
+    self._compilers[type(node.left)](node.left)
+    self._compilers[type(node.right)](node.right)
+    operator: str = node.operator
+
+    if node.operands:
+      index = self._constant(_TYPED_OPERATIONS[node.operands][operator], (node.operands, operator))
+      self._emit(Opcode.TYPED_INFIX, index)
+      return
+
+    operation = (operator, _INTEGER_OPERATIONS.get(operator), _STRING_OPERATIONS.get(operator))
+    self._emit(Opcode.INFIX, self._constant(operation, ('infix', operator)), position=node.token.position)
+
+  def _if(self, node: ast.If) -> None:
+    self._compilers[type(node.condition)](node.condition)
+    otherwise: int = self._emit(Opcode.JUMP_IF_FALSE, 0)
+
+    assert node.consequence is not None
+    self._statements(node.consequence.statements)
+    end: int = self._emit(Opcode.JUMP, 0)
+
+    self._patch(otherwise)
+    if node.alternative is not None:
+      self._statements(node.alternative.statements)
+    else:
+      self._emit(Opcode.CONSTANT, self._constant(NULL, (type(None), None)))
+
+    self._patch(end)
+
+  # A block in an expression slot, which an optimization pass may leave,
+  # compiles like a si branch: a regresa in it ends the list around it too.
+  def _block(self, node: ast.Block) -> None:
+    self._statements(node.statements)
+
+  def _let_statement(self, node: ast.LetStatement) -> None:
+    self._compilers[type(node.value)](node.value)
+    assert node.name is not None
+
+    if node.name.depth == 0:
+      self._emit(Opcode.SET_LOCAL, node.name.slot)
+    else:
+      self._emit(Opcode.SET_GLOBAL, self._name(node.name.value))
+
+  def _identifier(self, node: ast.Identifier) -> None:
+    name: int = self._name(node.value)
+    position: int = node.token.position
+
+    if node.depth < 0:
+      self._emit(Opcode.GET_GLOBAL, name, position=position)
+    elif node.depth == 0:
+      self._emit(Opcode.GET_LOCAL, node.slot, name, position=position)
+    else:
+      self._emit(Opcode.GET_OUTER, node.depth, node.slot, name, position=position)
+
+  def _function(self, node: ast.Function) -> None:
+    assert node.body is not None
+    self._emit(Opcode.FUNCTION, self._constant(node))
+
+  def _call(self, node: ast.Call) -> None:
+    self._compilers[type(node.function)](node.function)
+    assert node.arguments is not None
+
+    for argument in node.arguments:
+      self._compile(argument)
+
+    self._emit(Opcode.CALL, len(node.arguments), position=node.token.position)
+
+class _Compilers(Dict[Type, Callable[[Any], None]]):
+
+  def __missing__(self, node_type: Type) -> Callable[[Any], None]:
+    raise ValueError(f'Nodo desconocido para el compilador: {node_type.__name__}')
+
+def disassemble(bytecode: Bytecode) -> str:
+  lines: List[str] = []
+  instructions: array = bytecode.instructions
+  offset: int = 0
+
+  while offset < len(instructions):
+    opcode: Opcode = Opcode(instructions[offset])
+    operands: List[int] = list(instructions[offset + 1:offset + 1 + OPERANDS[opcode]])
+    line: str = f'{offset:04d} {opcode.name:<13}' + ''.join(f' {operand}' for operand in operands)
+
+    if opcode in (Opcode.CONSTANT, Opcode.GET_GLOBAL, Opcode.SET_GLOBAL, Opcode.PREFIX, Opcode.FUNCTION):
+      line += f' ({_describe(bytecode.constants[operands[0]])})'
+    elif opcode in (Opcode.GET_LOCAL, Opcode.GET_OUTER):
+      line += f' ({bytecode.constants[operands[-1]]})'
+    elif opcode in (Opcode.INFIX, Opcode.TYPED_INFIX):
+      line += f' ({_describe(bytecode.constants[operands[0]])})'
+
+    lines.append(line.rstrip())
+    offset += 1 + OPERANDS[opcode]
+
+  return '\n'.join(lines)
+
+def _describe(constant: Any) -> str:
+  if type(constant) == tuple:
+    return constant[0]
+  elif type(constant) == ast.Function:
+    return f'procedimiento({", ".join(parameter.value for parameter in constant.parameters)})'
+  elif hasattr(constant, 'inspect'):
+    return constant.inspect()
+  elif callable(constant):
+    return next(operator for operator, operation in _OPERATION_NAMES if operation is constant)
+
+  return str(constant)
+
+_OPERATION_NAMES: List[Tuple[str, Any]] = [
+  *(('int ' + operator, operation) for operator, operation in _INTEGER_OPERATIONS.items()),
+  *(('str ' + operator, operation) for operator, operation in _STRING_OPERATIONS.items()),
+]
@@ -0,0 +1,149 @@
+from typing import Optional, Set
+
+import lp.ast as ast
+from lp.builtins import PURE_BUILTINS
+from lp.evaluator import evaluate
+from lp.object import (
+  Boolean,
+  Environment,
+  Integer,
+  Object,
+  String,
+)
+from lp.token import Token, TokenType
+from lp.transformer import Transformer
+
+# Folds Prefix and Infix nodes over literals, and calls to pure builtins with
+# literal arguments, by running the evaluator on them ahead of time, so the
+# result is exactly what evaluating them would give. Anything that would end
+# in an Error, or raise like a division by zero, is left for runtime to keep
+# its message, position and timing. A si with a literal condition is replaced
+# by the expression of the branch it would take, or left with only that
+# branch.
+class ConstantFolder(Transformer):
+
+  def __init__(self, program: ast.Program) -> None:
+    super().__init__()
+    # A builtin called through a name the program also binds may not be the
+    # builtin at runtime.
+    self._bound: Set[str] = _bound_names(program)
+    self._folded: int = 0
+
+  @property
+  def folded(self) -> int:
+    return self._folded
+
+  def visit_Prefix(self, node: ast.Prefix) -> ast.Expression:
+    if _is_constant(node.right):
+      return self._fold(node)
+
+    return node
+
+  def visit_Infix(self, node: ast.Infix) -> ast.Expression:
+    if _is_constant(node.left) and _is_constant(node.right):
+      return self._fold(node)
+
+    return node
+
+  def visit_Call(self, node: ast.Call) -> ast.Expression:
+    function = node.function
+
+    if type(function) == ast.Identifier and \
+      function.value in PURE_BUILTINS and \
+      function.value not in self._bound and \
+      node.arguments is not None and \
+      all(_is_constant(argument) for argument in node.arguments):
+      return self._fold(node)
+
+    return node
+
+  def visit_If(self, node: ast.If) -> ast.Expression:
+    if node.condition is None or not _is_constant(node.condition):
+      return node
+
+    branch: Optional[ast.Block] = node.consequence if _is_truthy(node.condition) else node.alternative
+    if branch is None:
+      return node
+
+    statements = branch.statements
+
+    # A block evaluates to its last statement, so a lone expression can
+    # stand in for it and keep folding with what surrounds it.
+    if len(statements) == 1 and type(statements[0]) == ast.ExpressionStatement:
+      expression = statements[0].expression
+
+      if expression is not None:
+        self._folded += 1
+        return expression
+
+    # Anything else stays a si that always takes the branch, since a Block
+    # is a statement and can't stand where an expression goes.
+    if branch is node.consequence and node.alternative is None:
+      return node
+
+    self._folded += 1
+    condition: ast.Boolean = ast.Boolean(Token(TokenType.TRUE, 'verdadero', node.condition.token.position), True)
+    return ast.If(node.token, condition, branch)
+
+  def _fold(self, node: ast.Expression) -> ast.Expression:
+    try:
+      value = evaluate(node, Environment())
+    except ArithmeticError:
+      return node
+
+    literal = _literal(value, node.token.position)
+    if literal is None:
+      return node
+
+    self._folded += 1
+    return literal
+
+class _BoundNames(Transformer):
+
+  def __init__(self) -> None:
+    super().__init__()
+    self.names: Set[str] = set()
+
+  def visit_LetStatement(self, node: ast.LetStatement) -> ast.LetStatement:
+    if node.name is not None:
+      self.names.add(node.name.value)
+
+    return node
+
+  def visit_Function(self, node: ast.Function) -> ast.Function:
+    self.names.update(parameter.value for parameter in node.parameters)
+
+    return node
+
+def fold_constants(program: ast.Program) -> ast.Program:
+  return ConstantFolder(program).visit(program)
+
+def _bound_names(program: ast.Program) -> Set[str]:
+  collector: _BoundNames = _BoundNames()
+  collector.visit(program)
+
+  return collector.names
+
+def _is_constant(node: Optional[ast.ASTNode]) -> bool:
+  if type(node) == ast.Integer or type(node) == ast.Boolean:
+    return node.value is not None
+
+  return type(node) == ast.StringLiteral
+
+def _is_truthy(node: ast.Expression) -> bool:
+  # Only falso and nulo are falsy, and nulo has no literal.
+  return type(node) != ast.Boolean or bool(node.value)
+
+def _literal(value: Optional[Object], position: int) -> Optional[ast.Expression]:
+  if type(value) == Integer:
+    number: int = value.value
+    return ast.Integer(Token(TokenType.INT, str(number), position), number)
+  elif type(value) == Boolean:
+    truth: bool = value.value
+    token_type, literal = (TokenType.TRUE, 'verdadero') if truth else (TokenType.FALSE, 'falso')
+    return ast.Boolean(Token(token_type, literal, position), truth)
+  elif type(value) == String:
+    text: str = value.value
+    return ast.StringLiteral(Token(TokenType.STRING, text, position), text)
+
+  return None
@@ -0,0 +1,58 @@
+from typing import List, Set
+
+import lp.ast as ast
+from lp.transformer import Transformer
+
+# Drops the statements of a block, or of the program, that follow one that
+# always ends it: a regresa, or a si whose branches both always end theirs.
+# An Error ends a block as well, so whatever stops a branch stops the block.
+class DeadCodeEliminator(Transformer):
+
+  def __init__(self) -> None:
+    super().__init__()
+    self._removed: int = 0
+    # The si nodes whose branches both always end.
+    self._stopping: Set[int] = set()
+
+  @property
+  def removed(self) -> int:
+    return self._removed
+
+  def visit_Program(self, node: ast.Program) -> ast.Program:
+    node.statements = self._live(node.statements)
+
+    return node
+
+  def visit_Block(self, node: ast.Block) -> ast.Block:
+    node.statements = self._live(node.statements)
+
+    return node
+
+  # Visited after its branches, whose statements were already cut after the
+  # first that always ends them, so only their last one needs a look.
+  def visit_If(self, node: ast.If) -> ast.If:
+    if all(
+      branch is not None and branch.statements and self._always_stops(branch.statements[-1])
+      for branch in [node.consequence, node.alternative]
+    ):
+      self._stopping.add(id(node))
+
+    return node
+
+  def _live(self, statements: List[ast.Statement]) -> List[ast.Statement]:
+    for index, statement in enumerate(statements):
+      if self._always_stops(statement):
+        self._removed += len(statements) - index - 1
+        return statements[:index + 1]
+
+    return statements
+
+  def _always_stops(self, statement: ast.Statement) -> bool:
+    if type(statement) == ast.ReturnStatement:
+      return True
+
+    return type(statement) == ast.ExpressionStatement and id(statement.expression) in self._stopping
+
+def eliminate_dead_code(program: ast.Program) -> ast.Program:
+  return DeadCodeEliminator().visit(program)
+
@@ -0,0 +1,19 @@
+from typing import Callable, Dict, Optional
+
+from lp import closure_compiler, quickening, transpiler, vm
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.object import Environment, Object
+
+# Runs a parsed program in an environment and gives its result.
+Engine = Callable[[Program, Environment], Optional[Object]]
+
+# Every engine gives the same values and Errors as the tree-walking
+# evaluator, the default.
+ENGINES: Dict[str, Engine] = {
+  'arbol': evaluate,
+  'closures': closure_compiler.execute,
+  'vm': vm.execute,
+  'python': transpiler.execute,
+  'adaptativo': quickening.execute,
+}
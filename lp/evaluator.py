@@ -1,9 +1,12 @@
 from typing import (
+  Callable,
   cast,
+  Dict,
   List,
   Optional,
   Type,
-  Any
+  Any,
+  Union
 )
 
 import lp.ast as ast
@@ -16,11 +19,15 @@ from lp.object import (
   Return,
   Error,
   Environment,
+  Frame,
   Function,
   String,
   Builtin,
+  new_integer,
+  new_string,
 )
 from lp.builtins import BUILTINS
+from lp.resolver import resolve, Resolver
 
 
 TRUE = Boolean(True)
@@ -33,101 +40,118 @@ _UNKNOW_PREFIX_OPERATOR = 'Operador desconocido: {} {}'
 _UNKNOW_INFIX_OPERATOR = 'Operador desconocido: {} {} {}'
 _UNKNOW_IDENTIFIER = 'Identificador no encontrado: {}'
 
-def evaluate(node: ast.ASTNode, env: Environment) -> Optional[Object]:
-  node_type: Type = type(node)
+Env = Union[Environment, Frame]
+
+def evaluate(node: ast.ASTNode, env: Env) -> Optional[Object]:
+  return _HANDLERS[type(node)](node, env)
+
+# One handler per node class, looked up by the exact type of the node. The
+# handlers evaluate children through the table too, so each level of
+# nesting takes a single Python frame, as when this was one function.
+
+def _evaluate_expression_statement(node: ast.ExpressionStatement, env: Env) -> Optional[Object]:
+  expression = node.expression
   
-  if node_type == ast.Program:
-    node = cast(ast.Program, node)
-    
-    return _evaluate_program(node, env)
-  elif node_type == ast.ExpressionStatement:
-    node = cast(ast.ExpressionStatement, node)
-    
-    assert node.expression is not None
-    return evaluate(node.expression, env)
-  elif node_type == ast.Integer:
-    node = cast(ast.Integer, node)
-    
-    assert node.value is not None
-    return Integer(node.value)
-  elif node_type == ast.Boolean:
-    node = cast(ast.Boolean, node)
-    
-    assert node.value is not None
-    return _to_boolean_object(node.value)
-  elif node_type == ast.Prefix:
-    node = cast(ast.Prefix, node)
-    
-    assert node.right is not None
-    right = evaluate(node.right, env)
-    
-    assert right is not None
-    return _evaluate_prefix_expression(node.operator, right)
-  elif node_type == ast.Infix:
-    node = cast(ast.Infix, node)
-    
-    assert node.left is not None and node.right is not None
-    left = evaluate(node.left, env)
-    right = evaluate(node.right, env)
-    
-    assert right is not None and left is not None
-    return _evaluate_infix_expression(node.operator, left, right)
-  elif node_type == ast.Block:
-    node = cast(ast.Block, node)
-    
-    return _evaluate_block_statement(node, env)
-  elif node_type == ast.If:
-    node = cast(ast.If, node)
-    
-    return _evaluate_if_expression(node, env)
-  elif node_type == ast.ReturnStatement:
-    node = cast(ast.ReturnStatement, node)
-    
-    assert node.return_value is not None
-    value = evaluate(node.return_value, env)
-    
-    assert value is not None
-    return Return(value)
-  elif node_type == ast.LetStatement:
-    node = cast(ast.LetStatement, node)
-    
-    assert node.value is not None
-    value = evaluate(node.value, env)
-    
-    assert node.name is not None
-    env[node.name.value] = value
-  elif node_type == ast.Identifier:
-    node = cast(ast.Identifier, node)
-    
-    return _evaluate_identifier(node, env)
-  elif node_type == ast.Function:
-    node = cast(ast.Function, node)
-    
-    assert node.body is not None
-    return Function(node.parameters, node.body, env)
-  elif node_type == ast.Call:
-    node = cast(ast.Call, node)
-    
-    function = evaluate(node.function, env)
+  assert expression is not None
+  return _HANDLERS[type(expression)](expression, env)
 
-    assert node.arguments is not None
-    args = _evaluate_expression(node.arguments, env)
-    
-    assert function is not None
-    return _apply_function(function, args)
-  elif node_type == ast.StringLiteral:
-    node = cast(ast.StringLiteral, node)
-    
-    return String(node.value)
+def _evaluate_integer(node: ast.Integer, env: Env) -> Object:
+  assert node.value is not None
+  return new_integer(node.value)
+
+def _evaluate_boolean(node: ast.Boolean, env: Env) -> Object:
+  assert node.value is not None
+  return _to_boolean_object(node.value)
+
+def _evaluate_string(node: ast.StringLiteral, env: Env) -> Object:
+  return new_string(node.value)
+
+def _evaluate_parse_failure(node: ast.ParseFailure, env: Env) -> Object:
+  return Error(node.message, node.position)
+
+def _evaluate_prefix(node: ast.Prefix, env: Env) -> Object:
+  assert node.right is not None
+  right = _HANDLERS[type(node.right)](node.right, env)
   
-  return None
+  assert right is not None
+  if node.operands:
+    return new_integer(-cast(Integer, right).value)
+  
+  result = _evaluate_prefix_expression(node.operator, right)
+  
+  if type(result) == Error:
+    _locate_error(result, node)
+  return result
+
+def _evaluate_infix(node: ast.Infix, env: Env) -> Object:
+  assert node.left is not None and node.right is not None
+  left = _HANDLERS[type(node.left)](node.left, env)
+  right = _HANDLERS[type(node.right)](node.right, env)
+  
+  assert right is not None and left is not None
+  # lp.type_inference proved both types, and these never give an Error.
+  if node.operands == 'INTEGER':
+    return _INTEGER_OPERATIONS[node.operator](cast(Integer, left).value, cast(Integer, right).value)
+  elif node.operands:
+    return _STRING_OPERATIONS[node.operator](cast(String, left).value, cast(String, right).value)
+  
+  result = _evaluate_infix_expression(node.operator, left, right)
+  
+  if type(result) == Error:
+    _locate_error(result, node)
+  return result
+
+def _evaluate_return_statement(node: ast.ReturnStatement, env: Env) -> Object:
+  return_value = node.return_value
+  
+  assert return_value is not None
+  value = _HANDLERS[type(return_value)](return_value, env)
+  
+  assert value is not None
+  return Return(value)
+
+def _evaluate_let_statement(node: ast.LetStatement, env: Env) -> None:
+  expression = node.value
+  
+  assert expression is not None
+  value = _HANDLERS[type(expression)](expression, env)
+  
+  assert node.name is not None
+  if node.name.depth == 0:
+    cast(Frame, env).values[node.name.slot] = value
+  else:
+    cast(Environment, env)[node.name.value] = value
+
+def _evaluate_identifier_node(node: ast.Identifier, env: Env) -> Object:
+  result = _evaluate_identifier(node, env)
+  
+  if type(result) == Error:
+    _locate_error(result, node)
+  return result
+
+def _evaluate_function(node: ast.Function, env: Env) -> Object:
+  assert node.body is not None
+  return Function(node.parameters, node.body, env)
+
+def _evaluate_call(node: ast.Call, env: Env) -> Object:
+  function = _HANDLERS[type(node.function)](node.function, env)
+  
+  assert node.arguments is not None
+  args = _evaluate_expression(node.arguments, env)
+  
+  assert function is not None
+  result = _apply_function(function, args)
+  
+  if type(result) == Error:
+    _locate_error(result, node)
+  return result
 
 def _apply_function(fn: Object, args: List[Object]) -> Object:
   if type(fn) == Function:
     fn = cast(Function, fn)
     
     extended_environment = _extend_function_environment(fn, args)
-    evaluated = evaluate(fn.body, extended_environment)
+    evaluated = _evaluate_block_statement(fn.body, extended_environment)
     
     assert evaluated is not None
     return _unwrap_return_value(evaluated)
@@ -136,16 +160,25 @@ def _apply_function(fn: Object, args: List[Object]) -> Object:
     
     return fn.fn(*args)
   else:
-    return _new_error(_NOT_A_FUNCTION, [fn.type().name])
+    return _new_error(_NOT_A_FUNCTION, [fn.object_type.name])
 
 
-def _extend_function_environment(fn: Function, args: List[Object]) -> Environment:
-  env: Environment = Environment(outer=fn.env)
+def _extend_function_environment(fn: Function, args: List[Object]) -> Frame:
+  # Parses a lazy body first, which is when its locals get their slots.
+  fn.body.statements
+  scope = fn.body.scope
+  if scope is None:
+    scope = Resolver().function(fn.parameters, fn.body)
 
-  for idx, param in enumerate(fn.parameters):
-    env[param.value] = args[idx - 1]
+  names: Dict[str, int] = scope.names
+  values: List[Optional[Object]] = [None] * len(names)
 
-  return env
+  # A parameter left without an argument stays empty and is looked up
+  # outside, like any other unset variable.
+  for param, arg in zip(fn.parameters, args):
+    values[param.slot] = arg
+
+  return Frame(names, values, fn.env)
 
 def _unwrap_return_value(obj: Object) -> Object:
   if type(obj) == Return:
@@ -154,34 +187,68 @@ def _unwrap_return_value(obj: Object) -> Object:
   
   return obj
 
-def _evaluate_expression(expressions: List[ast.Expression], env: Environment) -> List[Object]:
+def _evaluate_expression(expressions: List[ast.Expression], env: Env) -> List[Object]:
   result: List[Object] = []
   
   for expression in expressions:
-    evaluated = evaluate(expression, env)
+    evaluated = _HANDLERS[type(expression)](expression, env)
     
     assert evaluated is not None
     result.append(evaluated)
     
   return result
 
-def _evaluate_identifier(node: ast.Identifier, env: Environment) -> Object:
-  try:
-    return env[node.value]
-  except KeyError:
-    return BUILTINS.get(node.value, _new_error(_UNKNOW_IDENTIFIER, [node.value]))
+def _evaluate_identifier(node: ast.Identifier, env: Env) -> Object:
+  depth: int = node.depth
+  
+  if depth < 0:
+    return _evaluate_global(node.value, env.globals)
+  
+  frame = cast(Frame, env)
+  if depth:
+    frame = frame.display[depth - 1]
+  
+  value = frame.values[node.slot]
+  if value is not None:
+    return value
+  
+  return _evaluate_unset_local(node.value, frame.outer)
+
+# The slot the resolver picked is still empty, so the name is looked for in
+# the frames around it instead, as if it had never been declared there.
+def _evaluate_unset_local(name: str, env: Env) -> Object:
+  while type(env) == Frame:
+    frame = cast(Frame, env)
+    slot = frame.names.get(name)
+    
+    if slot is not None and frame.values[slot] is not None:
+      return cast(Object, frame.values[slot])
+    env = frame.outer
+  
+  return _evaluate_global(name, cast(Environment, env))
+
+def _evaluate_global(name: str, env: Environment) -> Object:
+  value = env.get(name)
+  
+  if value is None:
+    value = BUILTINS.get(name)
+  
+  if value is None:
+    return _new_error(_UNKNOW_IDENTIFIER, [name])
+  
+  return value
 
-def _evaluate_if_expression(if_expression: ast.If, env: Environment) -> Optional[Object]:
+def _evaluate_if_expression(if_expression: ast.If, env: Env) -> Optional[Object]:
   assert if_expression.condition is not None
-  condition = evaluate(if_expression.condition, env)
+  condition = _HANDLERS[type(if_expression.condition)](if_expression.condition, env)
     
   
   assert condition is not None
   if _is_truthy(condition):
     assert if_expression.consequence is not None
-    return evaluate(if_expression.consequence, env)
+    return _evaluate_block_statement(if_expression.consequence, env)
   elif if_expression.alternative is not None:
-    return evaluate(if_expression.alternative, env)
+    return _evaluate_block_statement(if_expression.alternative, env)
   else:
     return NULL
 
@@ -195,11 +262,14 @@ def _is_truthy(obj: Object) -> bool:
   else:
     return True
   
-def _evaluate_program(program: ast.Program, env: Environment) -> Optional[Object]:
+def _evaluate_program(program: ast.Program, env: Env) -> Optional[Object]:
+  if not program.resolved:
+    resolve(program)
+  
   result: Optional[Object] = None
   
   for statement in program.statements:
-    result = evaluate(statement, env)
+    result = _HANDLERS[type(statement)](statement, env)
 
     if type(result) == Return:
       result = cast(Return, result)
@@ -209,14 +279,14 @@ def _evaluate_program(program: ast.Program, env: Environment) -> Optional[Object
   
   return result
 
-def _evaluate_block_statement(block: ast.Block, env: Environment) -> Optional[Object]:
+def _evaluate_block_statement(block: ast.Block, env: Env) -> Optional[Object]:
   result: Optional[Object] = None
   
   for statement in block.statements:
-    result = evaluate(statement, env)
+    result = _HANDLERS[type(statement)](statement, env)
     
-    if result is not None and ((result.type() == ObjectType.RETURN)
-                               or (result.type() == ObjectType.ERROR)):
+    if result is not None and ((result.object_type == ObjectType.RETURN)
+                               or (result.object_type == ObjectType.ERROR)):
       return result
     
   return result
@@ -232,79 +302,115 @@ def _evaluate_bang_operator_expression(right: Object) -> Object:
     return FALSE
 
 def _evaluate_infix_expression(operator: str, left: Object, right: Object) -> Object:
-  if left.type() == ObjectType.INTEGER and right.type() == ObjectType.INTEGER:
+  if left.object_type == ObjectType.INTEGER and right.object_type == ObjectType.INTEGER:
     return _evaluate_integer_expression(operator, left, right)
-  elif left.type() == ObjectType.STRING and right.type() == ObjectType.STRING:
+  elif left.object_type == ObjectType.STRING and right.object_type == ObjectType.STRING:
     return _evaluate_string_infix_expression(operator, left, right)
   elif operator == '==':
     return _to_boolean_object(left is right)
   elif operator == '!=':
     return _to_boolean_object(left is not right)
-  elif left.type() != right.type():
-    return _new_error(_TYPE_MISMATCH, [left.type().name, operator, right.type().name])
+  elif left.object_type != right.object_type:
+    return _new_error(_TYPE_MISMATCH, [left.object_type.name, operator, right.object_type.name])
   else:
-    return _new_error(_UNKNOW_INFIX_OPERATOR, [left.type().name, operator, right.type().name])
+    return _new_error(_UNKNOW_INFIX_OPERATOR, [left.object_type.name, operator, right.object_type.name])
+
+_INTEGER_OPERATIONS: Dict[str, Callable[[int, int], Object]] = {
+  '+': lambda left, right: new_integer(left + right),
+  '-': lambda left, right: new_integer(left - right),
+  '*': lambda left, right: new_integer(left * right),
+  '/': lambda left, right: new_integer(left // right),
+  '%': lambda left, right: new_integer(left % right),
+  '<': lambda left, right: TRUE if left < right else FALSE,
+  '>': lambda left, right: TRUE if left > right else FALSE,
+  '==': lambda left, right: TRUE if left == right else FALSE,
+  '!=': lambda left, right: TRUE if left != right else FALSE,
+  '<=': lambda left, right: TRUE if left <= right else FALSE,
+  '>=': lambda left, right: TRUE if left >= right else FALSE,
+}
+
+_STRING_OPERATIONS: Dict[str, Callable[[str, str], Object]] = {
+  '+': lambda left, right: new_string(left + right),
+  '==': lambda left, right: TRUE if left == right else FALSE,
+  '!=': lambda left, right: TRUE if left != right else FALSE,
+}
+
+# By the operand type lp.type_inference proved, the operations that can skip
+# checking it.
+_TYPED_OPERATIONS: Dict[str, Dict[str, Callable[[Any, Any], Object]]] = {
+  'INTEGER': _INTEGER_OPERATIONS,
+  'STRING': _STRING_OPERATIONS,
+}
 
 def _evaluate_integer_expression(operator: str, left: Object, right: Object) -> Object:
-  left_value: int = cast(Integer, left).value
-  right_value: int = cast(Integer, right).value
-  
-  if operator == '+':
-    return Integer(left_value + right_value)
-  elif operator == '-':
-    return Integer(left_value - right_value)
-  elif operator == '*':
-    return Integer(left_value * right_value)
-  elif operator == '/':
-    return Integer(left_value // right_value)
-  elif operator == '%':
-    return Integer(left_value % right_value)
-  elif operator == '<':
-    return _to_boolean_object(left_value < right_value)
-  elif operator == '>':
-    return _to_boolean_object(left_value > right_value)
-  elif operator == '==':
-    return _to_boolean_object(left_value == right_value)
-  elif operator == '!=':
-    return _to_boolean_object(left_value != right_value)
-  elif operator == '<=':
-    return _to_boolean_object(left_value <= right_value)
-  elif operator == '>=':
-    return _to_boolean_object(left_value >= right_value)
-  else:
-    return _new_error(_UNKNOW_INFIX_OPERATOR, [left.type().name, operator, right.type().name])
+  operation = _INTEGER_OPERATIONS.get(operator)
+  
+  if operation is None:
+    return _new_error(_UNKNOW_INFIX_OPERATOR, [left.object_type.name, operator, right.object_type.name])
+  return operation(cast(Integer, left).value, cast(Integer, right).value)
 
 def _evaluate_string_infix_expression(operator: str, left: Object, right: Object) -> Object:
-  left_value: str = cast(String, left).value
-  right_value: str = cast(String, right).value
+  operation = _STRING_OPERATIONS.get(operator)
   
-  if operator == '+':
-    return String(left_value + right_value)
-  elif operator == '==':
-    return _to_boolean_object(left_value == right_value)
-  elif operator == '!=':
-    return _to_boolean_object(left_value != right_value)
-  else:
-    return _new_error(_UNKNOW_INFIX_OPERATOR, [left.type().name, operator, right.type().name])
+  if operation is None:
+    return _new_error(_UNKNOW_INFIX_OPERATOR, [left.object_type.name, operator, right.object_type.name])
+  return operation(cast(String, left).value, cast(String, right).value)
 
 def _evaluate_minus_operator_expression(right: Object) -> Object:
   if type(right) != Integer:
-    return _new_error(_UNKNOW_PREFIX_OPERATOR, ['-', right.type().name])
+    return _new_error(_UNKNOW_PREFIX_OPERATOR, ['-', right.object_type.name])
   
   right = cast(Integer, right)
   
-  return Integer(-right.value)
+  return new_integer(-right.value)
 
 def _evaluate_prefix_expression(operator: str, right: Object) -> Object:
-  if operator == '!':
-    return _evaluate_bang_operator_expression(right)
-  elif operator == '-':
-    return _evaluate_minus_operator_expression(right)
-  else:
-    return _new_error(_UNKNOW_PREFIX_OPERATOR, [operator, right.type().name])
+  operation = _PREFIX_OPERATIONS.get(operator)
+  
+  if operation is None:
+    return _new_error(_UNKNOW_PREFIX_OPERATOR, [operator, right.object_type.name])
+  return operation(right)
+
+_PREFIX_OPERATIONS: Dict[str, Callable[[Object], Object]] = {
+  '!': _evaluate_bang_operator_expression,
+  '-': _evaluate_minus_operator_expression,
+}
+
+def _locate_error(error: Object, node: ast.ASTNode) -> None:
+  error = cast(Error, error)
+  
+  if error.position < 0:
+    error.position = cast(ast.Expression, node).token.position
 
 def _new_error(message: str, args: List[Any]) -> Error:
   return Error(message.format(*args))
 
 def _to_boolean_object(value: bool) -> Boolean:
   return TRUE if value else FALSE
+
+def _evaluate_nothing(node: Any, env: Env) -> None:
+  return None
+
+# Anything without a handler evaluates to None.
+class _Handlers(Dict[Type, Callable[[Any, Env], Optional[Object]]]):
+  
+  def __missing__(self, node_type: Type) -> Callable[[Any, Env], Optional[Object]]:
+    return _evaluate_nothing
+
+_HANDLERS: _Handlers = _Handlers({
+  ast.Program: _evaluate_program,
+  ast.ExpressionStatement: _evaluate_expression_statement,
+  ast.Integer: _evaluate_integer,
+  ast.Boolean: _evaluate_boolean,
+  ast.StringLiteral: _evaluate_string,
+  ast.Prefix: _evaluate_prefix,
+  ast.Infix: _evaluate_infix,
+  ast.Block: _evaluate_block_statement,
+  ast.If: _evaluate_if_expression,
+  ast.ReturnStatement: _evaluate_return_statement,
+  ast.LetStatement: _evaluate_let_statement,
+  ast.Identifier: _evaluate_identifier_node,
+  ast.Function: _evaluate_function,
+  ast.Call: _evaluate_call,
+  ast.ParseFailure: _evaluate_parse_failure,
+})
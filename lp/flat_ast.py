@@ -0,0 +1,567 @@
+from array import array
+from enum import IntEnum, unique
+from functools import partial
+from itertools import accumulate, chain, compress, repeat
+from operator import ge, le, lt
+from struct import calcsize, pack, unpack_from
+from sys import getsizeof, maxsize
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from lp.ast import (
+  ASTNode,
+  Block,
+  Boolean,
+  Call,
+  Expression,
+  ExpressionStatement,
+  Function,
+  Identifier,
+  If,
+  Infix,
+  Integer,
+  LetStatement,
+  Prefix,
+  Program,
+  ReturnStatement,
+  Statement,
+  StringLiteral,
+)
+from lp.parser import Parser
+from lp.token import Token, TokenType
+
+@unique
+class NodeKind(IntEnum):
+  LET = 1
+  RETURN = 2
+  EXPRESSION = 3
+  BLOCK = 4
+  IDENTIFIER = 5
+  INTEGER = 6
+  BOOLEAN = 7
+  STRING = 8
+  PREFIX = 9
+  INFIX = 10
+  IF = 11
+  FUNCTION = 12
+  CALL = 13
+
+_KINDS: Dict[type, NodeKind] = {
+  LetStatement: NodeKind.LET,
+  ReturnStatement: NodeKind.RETURN,
+  ExpressionStatement: NodeKind.EXPRESSION,
+  Block: NodeKind.BLOCK,
+  Identifier: NodeKind.IDENTIFIER,
+  Integer: NodeKind.INTEGER,
+  Boolean: NodeKind.BOOLEAN,
+  StringLiteral: NodeKind.STRING,
+  Prefix: NodeKind.PREFIX,
+  Infix: NodeKind.INFIX,
+  If: NodeKind.IF,
+  Function: NodeKind.FUNCTION,
+  Call: NodeKind.CALL,
+}
+
+_TOKEN_TYPES: List[TokenType] = [TokenType.ILLEGAL] * (max(t.value for t in TokenType) + 1)
+for _token_type in TokenType:
+  _TOKEN_TYPES[_token_type.value] = _token_type
+
+FORMAT_VERSION: int = 1
+
+_COLUMNS: List[Tuple[str, str]] = [
+  ('_kinds', 'B'),
+  ('_token_types', 'B'),
+  ('_literals', 'i'),
+  ('_positions', 'i'),
+  ('_values', 'i'),
+  ('_child_starts', 'i'),
+  ('_child_counts', 'i'),
+  ('_children', 'i'),
+  ('_statements', 'i'),
+]
+
+# The fewest and most children a row of each kind can have, by kind.
+_FEWEST_CHILDREN: List[int] = [0] * (max(NodeKind) + 1)
+_MOST_CHILDREN: List[int] = [0] * (max(NodeKind) + 1)
+for _kind, _fewest, _most in [
+  (NodeKind.LET, 2, 2),
+  (NodeKind.RETURN, 1, 1),
+  (NodeKind.EXPRESSION, 1, 1),
+  (NodeKind.BLOCK, 0, maxsize),
+  (NodeKind.PREFIX, 1, 1),
+  (NodeKind.INFIX, 2, 2),
+  (NodeKind.IF, 3, 3),
+  (NodeKind.FUNCTION, 1, maxsize),
+  (NodeKind.CALL, 1, maxsize),
+]:
+  _FEWEST_CHILDREN[_kind], _MOST_CHILDREN[_kind] = _fewest, _most
+
+# Whether the value of a row of each kind is an index into the string table.
+_STRING_VALUED: List[bool] = [False] * (max(NodeKind) + 1)
+for _kind in (NodeKind.IDENTIFIER, NodeKind.STRING, NodeKind.PREFIX, NodeKind.INFIX):
+  _STRING_VALUED[_kind] = True
+
+# Child slot of a missing node, and the marker a Call leaves in place of its
+# arguments when the parser could not read them.
+_NONE: int = -1
+_NO_ARGUMENTS: int = -2
+
+# Stands for a Call's unread arguments among the nodes _add walks.
+_MISSING_ARGUMENTS: object = object()
+
+# Same shortcut as the lexer: skips the NamedTuple constructor's overhead.
+_new_token = tuple.__new__
+
+# A program as rows in parallel typed arrays, one row per node, which takes
+# a fraction of the memory of the lp.ast objects. It is a storage format:
+# it is built from nodes, and what runs it is the Program that program()
+# or materialize give back, whose function bodies are only rebuilt when
+# they run. FlatAST(program) flattens a Program that was already parsed;
+# FlatAST.parse takes the statements from the parser one at a time, so only
+# the one being added ever exists as objects, never the whole program.
+class FlatAST:
+
+  def __init__(self, program: Program) -> None:
+    self._build(program.statements)
+
+  @classmethod
+  def parse(cls, parser: Parser) -> 'FlatAST':
+    flat: FlatAST = cls.__new__(cls)
+    flat._build(statement for _, statement in parser.parse_statements() if statement is not None)
+
+    return flat
+
+  def _build(self, statements: Iterable[Statement]) -> None:
+    self._kinds: array = array('B')
+    self._token_types: array = array('B')
+    self._literals: array = array('i')
+    self._positions: array = array('i')
+    self._values: array = array('i')
+    self._child_starts: array = array('i')
+    self._child_counts: array = array('i')
+    self._children: array = array('i')
+    self._strings: List[str] = []
+    self._string_indexes: Dict[str, int] = {}
+
+    self._statements: array = array('i', [self._add(statement) for statement in statements])
+    # Only needed while building; the rows keep the indexes.
+    self._string_indexes.clear()
+
+  def __len__(self) -> int:
+    return len(self._kinds)
+
+  def __str__(self) -> str:
+    return ''.join(self.render(index) for index in self._statements)
+
+  @property
+  def statements(self) -> List['FlatNode']:
+    return [FlatNode(self, index) for index in self._statements]
+
+  @classmethod
+  def from_bytes(cls, data: bytes) -> 'FlatAST':
+    flat: FlatAST = cls.__new__(cls)
+    columns: List[array] = [array(typecode) for _, typecode in _COLUMNS] + [array('I')]
+    lengths: Tuple[int, ...] = unpack_from(f'<{len(columns)}I', data)
+    offset: int = calcsize(f'<{len(columns)}I')
+
+    for column, length in zip(columns, lengths):
+      end = offset + length * column.itemsize
+      column.frombytes(data[offset:end])
+      offset = end
+
+    for (name, _), column in zip(_COLUMNS, columns):
+      setattr(flat, name, column)
+
+    flat._strings = []
+    for length in columns[-1]:
+      flat._strings.append(str(data[offset:offset + length], 'utf-8', 'surrogatepass'))
+      offset += length
+
+    if offset != len(data):
+      raise ValueError('Trailing data after the flat AST')
+
+    flat._string_indexes = {}
+    flat._check()
+    return flat
+
+  # Rejects rows that would index out of range, or loop forever in
+  # materialize: every child row must come before its parent's, as _add
+  # lays them out, and every string index must be in the table. The checks
+  # run over whole columns at C speed, since a cache hit pays for them.
+  def _check(self) -> None:
+    rows: int = len(self._kinds)
+    strings: List[str] = self._strings
+    kinds, values, child_counts, all_children = self._kinds, self._values, self._child_counts, self._children
+
+    if any(len(getattr(self, name)) != rows for name, _ in _COLUMNS[:7]):
+      raise ValueError('Flat AST columns of different lengths')
+    elif not rows:
+      if all_children or self._statements:
+        raise ValueError('Flat AST rows missing')
+      return
+    elif (
+      min(kinds) < min(NodeKind) or max(kinds) > max(NodeKind) or
+      max(self._token_types) >= len(_TOKEN_TYPES) or
+      min(self._literals) < 0 or max(self._literals) >= len(strings)
+    ):
+      raise ValueError('Flat AST kind, token type or literal out of range')
+    elif self._statements and (min(self._statements) < 0 or max(self._statements) >= rows):
+      raise ValueError('Flat AST statement out of range')
+
+    starts: array = array('i', accumulate(child_counts, initial=0))
+    if starts.pop() != len(all_children) or starts != self._child_starts or not (
+      all(map(le, map(_FEWEST_CHILDREN.__getitem__, kinds), child_counts)) and
+      all(map(ge, map(_MOST_CHILDREN.__getitem__, kinds), child_counts))
+    ):
+      raise ValueError('Flat AST children out of place')
+
+    parents: Iterable[int] = chain.from_iterable(map(repeat, range(rows), child_counts))
+    if all_children and (min(all_children) < _NO_ARGUMENTS or not all(map(lt, all_children, parents))):
+      raise ValueError('Flat AST child after its parent')
+
+    indexes: List[int] = list(compress(values, map(_STRING_VALUED.__getitem__, kinds)))
+    if indexes and (min(indexes) < 0 or max(indexes) >= len(strings)):
+      raise ValueError('Flat AST string out of range')
+
+    integers: List[int] = [value for value in compress(values, map(NodeKind.INTEGER.__eq__, kinds)) if value != _NONE]
+    if integers and (
+      min(integers) < 0 or max(integers) >= len(strings) or
+      not all(map(str.isdecimal, map(strings.__getitem__, integers)))
+    ):
+      raise ValueError('Flat AST integer out of range')
+
+    for start in compress(starts, map(NodeKind.FUNCTION.__eq__, kinds)):
+      body: int = all_children[start]
+      if body != _NONE and kinds[body] != NodeKind.BLOCK:
+        raise ValueError('Flat AST function body is not a block')
+
+  def nbytes(self) -> int:
+    columns: List[array] = [getattr(self, name) for name, _ in _COLUMNS]
+
+    return sum(column.itemsize * len(column) for column in columns) + \
+      getsizeof(self._strings) + sum(getsizeof(string) for string in self._strings)
+
+  # Column lengths as little-endian words, then every column in native byte
+  # order, then the string table as UTF-8; FORMAT_VERSION changes whenever
+  # this layout does.
+  def to_bytes(self) -> bytes:
+    encoded: List[bytes] = [string.encode('utf-8', 'surrogatepass') for string in self._strings]
+    columns: List[array] = [getattr(self, name) for name, _ in _COLUMNS] + [array('I', map(len, encoded))]
+
+    return b''.join([
+      pack(f'<{len(columns)}I', *map(len, columns)),
+      *[column.tobytes() for column in columns],
+      *encoded,
+    ])
+
+  def kind(self, index: int) -> NodeKind:
+    return NodeKind(self._kinds[index])
+
+  def token(self, index: int) -> Token:
+    return _new_token(Token, (
+      _TOKEN_TYPES[self._token_types[index]],
+      self._strings[self._literals[index]],
+      self._positions[index],
+    ))
+
+  def children(self, index: int) -> List[int]:
+    start = self._child_starts[index]
+
+    return list(self._children[start:start + self._child_counts[index]])
+
+  def program(self) -> Program:
+    return Program(statements=[self.materialize(index) for index in self._statements])
+
+  def _string(self, string: str) -> int:
+    index = self._string_indexes.get(string)
+
+    if index is None:
+      index = self._string_indexes[string] = len(self._strings)
+      self._strings.append(string)
+
+    return index
+
+  # Post-order over an explicit stack, like HashConser, so programs nested
+  # deeper than the recursion limit (see StackParser) can be flattened too.
+  # A node's children get their rows first, left to right.
+  def _add(self, root: Any) -> int:
+    indexes: List[int] = []
+    stack: List[Tuple[Any, Optional[List[Any]]]] = [(root, None)]
+    append = self._append
+
+    while stack:
+      node, children = stack.pop()
+
+      if node is None:
+        indexes.append(_NONE)
+      elif node is _MISSING_ARGUMENTS:
+        indexes.append(_NO_ARGUMENTS)
+      elif children is not None:
+        start: int = len(indexes) - len(children)
+        row: int = append(node, indexes[start:])
+        del indexes[start:]
+        indexes.append(row)
+      else:
+        children = _child_nodes(node)
+
+        if children:
+          stack.append((node, children))
+          stack.extend((child, None) for child in reversed(children))
+        else:
+          indexes.append(append(node, children))
+
+    return indexes[0]
+
+  def _append(self, node: Any, children: List[int]) -> int:
+    kind: NodeKind = _KINDS[type(node)]
+    value: int = _NONE
+
+    if kind == NodeKind.IDENTIFIER or kind == NodeKind.STRING:
+      value = self._string(node.value)
+    elif kind == NodeKind.INFIX or kind == NodeKind.PREFIX:
+      value = self._string(node.operator)
+    elif kind == NodeKind.INTEGER:
+      value = _NONE if node.value is None else self._string(str(node.value))
+    elif kind == NodeKind.BOOLEAN:
+      value = int(node.value)
+
+    token: Token = node.token
+    self._kinds.append(kind)
+    self._token_types.append(token.token_type.value)
+    self._literals.append(self._string(token.literal))
+    self._positions.append(token.position)
+    self._values.append(value)
+    self._child_starts.append(len(self._children))
+    self._child_counts.append(len(children))
+    self._children.extend(children)
+
+    return len(self._kinds) - 1
+
+  # Post-order over an explicit stack, as _add is. Function bodies are left
+  # to _lazy_block, so only their parameters are built with the function.
+  def materialize(self, root: int) -> Any:
+    built: List[Any] = []
+    stack: List[Tuple[int, bool]] = [(root, False)]
+    child_starts, child_counts, all_children = self._child_starts, self._child_counts, self._children
+    kinds, token_types, literals, positions = self._kinds, self._token_types, self._literals, self._positions
+    strings, values = self._strings, self._values
+
+    while stack:
+      index, children_done = stack.pop()
+
+      # Also the _NO_ARGUMENTS marker, which _build_call reads from children.
+      if index < 0:
+        built.append(None)
+        continue
+
+      start: int = child_starts[index]
+      children: array = all_children[start:start + child_counts[index]]
+      kind: int = kinds[index]
+      eager: array = children[1:] if kind == NodeKind.FUNCTION else children
+
+      if eager and not children_done:
+        stack.append((index, True))
+        stack.extend((child, False) for child in reversed(eager))
+        continue
+
+      first: int = len(built) - len(eager)
+      token: Token = _new_token(Token, (_TOKEN_TYPES[token_types[index]], strings[literals[index]], positions[index]))
+      node = _BUILDERS[kind](self, token, children, built[first:], values[index])
+      del built[first:]
+      built.append(node)
+
+    return built[0]
+
+  # One builder per NodeKind, looked up by kind in _BUILDERS; children is the
+  # node's slice of the _children column and built the nodes materialize made
+  # of them.
+  def _build_let(self, token: Token, children: array, built: List[Any], value: int) -> LetStatement:
+    return LetStatement(token, built[0], built[1])
+
+  def _build_return(self, token: Token, children: array, built: List[Any], value: int) -> ReturnStatement:
+    return ReturnStatement(token, built[0])
+
+  def _build_expression(self, token: Token, children: array, built: List[Any], value: int) -> ExpressionStatement:
+    return ExpressionStatement(token, built[0])
+
+  def _build_block(self, token: Token, children: array, built: List[Any], value: int) -> Block:
+    return Block(token, built)
+
+  def _build_identifier(self, token: Token, children: array, built: List[Any], value: int) -> Identifier:
+    return Identifier(token, self._strings[value])
+
+  def _build_integer(self, token: Token, children: array, built: List[Any], value: int) -> Integer:
+    return Integer(token, None if value == _NONE else int(self._strings[value]))
+
+  def _build_boolean(self, token: Token, children: array, built: List[Any], value: int) -> Boolean:
+    return Boolean(token, bool(value))
+
+  def _build_string(self, token: Token, children: array, built: List[Any], value: int) -> StringLiteral:
+    return StringLiteral(token, self._strings[value])
+
+  def _build_prefix(self, token: Token, children: array, built: List[Any], value: int) -> Prefix:
+    return Prefix(token, self._strings[value], built[0])
+
+  def _build_infix(self, token: Token, children: array, built: List[Any], value: int) -> Infix:
+    return Infix(token, built[0], self._strings[value], built[1])
+
+  def _build_if(self, token: Token, children: array, built: List[Any], value: int) -> If:
+    return If(token, built[0], built[1], built[2])
+
+  def _build_function(self, token: Token, children: array, built: List[Any], value: int) -> Function:
+    return Function(token, built, self._lazy_block(children[0]))
+
+  def _build_call(self, token: Token, children: array, built: List[Any], value: int) -> Call:
+    arguments: Optional[List[Expression]] = None
+    if len(children) != 2 or children[1] != _NO_ARGUMENTS:
+      arguments = built[1:]
+
+    return Call(token, built[0], arguments)
+
+  def _materialize_statements(self, indexes: Sequence[int]) -> List[Statement]:
+    materialize = self.materialize
+    return [materialize(index) for index in indexes]
+
+  # Function bodies become lazy blocks, so only the ones that are actually
+  # used get turned back into objects.
+  def _lazy_block(self, index: int) -> Optional[Block]:
+    if index == _NONE:
+      return None
+
+    block: Block = Block(self.token(index), statements=[])
+    del block.statements
+    block._parse_statements = partial(self._materialize_statements, self.children(index))
+
+    return block
+
+  # Post-order over an explicit stack, as _add is.
+  def render(self, root: int) -> str:
+    rendered: List[str] = []
+    stack: List[Tuple[int, bool]] = [(root, False)]
+
+    while stack:
+      index, children_done = stack.pop()
+
+      if index == _NONE:
+        rendered.append('None')
+        continue
+
+      children: List[int] = self.children(index)
+
+      if not children_done:
+        assert self._kinds[index] != NodeKind.CALL or children[1:] != [_NO_ARGUMENTS]
+        stack.append((index, True))
+        stack.extend((child, False) for child in reversed(children))
+        continue
+
+      first: int = len(rendered) - len(children)
+      text: str = self._render_row(index, children, rendered[first:])
+      del rendered[first:]
+      rendered.append(text)
+
+    return rendered[0]
+
+  def _render_row(self, index: int, children: List[int], rendered: List[str]) -> str:
+    kind: int = self._kinds[index]
+    literal: str = self._strings[self._literals[index]]
+    value: int = self._values[index]
+
+    if kind == NodeKind.LET:
+      return f'{literal} {rendered[0]} = {rendered[1]};'
+    elif kind == NodeKind.RETURN:
+      return f'{literal} {rendered[0]};'
+    elif kind == NodeKind.EXPRESSION:
+      return rendered[0]
+    elif kind == NodeKind.BLOCK:
+      return ''.join(rendered)
+    elif kind == NodeKind.IDENTIFIER:
+      return self._strings[value]
+    elif kind == NodeKind.INTEGER:
+      return 'None' if value == _NONE else self._strings[value]
+    elif kind in (NodeKind.BOOLEAN, NodeKind.STRING):
+      return literal
+    elif kind == NodeKind.PREFIX:
+      return f'({self._strings[value]}{rendered[0]})'
+    elif kind == NodeKind.INFIX:
+      return f'({rendered[0]} {self._strings[value]} {rendered[1]})'
+    elif kind == NodeKind.IF:
+      out: str = f'si {rendered[0]} {rendered[1]}'
+
+      if children[2] != _NONE:
+        out += f'si_no {rendered[2]}'
+
+      return out
+    elif kind == NodeKind.FUNCTION:
+      return f'{literal}({", ".join(rendered[1:])}) {rendered[0]}'
+
+    return f'{rendered[0]}({", ".join(rendered[1:])})'
+
+_BUILDERS: List[Callable[[FlatAST, Token, array, List[Any], int], Any]] = [FlatAST._build_call] * (max(NodeKind) + 1)
+_BUILDERS[NodeKind.LET] = FlatAST._build_let
+_BUILDERS[NodeKind.RETURN] = FlatAST._build_return
+_BUILDERS[NodeKind.EXPRESSION] = FlatAST._build_expression
+_BUILDERS[NodeKind.BLOCK] = FlatAST._build_block
+_BUILDERS[NodeKind.IDENTIFIER] = FlatAST._build_identifier
+_BUILDERS[NodeKind.INTEGER] = FlatAST._build_integer
+_BUILDERS[NodeKind.BOOLEAN] = FlatAST._build_boolean
+_BUILDERS[NodeKind.STRING] = FlatAST._build_string
+_BUILDERS[NodeKind.PREFIX] = FlatAST._build_prefix
+_BUILDERS[NodeKind.INFIX] = FlatAST._build_infix
+_BUILDERS[NodeKind.IF] = FlatAST._build_if
+_BUILDERS[NodeKind.FUNCTION] = FlatAST._build_function
+
+# The children of a node, in the order _add gives them rows.
+def _child_nodes(node: Any) -> List[Any]:
+  node_type = type(node)
+
+  if node_type == Infix:
+    return [node.left, node.right]
+  elif node_type == ExpressionStatement:
+    return [node.expression]
+  elif node_type == Call:
+    arguments = node.arguments
+    return [node.function, *([_MISSING_ARGUMENTS] if arguments is None else arguments)]
+  elif node_type == LetStatement:
+    return [node.name, node.value]
+  elif node_type == Prefix:
+    return [node.right]
+  elif node_type == ReturnStatement:
+    return [node.return_value]
+  elif node_type == Block:
+    return list(node.statements)
+  elif node_type == If:
+    return [node.condition, node.consequence, node.alternative]
+  elif node_type == Function:
+    return [node.body, *node.parameters]
+
+  return []
+
+class FlatNode:
+
+  def __init__(self, tree: FlatAST, index: int) -> None:
+    self._tree = tree
+    self._index = index
+
+  def __str__(self) -> str:
+    return self._tree.render(self._index)
+
+  @property
+  def index(self) -> int:
+    return self._index
+
+  @property
+  def kind(self) -> NodeKind:
+    return self._tree.kind(self._index)
+
+  @property
+  def token(self) -> Token:
+    return self._tree.token(self._index)
+
+  @property
+  def children(self) -> List[Optional['FlatNode']]:
+    return [
+      FlatNode(self._tree, child) if child >= 0 else None
+      for child in self._tree.children(self._index)
+    ]
+
+  def materialize(self) -> Optional[ASTNode]:
+    return self._tree.materialize(self._index)
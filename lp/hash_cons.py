@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Tuple
+
+from lp.ast import ASTNode, NODE_FIELDS, Program
+
+# Replaces structurally identical subtrees with a single shared node, so
+# anything later attached to a node is computed once per distinct subtree.
+# Nodes are compared by type, token type and literal, their plain fields and
+# the identity of their already shared children; token positions are left
+# out, so a shared node keeps the position of its first occurrence.
+#
+# Nodes are rewired in place: the program passed in must not be used with
+# its old, unshared subtrees afterwards. Lazy bodies are parsed as they are
+# reached.
+class HashConser:
+
+  def __init__(self) -> None:
+    self._nodes: Dict[Tuple[Any, ...], ASTNode] = {}
+    self._visited: int = 0
+
+  @property
+  def visited(self) -> int:
+    return self._visited
+
+  @property
+  def unique(self) -> int:
+    return len(self._nodes)
+
+  def program(self, program: Program) -> Program:
+    program.statements = [self.node(statement) for statement in program.statements]
+
+    return program
+
+  # Post-order over an explicit stack, so expressions nested deeper than the
+  # recursion limit (see StackParser) can be shared too.
+  def node(self, root: Any) -> Any:
+    if root is None:
+      return None
+
+    shared: Dict[int, ASTNode] = {}
+    stack: List[Tuple[Any, bool]] = [(root, False)]
+
+    while stack:
+      node, children_done = stack.pop()
+      if id(node) in shared:
+        continue
+
+      scalars, child_fields, list_fields = NODE_FIELDS[type(node)]
+
+      if not children_done:
+        stack.append((node, True))
+
+        for field in child_fields:
+          child = getattr(node, field)
+          if child is not None:
+            stack.append((child, False))
+
+        for field in list_fields:
+          for child in getattr(node, field) or ():
+            stack.append((child, False))
+
+        continue
+
+      key: List[Any] = [type(node), node.token.token_type, node.token.literal]
+
+      for field in scalars:
+        key.append(getattr(node, field))
+
+      for field in child_fields:
+        child = getattr(node, field)
+        if child is not None:
+          child = shared[id(child)]
+          setattr(node, field, child)
+
+        key.append(child)
+
+      for field in list_fields:
+        children = getattr(node, field)
+        if children is not None:
+          children = [shared[id(child)] for child in children]
+          setattr(node, field, children)
+          key.append(tuple(children))
+        else:
+          key.append(None)
+
+      self._visited += 1
+      shared[id(node)] = self._nodes.setdefault(tuple(key), node)
+
+    return shared[id(root)]
@@ -0,0 +1,90 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+
+from lp.ast import Program, Statement
+from lp.lexer import Lexer
+from lp.parser import Parser
+from lp.token import SymbolTable, symbol_table
+
+# (start of the top-level statement being parsed, error position, message)
+ParseError = Tuple[int, int, str]
+
+class IncrementalDocument:
+
+  def __init__(self, source: str) -> None:
+    self._source: str = ''
+    self._starts: List[int] = []
+    self._statements: List[Statement] = []
+    self._errors: List[ParseError] = []
+    self._symbols: SymbolTable = symbol_table()
+
+    self.edit(0, 0, source)
+
+  @property
+  def errors(self) -> List[str]:
+    return [message for _, _, message in self._errors]
+
+  @property
+  def error_positions(self) -> List[int]:
+    return [position for _, position, _ in self._errors]
+
+  @property
+  def program(self) -> Program:
+    return Program(statements=list(self._statements))
+
+  @property
+  def source(self) -> str:
+    return self._source
+
+  def edit(self, offset: int, removed: int, inserted: str) -> Program:
+    old_end: int = offset + removed
+    source: str = self._source[:offset] + inserted + self._source[old_end:]
+    delta: int = len(inserted) - removed
+    edit_end: int = offset + len(inserted)
+
+    # The token just before the edit can merge with the inserted text, as
+    # = and = make ==, and that token may be the lookahead that ended the
+    # statement before it: re-parsing starts one statement before the one
+    # holding the character before the edit.
+    first: int = max(bisect_right(self._starts, offset - 1) - 2, 0)
+    region_start: int = self._starts[first] if first > 0 else 0
+
+    starts: List[int] = []
+    statements: List[Statement] = []
+    errors: List[ParseError] = []
+    resync: int = len(self._starts)
+
+    parser: Parser = Parser(Lexer(source, region_start, symbols=self._symbols))
+    seen_errors: int = 0
+
+    for position, statement in parser.parse_statements():
+      if position >= edit_end:
+        # From here on the text is unchanged, so reaching an old statement
+        # boundary means every following statement parses as before.
+        old_position = position - delta
+        index = bisect_left(self._starts, old_position, first)
+
+        if index < len(self._starts) and self._starts[index] == old_position:
+          resync = index
+          break
+
+      for error_index in range(seen_errors, len(parser.errors)):
+        errors.append((position, parser.error_positions[error_index], parser.errors[error_index]))
+      seen_errors = len(parser.errors)
+
+      if statement is not None:
+        starts.append(position)
+        statements.append(statement)
+
+    resync_start: float = self._starts[resync] if resync < len(self._starts) else float('inf')
+
+    self._errors = [error for error in self._errors if error[0] < region_start] + errors + [
+      (owner + delta, position + delta, message)
+      for owner, position, message in self._errors
+      if owner >= resync_start
+    ]
+    self._starts[first:] = starts + [start + delta for start in self._starts[resync:]]
+    self._statements[first:resync] = statements
+    self._source = source
+
+    return self.program
@@ -0,0 +1,225 @@
+from collections import Counter
+from copy import copy
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import lp.ast as ast
+from lp.transformer import Transformer
+
+# Nodes in the body's expression, the largest helper inlined by default.
+MAX_SIZE: int = 16
+
+_SIMPLE = (ast.Identifier, ast.Integer, ast.Boolean, ast.StringLiteral)
+
+# Replaces calls to small helpers with their body, the parameters replaced by
+# the arguments. A helper is a top-level `variable name = procedimiento...`
+# that:
+#
+# - is the only binding of its name anywhere in the program, so the name
+#   means that procedimiento at every call site after it; calls before it, or
+#   inside it, are left alone, which also rules out recursion;
+# - has a single expression as its body, with no procedimiento, variable or
+#   regresa inside, of at most max_size nodes;
+# - only reads names no procedimiento binds besides its own parameters, so
+#   they mean the same wherever the body lands.
+#
+# lp expressions have no side effects, so an argument may be dropped or
+# repeated, but only a literal or a name is: anything else could be costly
+# or never finish. Helpers named in exclude are never inlined.
+class Inliner(Transformer):
+
+  def __init__(
+    self,
+    program: ast.Program,
+    max_size: int = MAX_SIZE,
+    exclude: Iterable[str] = ()
+  ) -> None:
+    super().__init__()
+    self._max_size = max_size
+    self._exclude: FrozenSet[str] = frozenset(exclude)
+    self._bindings, self._local_names = bindings(program)
+    self._top_level: Set[int] = {id(statement) for statement in program.statements}
+    self._helpers: Dict[str, Tuple[List[str], ast.Expression]] = {}
+    self._inlined: int = 0
+
+  @property
+  def inlined(self) -> int:
+    return self._inlined
+
+  # Statements are visited in order, so a helper is added once its own
+  # statement is done, in time for the statements after it.
+  def visit_LetStatement(self, node: ast.LetStatement) -> ast.LetStatement:
+    if id(node) in self._top_level:
+      self._add_helper(node)
+
+    return node
+
+  def visit_Program(self, node: ast.Program) -> ast.Program:
+    if self._inlined:
+      node.resolved = False
+
+    return node
+
+  def visit_Call(self, node: ast.Call) -> ast.Expression:
+    function = node.function
+
+    if type(function) != ast.Identifier or node.arguments is None:
+      return node
+
+    helper = self._helpers.get(function.value)
+    if helper is None or len(helper[0]) != len(node.arguments):
+      return node
+
+    parameters, body = helper
+    uses: Counter = _uses(body, parameters)
+    for parameter, argument in zip(parameters, node.arguments):
+      if uses[parameter] != 1 and not isinstance(argument, _SIMPLE):
+        return node
+
+    self._inlined += 1
+    return substitute(body, dict(zip(parameters, node.arguments)))
+
+  def _add_helper(self, statement: ast.LetStatement) -> None:
+    function = statement.value
+    if statement.name is None or type(function) != ast.Function:
+      return
+
+    name: str = statement.name.value
+    if name in self._exclude or self._bindings[name] != 1:
+      return
+
+    body: Optional[ast.Expression] = _body_expression(function)
+    parameters: List[str] = [parameter.value for parameter in function.parameters]
+    if body is None or len(set(parameters)) != len(parameters):
+      return
+
+    size: int = 0
+    stack: List[Any] = [body]
+    while stack:
+      node = stack.pop()
+      node_type = type(node)
+
+      if node is None:
+        continue
+      elif node_type in (ast.Function, ast.LetStatement, ast.ReturnStatement):
+        return
+      elif node_type == ast.Identifier and node.value not in parameters and \
+        (node.value == name or node.value in self._local_names):
+        return
+
+      size += 1
+      _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+      stack.extend(getattr(node, field) for field in child_fields)
+      for field in list_fields:
+        stack.extend(getattr(node, field) or ())
+
+    if size <= self._max_size:
+      self._helpers[name] = (parameters, body)
+
+def inline(program: ast.Program, max_size: int = MAX_SIZE, exclude: Iterable[str] = ()) -> ast.Program:
+  return Inliner(program, max_size, exclude).visit(program)
+
+# How many times each name is bound anywhere in the program, and the names
+# bound inside some procedimiento, as a parameter or a local.
+def bindings(program: ast.Program) -> Tuple[Counter, Set[str]]:
+  bindings: Counter = Counter()
+  local_names: Set[str] = set()
+  stack: List[Tuple[Any, bool]] = [(statement, False) for statement in program.statements]
+
+  while stack:
+    node, in_function = stack.pop()
+    node_type = type(node)
+
+    if node is None:
+      continue
+    elif node_type == ast.Function:
+      in_function = True
+      for parameter in node.parameters:
+        bindings[parameter.value] += 1
+        local_names.add(parameter.value)
+    elif node_type == ast.LetStatement and node.name is not None:
+      bindings[node.name.value] += 1
+      if in_function:
+        local_names.add(node.name.value)
+
+    _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+    stack.extend((getattr(node, field), in_function) for field in child_fields)
+    for field in list_fields:
+      stack.extend((child, in_function) for child in getattr(node, field) or ())
+
+  return bindings, local_names
+
+def _body_expression(function: ast.Function) -> Optional[ast.Expression]:
+  if function.body is None or len(function.body.statements) != 1:
+    return None
+
+  statement = function.body.statements[0]
+  if type(statement) == ast.ExpressionStatement:
+    return statement.expression
+  elif type(statement) == ast.ReturnStatement:
+    return statement.return_value
+
+  return None
+
+def _uses(body: ast.Expression, parameters: List[str]) -> Counter:
+  uses: Counter = Counter()
+  stack: List[Any] = [body]
+
+  while stack:
+    node = stack.pop()
+    node_type = type(node)
+
+    if node is None:
+      continue
+    elif node_type == ast.Identifier and node.value in parameters:
+      uses[node.value] += 1
+
+    _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+    stack.extend(getattr(node, field) for field in child_fields)
+    for field in list_fields:
+      stack.extend(getattr(node, field) or ())
+
+  return uses
+
+# Copies the body with the arguments in place of the parameters. Leaves are
+# shared, so every copy keeps the positions errors are reported at. The copy
+# is made top-down, each node copied before its children are.
+def substitute(node: Any, arguments: Dict[str, ast.Expression]) -> Any:
+  result, copied = _substitute_node(node, arguments)
+  stack: List[Any] = [result] if copied else []
+
+  while stack:
+    node = stack.pop()
+    _, child_fields, list_fields = ast.NODE_FIELDS[type(node)]
+
+    for field in child_fields:
+      child, copied = _substitute_node(getattr(node, field), arguments)
+      setattr(node, field, child)
+      if copied:
+        stack.append(child)
+
+    for field in list_fields:
+      children = getattr(node, field)
+      if children is None:
+        continue
+
+      substituted: List[Any] = []
+      for child in children:
+        child, copied = _substitute_node(child, arguments)
+        substituted.append(child)
+        if copied:
+          stack.append(child)
+      setattr(node, field, substituted)
+
+  return result
+
+# The node to put in the copy, and whether it is a new copy whose children
+# still have to be substituted.
+def _substitute_node(node: Any, arguments: Dict[str, ast.Expression]) -> Tuple[Any, bool]:
+  node_type = type(node)
+
+  if node_type == ast.Identifier:
+    return arguments.get(node.value, node), False
+  elif node is None or node_type in _SIMPLE:
+    return node, False
+
+  return copy(node), True
@@ -0,0 +1,112 @@
+from functools import partial
+from typing import List, Optional
+
+from lp.ast import Block, ExpressionStatement, Function, ParseFailure, Statement
+from lp.lexer import TokenSource
+from lp.parser import Parser
+from lp.token import Token, TokenType
+
+class _TokenList:
+
+  def __init__(self, tokens: List[Token]) -> None:
+    self._tokens = tokens
+    self._index = 0
+
+  def next_token(self) -> Token:
+    token = self._tokens[min(self._index, len(self._tokens) - 1)]
+    self._index += 1
+
+    return token
+
+class LazyParser(Parser):
+
+  def __init__(self, lexer: TokenSource, full_check: bool = False) -> None:
+    self._full_check = full_check
+    self._deferred: List[Block] = []
+
+    super().__init__(lexer)
+
+  # Parses every body still pending, nested ones included, so errors in
+  # functions that were never called get reported too.
+  def check(self) -> List[str]:
+    index: int = 0
+
+    while index < len(self._deferred):
+      self._deferred[index].statements
+      index += 1
+
+    self._deferred = []
+    return self.errors
+
+  def _parse_function(self) -> Optional[Function]:
+    if self._full_check:
+      return super()._parse_function()
+
+    assert self._current_token is not None
+    function = Function(self._current_token)
+
+    if not self._expected_token(TokenType.LPAREN):
+      return None
+
+    function.parameters = self._parse_function_parameters()
+
+    if not self._expected_token(TokenType.LBRACE):
+      return None
+
+    function.body = self._defer_block()
+
+    return function
+
+  # Only matches braces, keeping the body's tokens to parse them on first
+  # use. Strings were already lexed, so braces inside them don't count.
+  def _defer_block(self) -> Block:
+    assert self._current_token is not None and self._peek_token is not None
+    block = Block(token=self._current_token, statements=[])
+    tokens: List[Token] = [self._current_token]
+    depth: int = 1
+
+    next_token = self._lexer.next_token
+    token: Token = self._peek_token
+    while depth and token.token_type is not TokenType.EOF:
+      tokens.append(token)
+
+      if token.token_type is TokenType.LBRACE:
+        depth += 1
+      elif token.token_type is TokenType.RBRACE:
+        depth -= 1
+
+      token = next_token()
+
+    tokens.append(Token(TokenType.EOF, '', token.position))
+
+    if depth:
+      self._current_token, self._peek_token = token, next_token()
+    else:
+      self._current_token, self._peek_token = tokens[-2], token
+
+    del block.statements
+    block._parse_statements = partial(self._parse_deferred, tokens)
+    self._deferred.append(block)
+
+    return block
+
+  # The errors go to the parser's list, as check() reports them, and the body
+  # becomes a ParseFailure for the first one.
+  def _parse_deferred(self, tokens: List[Token]) -> List[Statement]:
+    lexer, current_token, peek_token = self._lexer, self._current_token, self._peek_token
+    errors: int = len(self._errors)
+
+    self._lexer = _TokenList(tokens)
+    self._advance_tokens()
+    self._advance_tokens()
+
+    try:
+      statements: List[Statement] = self._parse_block().statements
+    finally:
+      self._lexer, self._current_token, self._peek_token = lexer, current_token, peek_token
+
+    if len(self._errors) == errors:
+      return statements
+
+    failure: ParseFailure = ParseFailure(tokens[0], self._errors[errors], self._error_positions[errors])
+    return [ExpressionStatement(tokens[0], failure)]
@@ -1,146 +1,205 @@
-from re import match
+from mmap import mmap
+from re import compile, escape, DOTALL, VERBOSE
+from sys import intern
+from typing import Dict, Iterator, List, Match, Optional, Pattern, Tuple, Union
+from typing_extensions import Protocol
 
 from lp.token import (
+  KEYWORDS,
+  SymbolTable,
   Token,
   TokenType,
-  lookup_token_type
+  lookup_symbol,
+  symbol_table,
 )
 
-class Lexer:
-  def __init__(self, source: str) -> None:
-    self._source: str = source
-    self._character: str = ''
-    self._read_position: int = 0
-    self._position:int = 0
+Buffer = Union[bytes, bytearray, memoryview, mmap]
+Span = Tuple[TokenType, int, int]
+
+_TOKEN_PATTERN: Pattern[str] = compile(r'''
+  \s*
+  (?:
+    (?P<IDENT>[a-záéíóúA-ZÁÉÍÓÚñÑ_][a-záéíóúA-ZÁÉÍÓÚñÑ_\d]*)
+    | (?P<INT>\d+)
+    | "(?P<STRING>[^"]*)"?
+    | (?P<OPERATOR>==|!=|<=|>=|[-=+*/<>!%(){},;])
+    | (?P<EOF>\Z)
+    | (?P<ILLEGAL>.)
+  )
+''', VERBOSE | DOTALL)
+
+# Skips the Python-level NamedTuple constructor on the hot path.
+_new_token = tuple.__new__
+
+_IDENT: int = _TOKEN_PATTERN.groupindex['IDENT']
+_OPERATOR: int = _TOKEN_PATTERN.groupindex['OPERATOR']
+_STRING: int = _TOKEN_PATTERN.groupindex['STRING']
+
+_GROUP_TOKEN_TYPES: Dict[int, TokenType] = {
+  _TOKEN_PATTERN.groupindex['INT']: TokenType.INT,
+  _TOKEN_PATTERN.groupindex['STRING']: TokenType.STRING,
+  _TOKEN_PATTERN.groupindex['EOF']: TokenType.EOF,
+  _TOKEN_PATTERN.groupindex['ILLEGAL']: TokenType.ILLEGAL,
+}
+
+_OPERATORS: Dict[str, TokenType] = {
+  '==': TokenType.EQ,
+  '!=': TokenType.NOT_EQ,
+  '<=': TokenType.L_OR_EQ,
+  '>=': TokenType.G_OR_EQ,
+  '=': TokenType.ASSING,
+  '+': TokenType.PLUS,
+  '-': TokenType.MINUS,
+  '*': TokenType.MULTIPLICATION,
+  '/': TokenType.DIVISION,
+  '<': TokenType.LT,
+  '>': TokenType.GT,
+  '!': TokenType.NEGATION,
+  '%': TokenType.MOD,
+  '(': TokenType.LPAREN,
+  ')': TokenType.RPAREN,
+  '{': TokenType.LBRACE,
+  '}': TokenType.RBRACE,
+  ',': TokenType.COMMA,
+  ';': TokenType.SEMICOLON,
+}
+
+_LETTER_BYTES: bytes = rb'[a-zA-Z_]|\xc3[\x81\x89\x8d\x91\x93\x9a\xa1\xa9\xad\xb1\xb3\xba]'
+_IDENTIFIER_BYTES: bytes = _LETTER_BYTES + rb'|[0-9]'
+
+_FIXED_LITERALS: Dict[TokenType, str] = {
+  **{token_type: literal for literal, token_type in _OPERATORS.items()},
+  **{token_type: literal for literal, token_type in KEYWORDS.items()},
+  TokenType.EOF: '',
+}
 
-    self._read_character()
+def _compile_buffer_pattern() -> Tuple[Pattern[bytes], List[TokenType]]:
+  alternatives: List[bytes] = []
+  group_token_types: List[TokenType] = [TokenType.ILLEGAL]
   
-  def next_token(self) -> Token:
-    self._skip_whitespace()
+  for literal, token_type in sorted(_OPERATORS.items(), key=lambda item: -len(item[0])):
+    alternatives.append(b'(' + escape(literal.encode()) + b')')
+    group_token_types.append(token_type)
     
-    if match(r'^=$', self._character):
-      if self._peek_character() == '=':
-        token = self._make_two_character_token(TokenType.EQ)
-      else:
-        token = Token(TokenType.ASSING, self._character)
-    elif match(r'^\+$', self._character):
-      token = Token(TokenType.PLUS, self._character)
-    elif match(r'^$', self._character):
-      token = Token(TokenType.EOF, self._character)
-    elif match(r'^\($', self._character):
-      token = Token(TokenType.LPAREN, self._character)
-    elif match(r'^\)$', self._character):
-      token = Token(TokenType.RPAREN, self._character)
-    elif match(r'^\{$', self._character):
-      token = Token(TokenType.LBRACE, self._character)
-    elif match(r'^\}$', self._character):
-      token = Token(TokenType.RBRACE, self._character)
-    elif match(r'^,$', self._character):
-      token = Token(TokenType.COMMA, self._character)
-    elif match(r'^;$', self._character):
-      token = Token(TokenType.SEMICOLON, self._character)
-    elif self._is_letter(self._character):
-      literal = self._read_identifier()
-      token_type = lookup_token_type(literal)
-      
-      return Token(token_type, literal)
-    elif self._is_number(self._character):
-      literal = self._read_number()
-
-      return Token(TokenType.INT, literal)
-    elif match(r'^<$', self._character):
-      if self._peek_character() == '=':
-        token = self._make_two_character_token(TokenType.L_OR_EQ)
-      else:
-        token = Token(TokenType.LT, self._character)
-    elif match(r'^"$', self._character):
-      literal = self._read_string()
-      
-      return Token(TokenType.STRING, literal)
-    elif match(r'^-$', self._character):
-      token = Token(TokenType.MINUS, self._character)
-    elif match(r'^\*$', self._character):
-      token = Token(TokenType.MULTIPLICATION, self._character)
-    elif match(r'^/$', self._character):
-      token = Token(TokenType.DIVISION, self._character)
-    elif match(r'^>$', self._character):
-      if self._peek_character() == '=':
-        token = self._make_two_character_token(TokenType.G_OR_EQ)
-      else:
-        token = Token(TokenType.GT, self._character)
-    elif match(r'^!$', self._character):
-      if self._peek_character() == '=':
-        token = self._make_two_character_token(TokenType.NOT_EQ)
-      else:
-        token = Token(TokenType.NEGATION, self._character)
-    elif match(r'^%$', self._character):
-      token = Token(TokenType.MOD, self._character)
-    else: 
-      token =  Token(TokenType.ILLEGAL, self._character)
-
-    self._read_character()
-
-    return token
-  
-  def _is_letter(self, character: str) -> bool:
-    return bool(match(r'^[a-záéíóúA-ZÁÉÍÓÚñÑ_]$', character))
+  for literal, token_type in KEYWORDS.items():
+    alternatives.append(b'(' + escape(literal.encode()) + b')(?!' + _IDENTIFIER_BYTES + b')')
+    group_token_types.append(token_type)
   
-  def _is_number(self, character: str) -> bool:
-    return bool(match(r'^\d$', character))
+  alternatives += [
+    b'((?:' + _LETTER_BYTES + b')(?:' + _IDENTIFIER_BYTES + b')*)',
+    rb'([0-9]+)',
+    rb'"([^"]*)"?',
+    rb'(\Z)',
+    rb'([\xc0-\xff][\x80-\xbf]*|.)',
+  ]
+  group_token_types += [
+    TokenType.IDENT,
+    TokenType.INT,
+    TokenType.STRING,
+    TokenType.EOF,
+    TokenType.ILLEGAL,
+  ]
   
-  def _make_two_character_token(self, token_type: TokenType) -> Token:
-    prefix = self._character
-    self._read_character()
-    suffix = self._character
-    
-    return Token(token_type, f'{prefix}{suffix}')
+  return compile(rb'\s*(?:' + b'|'.join(alternatives) + b')', DOTALL), group_token_types
+
+_BUFFER_TOKEN_PATTERN, _BUFFER_GROUP_TOKEN_TYPES = _compile_buffer_pattern()
+
+class TokenSource(Protocol):
   
-  def _peek_character(self) -> str:
-    if self._read_position >= len(self._source):
-      return ''
-    
-    return self._source[self._read_position]
-    
+  def next_token(self) -> Token: ...
 
-  def _read_character(self) -> None:
-    if self._read_position >= len(self._source):
-      self._character = ''
-    else:
-      self._character = self._source[self._read_position]
+def token_position(token_type: TokenType, start: int) -> int:
+  return start - 1 if token_type == TokenType.STRING else start
 
-      self._position = self._read_position
-      self._read_position += 1
-      
-  def _read_identifier(self) -> str:
-    initial_position = self._position
+def token_literal(source: Union[str, Buffer], token_type: TokenType, start: int, end: int) -> str:
+  try:
+    return _FIXED_LITERALS[token_type]
+  except KeyError:
+    if isinstance(source, str):
+      literal = source[start:end]
+    else:
+      literal = str(source[start:end], 'utf-8', 'replace')
     
-    while self._is_letter(self._character) or self._is_number(self._character):
-      self._read_character()
-      
-    return self._source[initial_position: self._position]
+    return intern(literal) if token_type == TokenType.IDENT else literal
+
+class Lexer:
+  def __init__(
+    self,
+    source: str,
+    start: int = 0,
+    end: Optional[int] = None,
+    symbols: Optional[SymbolTable] = None
+  ) -> None:
+    self._source: str = source
+    self._end: int = len(source) if end is None else end
+    self._symbols: SymbolTable = symbol_table() if symbols is None else symbols
+    self._matches: Iterator[Match[str]] = _TOKEN_PATTERN.finditer(source, start, self._end)
+
+  def next_token(self) -> Token:
+    match: Optional[Match[str]] = next(self._matches, None)
+
+    if match is None:
+      return Token(TokenType.EOF, '', self._end)
+
+    # Every alternative of the pattern is a group, so lastindex is set.
+    group: int = match.lastindex or 0
+    literal: str = match.group(group)
+    position: int = match.start(group)
+
+    if group == _IDENT:
+      symbol = self._symbols.get(literal) or lookup_symbol(self._symbols, literal)
+      return _new_token(Token, (symbol[0], symbol[1], position))
+    elif group == _OPERATOR:
+      return _new_token(Token, (_OPERATORS[literal], literal, position))
+    elif group == _STRING:
+      return _new_token(Token, (TokenType.STRING, literal, position - 1))
+
+    return _new_token(Token, (_GROUP_TOKEN_TYPES[group], literal, position))
   
-  def _read_number(self) -> str:
-    initial_position = self._position
+  def next_span(self) -> Span:
+    match: Optional[Match[str]] = next(self._matches, None)
     
-    while self._is_number(self._character):
-      self._read_character()
-      
-    return self._source[initial_position : self._position]
-  
-  def _read_string(self) -> str:
-    self._read_character()
+    if match is None:
+      return TokenType.EOF, self._end, self._end
+    
+    group: int = match.lastindex or 0
+    start, end = match.span(group)
     
-    initial_position = self._position
+    if group == _IDENT:
+      return lookup_symbol(self._symbols, match.group(group))[0], start, end
+    elif group == _OPERATOR:
+      return _OPERATORS[match.group(group)], start, end
     
-    while self._character != '"' and self._read_position <= len(self._source):
-      self._read_character()
-      
-    string = self._source[initial_position : self._position]
+    return _GROUP_TOKEN_TYPES[group], start, end
+  
+  def literal(self, token_type: TokenType, start: int, end: int) -> str:
+    return token_literal(self._source, token_type, start, end)
 
-    self._read_character()
+class BufferLexer:
+  def __init__(self, buffer: Buffer) -> None:
+    self._buffer: Buffer = buffer
+    self._length: int = len(buffer)
+    self._matches: Iterator[Match[bytes]] = _BUFFER_TOKEN_PATTERN.finditer(buffer)
 
-    return string
+  def next_span(self) -> Span:
+    match: Optional[Match[bytes]] = next(self._matches, None)
+    
+    if match is None:
+      return TokenType.EOF, self._length, self._length
+    
+    group: int = match.lastindex or 0
+    start, end = match.span(group)
+    
+    return _BUFFER_GROUP_TOKEN_TYPES[group], start, end
+  
+  def literal(self, token_type: TokenType, start: int, end: int) -> str:
+    return token_literal(self._buffer, token_type, start, end)
   
-  def _skip_whitespace(self) -> None:
-    while match(r'^\s$', self._character):
-      self._read_character()
\ No newline at end of file
+  def next_token(self) -> Token:
+    token_type, start, end = self.next_span()
+    
+    return Token(
+      token_type,
+      self.literal(token_type, start, end),
+      token_position(token_type, start)
+    )
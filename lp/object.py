@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import auto, Enum
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
 from lp.ast import Block, Identifier
 from typing_extensions import Protocol
 
@@ -15,10 +15,13 @@ class ObjectType(Enum):
   STRING = auto()
   
 class Object(ABC):
+  __slots__ = ()
+  
+  # Read directly on hot paths; type() stays for existing callers.
+  object_type: ObjectType
   
-  @abstractmethod
   def type(self) -> ObjectType:
-    pass
+    return self.object_type
   
   @abstractmethod
   def inspect(self) -> str:
@@ -26,89 +29,132 @@ class Object(ABC):
   
 
 class Integer(Object):
+  __slots__ = ('value',)
+  object_type = ObjectType.INTEGER
+  
   def __init__(self, value: int) -> None:
     self.value = value
-    
-  def type(self) -> ObjectType:
-    return ObjectType.INTEGER
   
   def inspect(self) -> str:
     return str(self.value)
   
   
 class Boolean(Object):
+  __slots__ = ('value',)
+  object_type = ObjectType.BOOLEAN
+  
   def __init__(self, value: bool) -> None:
     self.value = value
-    
-  def type(self) -> ObjectType:
-    return ObjectType.BOOLEAN
   
   def inspect(self) -> str:
     return 'verdadero' if self.value else 'falso'
 
   
 class Null(Object):
-  def type(self) -> ObjectType:
-    return ObjectType.NULL
+  __slots__ = ()
+  object_type = ObjectType.NULL
   
   def inspect(self) -> str:
     return 'nulo'
   
 class Return(Object):
+  __slots__ = ('value',)
+  object_type = ObjectType.RETURN
+  
   def __init__(self, value: Object) -> None:
     self.value = value
-    
-  def type(self) -> ObjectType:
-    return ObjectType.RETURN
   
   def inspect(self) -> str:
     return self.value.inspect()
 
 class Error(Object):
-  def __init__(self, message: str) -> None:
+  __slots__ = ('message', 'position')
+  object_type = ObjectType.ERROR
+  
+  def __init__(self, message: str, position: int = -1) -> None:
     self.message = message
-
-  def type(self) -> ObjectType:
-    return ObjectType.ERROR
+    self.position = position
   
   def inspect(self) -> str:
     return f'Error: {self.message}'
   
 class Environment(Dict):
+  __slots__ = ('_store', '_outer')
   
   def __init__(self, outer = None) -> None:
     self._store: Dict[Any, Any] = dict()
     self._outer = outer
     
   def __getitem__(self, key):
-    try:
-      return self._store[key]
-    except KeyError as e:
-      if self._outer is not None:
-        return self._outer[key]
+    env = self
+    
+    # Names come interned from the lexer, so each scope's probe is decided
+    # by identity and a miss costs no exception until the global scope.
+    while env is not None:
+      store = env._store
+      if key in store:
+        return store[key]
       
-      raise e
+      env = env._outer
+    
+    raise KeyError(key)
   
   def __setitem__(self, key, value):
     self._store[key] = value
+  
+  def get(self, key, default = None):
+    env = self
+    
+    while env is not None:
+      store = env._store
+      if key in store:
+        return store[key]
+      
+      env = env._outer
+    
+    return default
+  
+  # Where resolved globals are looked up; a Frame points at the same one.
+  @property
+  def globals(self) -> 'Environment':
+    return self
     
   def __delitem__(self, key):
     del self._store[key]
 
+# The variables of one procedimiento call, in the slots lp.resolver laid out
+# for them. display holds the enclosing frames, innermost first, so one
+# depth down is a single index however deep closures nest. names maps slots
+# back for the rare lookup that can't use one, such as a local read before
+# its variable statement ran.
+class Frame:
+  __slots__ = ('names', 'values', 'outer', 'display', 'globals')
+  
+  def __init__(
+    self,
+    names: Dict[str, int],
+    values: List[Optional[Object]],
+    outer: Union['Frame', Environment]
+  ) -> None:
+    self.names = names
+    self.values = values
+    self.outer = outer
+    self.display: Tuple[Frame, ...] = (outer,) + outer.display if isinstance(outer, Frame) else ()
+    self.globals: Environment = outer.globals
+
 class Function(Object):
+  __slots__ = ('parameters', 'body', 'env')
+  object_type = ObjectType.FUNCTION
   
   def __init__(
     self,
     parameters: List[Identifier],
     body: Block,
-    env: Environment
+    env: Union[Frame, Environment]
   ) -> None:
     self.parameters = parameters
     self.body = body
     self.env = env
-
-  def type(self) -> ObjectType:
-    return ObjectType.FUNCTION
   
   def inspect(self) -> str:
     params: str = ', '.join([str(param) for param in self.parameters])
@@ -116,12 +162,11 @@ class Function(Object):
     return 'procedimiento({}) {{\n{}\n}}'.format(params, str(self.body))
   
 class String(Object):
+  __slots__ = ('value',)
+  object_type = ObjectType.STRING
   
   def __init__(self, value: str) -> None:
     self.value = value
-    
-  def type(self) -> ObjectType:
-    return ObjectType.STRING
   
   def inspect(self) -> str:
     return self.value
@@ -131,12 +176,25 @@ class BuiltinFunction(Protocol):
   def __call__(self, *args: Object) -> Object: ...
 
 class Builtin(Object):
+  __slots__ = ('fn',)
+  object_type = ObjectType.BUILTIN
   
   def __init__(self, fn: BuiltinFunction):
     self.fn = fn
-    
-  def type(self) -> ObjectType:
-    return ObjectType.BUILTIN
   
   def inspect(self) -> str:
     return 'builtin function'
+
+# Runtime values are never mutated, so the common ones are shared instead of
+# allocated at every arithmetic step.
+_SMALL_INTEGERS: List[Integer] = [Integer(value) for value in range(-5, 257)]
+_EMPTY_STRING: String = String('')
+
+def new_integer(value: int) -> Integer:
+  if -5 <= value <= 256:
+    return _SMALL_INTEGERS[value + 5]
+  
+  return Integer(value)
+
+def new_string(value: str) -> String:
+  return String(value) if value else _EMPTY_STRING
@@ -0,0 +1,128 @@
+from time import perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from lp.ast import Program
+from lp.common_subexpressions import CommonSubexpressionEliminator
+from lp.constant_folding import ConstantFolder
+from lp.dead_code import DeadCodeEliminator
+from lp.evaluator import evaluate
+from lp.inliner import Inliner
+from lp.lexer import Lexer
+from lp.object import Environment, Error, Function, Object
+from lp.parser import Parser
+from lp.specializer import Specializer
+from lp.strength_reduction import StrengthReducer
+from lp.type_inference import TypeInference
+
+# A pass rewrites the program, in place or not, and says how many nodes it
+# changed.
+Pass = Callable[[Program], Tuple[Program, int]]
+
+class PassReport(NamedTuple):
+  name: str
+  seconds: float
+  changed: int
+
+def _inlining(program: Program) -> Tuple[Program, int]:
+  inliner: Inliner = Inliner(program)
+  return inliner.visit(program), inliner.inlined
+
+def _constant_folding(program: Program) -> Tuple[Program, int]:
+  folder: ConstantFolder = ConstantFolder(program)
+  return folder.visit(program), folder.folded
+
+def _specialization(program: Program) -> Tuple[Program, int]:
+  specializer: Specializer = Specializer(program)
+  return specializer.visit(program), specializer.specialized
+
+def _strength_reduction(program: Program) -> Tuple[Program, int]:
+  inference: TypeInference = TypeInference()
+  reducer: StrengthReducer = StrengthReducer(inference.is_integer)
+  return reducer.visit(inference.program(program)), reducer.reduced
+
+def _dead_code(program: Program) -> Tuple[Program, int]:
+  eliminator: DeadCodeEliminator = DeadCodeEliminator()
+  return eliminator.visit(program), eliminator.removed
+
+def _common_subexpressions(program: Program) -> Tuple[Program, int]:
+  eliminator: CommonSubexpressionEliminator = CommonSubexpressionEliminator()
+  return eliminator.visit(program), eliminator.eliminated
+
+def _type_inference(program: Program) -> Tuple[Program, int]:
+  inference: TypeInference = TypeInference()
+  return inference.program(program), inference.specialized
+
+PASSES: Dict[str, Pass] = {
+  'inlining': _inlining,
+  'constant_folding': _constant_folding,
+  'specialization': _specialization,
+  'strength_reduction': _strength_reduction,
+  'dead_code': _dead_code,
+  'common_subexpressions': _common_subexpressions,
+  'type_inference': _type_inference,
+}
+
+# Inlining goes first so folding sees the arguments in place, then
+# specialization, for the arguments folding left as literals. Common
+# subexpressions come late, since their temporaries keep helpers from
+# inlining.
+# Type inference marks the program as it finally is.
+LEVELS: Dict[int, List[str]] = {
+  0: [],
+  1: ['constant_folding', 'strength_reduction', 'dead_code', 'type_inference'],
+  2: [
+    'inlining',
+    'constant_folding',
+    'specialization',
+    'strength_reduction',
+    'dead_code',
+    'common_subexpressions',
+    'type_inference',
+  ],
+}
+
+class Optimizer:
+
+  def __init__(self, level: int = 1, passes: Optional[List[str]] = None) -> None:
+    self._passes: List[str] = LEVELS[level] if passes is None else passes
+    self._reports: List[PassReport] = []
+
+    for name in self._passes:
+      if name not in PASSES:
+        raise ValueError(f'Pase de optimizacion desconocido: {name}')
+
+  @property
+  def reports(self) -> List[PassReport]:
+    return self._reports
+
+  def optimize(self, program: Program) -> Program:
+    for name in self._passes:
+      start = perf_counter()
+      program, changed = PASSES[name](program)
+      self._reports.append(PassReport(name, perf_counter() - start, changed))
+
+    return program
+
+# Evaluates the source as parsed and as optimized, each in a new
+# Environment, and describes how the results differ, if they do.
+def verify(source: str, level: int = 2, passes: Optional[List[str]] = None) -> Optional[str]:
+  expected: str = _describe(evaluate(Parser(Lexer(source)).parse_program(), Environment()))
+  program: Program = Optimizer(level, passes).optimize(Parser(Lexer(source)).parse_program())
+  optimized: str = _describe(evaluate(program, Environment()))
+
+  if expected == optimized:
+    return None
+
+  return f'sin optimizar: {expected}; optimizado: {optimized}'
+
+def _describe(result: Optional[Object]) -> str:
+  if result is None:
+    return 'None'
+  elif type(result) == Function:
+    # Their body is printed, and optimizing is meant to change it.
+    parameters: str = ', '.join(str(parameter) for parameter in result.parameters)
+    return f'procedimiento({parameters})'
+  elif type(result) == Error:
+    return f'{result.inspect()} ({result.position})'
+
+  return f'{result.object_type.name} {result.inspect()}'
@@ -0,0 +1,143 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from re import compile
+from typing import List, Optional, Pattern, Tuple
+
+from lp.ast import Program, Statement
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+Chunk = Tuple[int, int]
+ChunkResult = Tuple[List[Statement], List[str], List[int]]
+
+# Strings are matched whole so the braces and semicolons inside them are
+# skipped. Semicolons are matched as runs: a statement starting at a
+# semicolon swallows the next one as its terminator, so only the end of a
+# run is a safe boundary.
+_BOUNDARY_PATTERN: Pattern[str] = compile(r'"[^"]*"?|[{}()]|;(?:\s*;)*')
+_IDENTIFIER: Pattern[str] = compile(r'[a-záéíóúA-ZÁÉÍÓÚñÑ_\d]')
+_OPERATOR_CHARACTERS: str = '-+*/%<>!='
+
+_worker_source: str = ''
+
+# A lone semicolon right after an operator or `regresa` is taken by the
+# parser as the missing operand, and the expression may go on past it.
+def _is_operand(source: str, semicolon: int) -> bool:
+  index: int = semicolon - 1
+  while index >= 0 and source[index].isspace():
+    index -= 1
+
+  if index < 0:
+    return False
+  elif source[index] in _OPERATOR_CHARACTERS:
+    return True
+
+  keyword_start: int = index - len('regresa') + 1
+
+  return (
+    source.startswith('regresa', keyword_start)
+    and (keyword_start == 0 or not _IDENTIFIER.match(source, keyword_start - 1))
+  )
+
+# The parser only opens a block or a group on a brace or paren this scan
+# also counts, so in a well-formed program a semicolon run outside both
+# ends a top-level statement. Malformed input can fool it, as the parser
+# recovers from errors its own way; ParallelParser then parses again
+# sequentially.
+def statement_boundaries(source: str) -> List[int]:
+  boundaries: List[int] = []
+  braces: int = 0
+  parens: int = 0
+
+  for match in _BOUNDARY_PATTERN.finditer(source):
+    character: str = match.group()[0]
+
+    if character == ';':
+      if braces == 0 and parens == 0 and (match.end() - match.start() > 1 or not _is_operand(source, match.start())):
+        boundaries.append(match.end())
+    elif character == '{':
+      braces += 1
+    elif character == '}':
+      braces = max(braces - 1, 0)
+    elif character == '(':
+      parens += 1
+    elif character == ')':
+      parens = max(parens - 1, 0)
+
+  return boundaries
+
+def split_source(source: str, chunks: int) -> List[Chunk]:
+  target: int = max(len(source) // max(chunks, 1), 1)
+  ranges: List[Chunk] = []
+  start: int = 0
+
+  for boundary in statement_boundaries(source):
+    if boundary - start >= target:
+      ranges.append((start, boundary))
+      start = boundary
+
+  if start < len(source) or not ranges:
+    ranges.append((start, len(source)))
+
+  return ranges
+
+def _initialize_worker(source: str) -> None:
+  global _worker_source
+  _worker_source = source
+
+def _parse_chunk(chunk: Chunk) -> ChunkResult:
+  return _parse_range(_worker_source, chunk)
+
+def _parse_range(source: str, chunk: Chunk) -> ChunkResult:
+  start, end = chunk
+  parser: Parser = Parser(Lexer(source, start, end))
+  program: Program = parser.parse_program()
+
+  return program.statements, parser.errors, parser.error_positions
+
+class ParallelParser:
+
+  def __init__(self, source: str, workers: Optional[int] = None, chunks_per_worker: int = 4) -> None:
+    self._source: str = source
+    self._workers: int = workers or cpu_count() or 1
+    self._chunks_per_worker: int = chunks_per_worker
+    self._errors: List[str] = []
+    self._error_positions: List[int] = []
+
+  @property
+  def errors(self) -> List[str]:
+    return self._errors
+
+  @property
+  def error_positions(self) -> List[int]:
+    return self._error_positions
+
+  def parse_program(self) -> Program:
+    chunks: List[Chunk] = split_source(self._source, self._workers * self._chunks_per_worker)
+    results: List[ChunkResult]
+
+    if self._workers == 1 or len(chunks) == 1:
+      results = [_parse_range(self._source, chunk) for chunk in chunks]
+    else:
+      with ProcessPoolExecutor(
+        max_workers=self._workers,
+        initializer=_initialize_worker,
+        initargs=(self._source,)
+      ) as executor:
+        results = list(executor.map(_parse_chunk, chunks))
+
+    # A chunk with errors may not end where the statement it holds does, so
+    # the errors a sequential parse gives can differ: it is parsed that way.
+    if len(chunks) > 1 and any(errors for _, errors, _ in results):
+      results = [_parse_range(self._source, (0, len(self._source)))]
+
+    program: Program = Program(statements=[])
+    self._errors = []
+    self._error_positions = []
+
+    for statements, errors, error_positions in results:
+      program.statements.extend(statements)
+      self._errors.extend(errors)
+      self._error_positions.extend(error_positions)
+
+    return program
@@ -1,7 +1,8 @@
 from enum import IntEnum
-from typing import Optional, List, Callable, Dict
+from typing import Optional, List, Callable, Dict, Iterator, Tuple
 
-from lp.lexer import Lexer
+from lp.hash_cons import HashConser
+from lp.lexer import TokenSource
 from lp.ast import (
   Program,
   Statement,
@@ -53,11 +54,13 @@ PRECEDENCEES: Dict[TokenType, Precedence] = {
 
 class Parser:
   
-  def __init__(self, lexer: Lexer) -> None:
+  def __init__(self, lexer: TokenSource, hash_cons: bool = False) -> None:
     self._lexer = lexer
+    self._hash_cons = hash_cons
     self._current_token: Optional[Token] = None
     self._peek_token: Optional[Token] = None
     self._errors: List[str] = []
+    self._error_positions: List[int] = []
     
     self._prefix_parse_fns: PrefixParsFns = self._register_prefix_fns()
     self._infix_parse_fns: InfixParsFns = self._register_infix_fns()
@@ -67,21 +70,37 @@ class Parser:
   @property
   def errors(self) -> List[str]:
     return self._errors
+  
+  @property
+  def error_positions(self) -> List[int]:
+    return self._error_positions
 
   def parse_program(self) -> Program:
     program: Program = Program(statements=[])
     
-    assert self._current_token is not None
-    while self._current_token.token_type != TokenType.EOF:
-      statement = self._parse_statement()
+    for _, statement in self.parse_statements():
       if statement is not None:
         program.statements.append(statement)
-        
-      self._advance_tokens()
+    
+    if self._hash_cons:
+      HashConser().program(program)
     
     return program
+  
+  def parse_statements(self) -> Iterator[Tuple[int, Optional[Statement]]]:
+    assert self._current_token is not None
+    while self._current_token.token_type != TokenType.EOF:
+      position = self._current_token.position
+      
+      yield position, self._parse_statement()
+        
+      self._advance_tokens()
 
     
+  def _add_error(self, message: str, position: int) -> None:
+    self._errors.append(message)
+    self._error_positions.append(position)
+    
   def _advance_tokens(self) -> None:
     self._current_token = self._peek_token
     self._peek_token = self._lexer.next_token()
@@ -107,7 +126,7 @@ class Parser:
     error = f'Se esperaba que el siguiente token fuera {token_type},' + \
       f' pero se obtuvo {self._peek_token.token_type}'
 
-    self._errors.append(error)
+    self._add_error(error, self._peek_token.position)
     
   def _parse_expression(self, precedece: Precedence)  -> Optional[Expression]:
     assert self._current_token is not None
@@ -116,20 +135,20 @@ class Parser:
     except KeyError:
       message = f'No se encontro ninguna funcion para parsear {self._current_token.literal}.'
 
-      self.errors.append(message)
+      self._add_error(message, self._current_token.position)
       return None
     
     left_expression = prefix_parse_fn()
     
     assert self._peek_token is not None
-    while not self._peek_token.token_type == TokenType.SEMICOLON and \
+    while left_expression is not None and \
+      not self._peek_token.token_type == TokenType.SEMICOLON and \
       precedece < self._peek_precedence():
       try:
         infix_parse_fn = self._infix_parse_fns[self._peek_token.token_type]
         
         self._advance_tokens()
         
-        assert left_expression is not None
         left_expression = infix_parse_fn(left_expression)
       except KeyError:
         return left_expression
@@ -179,7 +198,7 @@ class Parser:
       message = f'No se ha podido parsear {self._current_token.literal} ' +\
         'como entero.'
         
-      self._errors.append(message)
+      self._add_error(message, self._current_token.position)
       
       return None
     
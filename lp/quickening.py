@@ -0,0 +1,315 @@
+from typing import Any, Callable, Dict, List, Optional, cast
+
+import lp.ast as ast
+from lp.evaluator import (
+  Env,
+  FALSE,
+  NULL,
+  TRUE,
+  _INTEGER_OPERATIONS,
+  _NOT_A_FUNCTION,
+  _STRING_OPERATIONS,
+  _TYPED_OPERATIONS,
+  _Handlers,
+  _evaluate_bang_operator_expression,
+  _evaluate_identifier,
+  _evaluate_infix_expression,
+  _evaluate_prefix_expression,
+  _extend_function_environment,
+  _is_truthy,
+  _locate_error,
+  _new_error,
+  _unwrap_return_value,
+)
+from lp.object import (
+  Builtin,
+  Environment,
+  Error,
+  Frame,
+  Function,
+  Integer,
+  Object,
+  ObjectType,
+  Return,
+  String,
+  new_integer,
+  new_string,
+)
+from lp.resolver import resolve
+
+# Runs a node takes in the generic path before it rewrites itself.
+WARMUP: int = 2
+
+# Guard failures after which a node stays generic for good.
+MAX_DEOPTIMIZATIONS: int = 4
+
+_RETURN = ObjectType.RETURN
+_ERROR = ObjectType.ERROR
+
+# The variants a node rewrites itself into, kept in its quick field. Each one
+# guards on what it was specialized for and, when that fails, sends the node
+# back to warming up in the generic path.
+
+# An Infix that saw two Integers.
+class _IntegerInfix:
+  __slots__ = ('operation',)
+
+  def __init__(self, operation: Callable[[int, int], Object]) -> None:
+    self.operation = operation
+
+# An Infix that saw two Strings.
+class _StringInfix:
+  __slots__ = ('operation',)
+
+  def __init__(self, operation: Callable[[str, str], Object]) -> None:
+    self.operation = operation
+
+# A Call that saw procedimientos with the same body, whose frame layout is
+# worked out once; the guard is on the body's scope, so a body resolved
+# again since can't reuse it.
+class _MonomorphicCall:
+  __slots__ = ('scope', 'slots')
+
+  def __init__(self, scope: Any, slots: List[int]) -> None:
+    self.scope = scope
+    self.slots = slots
+
+# A node that kept failing its guards.
+_GENERIC: object = object()
+
+# Evaluates like lp.evaluator, except that Infix and Call nodes rewrite
+# themselves after their first runs into a variant specialized for what they
+# saw: an operation on two Integers or two Strings, or a call to one
+# procedimiento. Nodes keep their variants between runs, like inline caches;
+# specialized and deoptimized count what this evaluator did to them.
+class Quickener:
+
+  def __init__(self, warmup: int = WARMUP, max_deoptimizations: int = MAX_DEOPTIMIZATIONS) -> None:
+    self._warmup = warmup
+    self._max_deoptimizations = max_deoptimizations
+    self._specialized: int = 0
+    self._deoptimized: int = 0
+    self._failures: Dict[int, List[Any]] = {}
+    self._handlers: _Handlers = _Handlers({
+      ast.Program: self._program,
+      ast.ExpressionStatement: self._expression_statement,
+      ast.Integer: self._integer,
+      ast.Boolean: self._boolean,
+      ast.StringLiteral: self._string,
+      ast.Prefix: self._prefix,
+      ast.Infix: self._infix,
+      ast.Block: self._block,
+      ast.If: self._if,
+      ast.ReturnStatement: self._return_statement,
+      ast.LetStatement: self._let_statement,
+      ast.Identifier: self._identifier,
+      ast.Function: self._function,
+      ast.Call: self._call,
+      ast.ParseFailure: self._parse_failure,
+    })
+
+  @property
+  def specialized(self) -> int:
+    return self._specialized
+
+  @property
+  def deoptimized(self) -> int:
+    return self._deoptimized
+
+  def evaluate(self, node: ast.ASTNode, env: Env) -> Optional[Object]:
+    return self._handlers[type(node)](node, env)
+
+  def _program(self, node: ast.Program, env: Env) -> Optional[Object]:
+    if not node.resolved:
+      resolve(node)
+
+    result: Optional[Object] = None
+    for statement in node.statements:
+      result = self._handlers[type(statement)](statement, env)
+
+      if type(result) == Return:
+        return cast(Return, result).value
+      elif type(result) == Error:
+        return result
+
+    return result
+
+  def _expression_statement(self, node: ast.ExpressionStatement, env: Env) -> Optional[Object]:
+    return self._handlers[type(node.expression)](node.expression, env)
+
+  def _integer(self, node: ast.Integer, env: Env) -> Object:
+    assert node.value is not None
+    return new_integer(node.value)
+
+  def _boolean(self, node: ast.Boolean, env: Env) -> Object:
+    return TRUE if node.value else FALSE
+
+  def _string(self, node: ast.StringLiteral, env: Env) -> Object:
+    return new_string(node.value)
+
+  def _parse_failure(self, node: ast.ParseFailure, env: Env) -> Object:
+    return Error(node.message, node.position)
+
+  def _prefix(self, node: ast.Prefix, env: Env) -> Object:
+    right: Any = self._handlers[type(node.right)](node.right, env)
+
+    if node.operands:
+      return new_integer(-right.value)
+    elif node.operator == '!':
+      return _evaluate_bang_operator_expression(right)
+
+    result = _evaluate_prefix_expression(node.operator, right)
+    if type(result) == Error:
+      _locate_error(result, node)
+    return result
+
+  def _infix(self, node: ast.Infix, env: Env) -> Object:
+    left: Any = self._handlers[type(node.left)](node.left, env)
+    right: Any = self._handlers[type(node.right)](node.right, env)
+    quick = node.quick
+
+    if type(quick) is _IntegerInfix:
+      if type(left) is Integer and type(right) is Integer:
+        return quick.operation(left.value, right.value)
+      self._deoptimize(node)
+    elif type(quick) is _StringInfix:
+      if type(left) is String and type(right) is String:
+        return quick.operation(left.value, right.value)
+      self._deoptimize(node)
+    elif node.operands:
+      # lp.type_inference proved both types, so there's nothing to guard.
+      return _TYPED_OPERATIONS[node.operands][node.operator](left.value, right.value)
+    elif type(quick) is int:
+      if quick + 1 < self._warmup:
+        node.quick = quick + 1
+      else:
+        self._specialize_infix(node, left, right)
+
+    result = _evaluate_infix_expression(node.operator, left, right)
+    if type(result) == Error:
+      _locate_error(result, node)
+    return result
+
+  def _block(self, node: ast.Block, env: Env) -> Optional[Object]:
+    result: Optional[Object] = None
+
+    for statement in node.statements:
+      result = self._handlers[type(statement)](statement, env)
+
+      if result is not None and (result.object_type is _RETURN or result.object_type is _ERROR):
+        return result
+
+    return result
+
+  def _if(self, node: ast.If, env: Env) -> Optional[Object]:
+    condition: Any = self._handlers[type(node.condition)](node.condition, env)
+
+    if _is_truthy(condition):
+      assert node.consequence is not None
+      return self._block(node.consequence, env)
+    elif node.alternative is not None:
+      return self._block(node.alternative, env)
+
+    return NULL
+
+  def _return_statement(self, node: ast.ReturnStatement, env: Env) -> Object:
+    value = self._handlers[type(node.return_value)](node.return_value, env)
+
+    assert value is not None
+    return Return(value)
+
+  def _let_statement(self, node: ast.LetStatement, env: Env) -> None:
+    value = self._handlers[type(node.value)](node.value, env)
+
+    assert node.name is not None
+    if node.name.depth == 0:
+      cast(Frame, env).values[node.name.slot] = value
+    else:
+      cast(Environment, env)[node.name.value] = value
+
+  def _identifier(self, node: ast.Identifier, env: Env) -> Object:
+    result = _evaluate_identifier(node, env)
+
+    if type(result) == Error:
+      _locate_error(result, node)
+    return result
+
+  def _function(self, node: ast.Function, env: Env) -> Object:
+    assert node.body is not None
+    return Function(node.parameters, node.body, env)
+
+  def _call(self, node: ast.Call, env: Env) -> Object:
+    fn: Any = self._handlers[type(node.function)](node.function, env)
+    assert node.arguments is not None
+    args: List[Any] = [self._handlers[type(argument)](argument, env) for argument in node.arguments]
+    quick = node.quick
+    result: Object
+
+    if type(quick) is _MonomorphicCall:
+      if type(fn) is Function and fn.body.scope is quick.scope:
+        values: List[Optional[Object]] = [None] * len(quick.scope.names)
+        for slot, arg in zip(quick.slots, args):
+          values[slot] = arg
+
+        evaluated: Any = self._block(fn.body, Frame(quick.scope.names, values, fn.env))
+        assert evaluated is not None
+
+        if type(evaluated) is Return:
+          return evaluated.value
+        elif type(evaluated) is Error:
+          _locate_error(evaluated, node)
+        return evaluated
+
+      self._deoptimize(node)
+    elif type(quick) is int:
+      if quick + 1 < self._warmup:
+        node.quick = quick + 1
+      elif type(fn) is Function:
+        # Parses a lazy body first, which is when it gets its scope.
+        fn.body.statements
+        self._specialize(node, _MonomorphicCall(fn.body.scope, [parameter.slot for parameter in fn.parameters]))
+      else:
+        node.quick = 0
+
+    result = self._apply_function(fn, args)
+    if type(result) == Error:
+      _locate_error(result, node)
+    return result
+
+  # The generic path, like lp.evaluator's, running the body here.
+  def _apply_function(self, fn: Object, args: List[Object]) -> Object:
+    if type(fn) == Function:
+      fn = cast(Function, fn)
+
+      evaluated = self._block(fn.body, _extend_function_environment(fn, args))
+      assert evaluated is not None
+      return _unwrap_return_value(evaluated)
+    elif type(fn) == Builtin:
+      return cast(Builtin, fn).fn(*args)
+
+    return _new_error(_NOT_A_FUNCTION, [fn.object_type.name])
+
+  def _specialize_infix(self, node: ast.Infix, left: Object, right: Object) -> None:
+    if type(left) is Integer and type(right) is Integer and node.operator in _INTEGER_OPERATIONS:
+      self._specialize(node, _IntegerInfix(_INTEGER_OPERATIONS[node.operator]))
+    elif type(left) is String and type(right) is String and node.operator in _STRING_OPERATIONS:
+      self._specialize(node, _StringInfix(_STRING_OPERATIONS[node.operator]))
+    else:
+      # Nothing to specialize for yet; warms up again.
+      node.quick = 0
+
+  def _specialize(self, node: Any, variant: Any) -> None:
+    node.quick = variant
+    self._specialized += 1
+
+  def _deoptimize(self, node: Any) -> None:
+    self._deoptimized += 1
+
+    # Keeps the node too, so its id can't be reused.
+    failures = self._failures.setdefault(id(node), [node, 0])
+    failures[1] += 1
+    node.quick = _GENERIC if failures[1] >= self._max_deoptimizations else 0
+
+# Runs the program the way evaluate(program, env) does.
+def execute(program: ast.Program, env: Env) -> Optional[Object]:
+  return Quickener().evaluate(program, env)
@@ -1,13 +1,17 @@
 import readline
-from typing import List
+from typing import List, Optional
 from os import system, name
 
 from lp.ast import Program
+from lp.cache import ProgramCache
+from lp.engines import Engine
 from lp.evaluator import evaluate
 from lp.lexer import Lexer
+from lp.optimizer import Optimizer
 from lp.parser import Parser
+from lp.source import LineIndex
 from lp.token import Token, TokenType
-from lp.object import Environment
+from lp.object import Environment, Error, Object
 
 EOF_TOKEN: Token = Token(TokenType.EOF, '')
 
@@ -17,9 +21,43 @@ def _clear_screen() -> None:
   else:
     _ = system('clear')
 
-def _print_parse_errors(errors: List[str]) -> None:
-  for error in errors:
-    print(error)
+def _print_parse_errors(errors: List[str], positions: List[int], source: str) -> None:
+  lines: LineIndex = LineIndex(source)
+  
+  for error, position in zip(errors, positions):
+    print(f'{error} ({lines.describe(position)})')
+
+def _print_result(evaluated: Optional[Object], source: str) -> None:
+  if isinstance(evaluated, Error) and evaluated.position >= 0:
+    print(f'{evaluated.inspect()} ({LineIndex(source).describe(evaluated.position)})')
+  elif evaluated is not None:
+    print(evaluated.inspect())
+
+def run_script(
+  source: str,
+  cache: Optional[ProgramCache] = None,
+  optimizer: Optional[Optimizer] = None,
+  engine: Engine = evaluate
+) -> None:
+  errors: List[str]
+  positions: List[int]
+  
+  if cache is not None:
+    program: Program = cache.parse_program(source)
+    errors, positions = cache.errors, cache.error_positions
+  else:
+    parser: Parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    errors, positions = parser.errors, parser.error_positions
+    
+  if len(errors) > 0:
+    _print_parse_errors(errors, positions, source)
+    return
+  
+  if optimizer is not None:
+    program = optimizer.optimize(program)
+  
+  _print_result(engine(program, Environment()), source)
 
 def start_repl() -> None:
   scanned: List[str] = []
@@ -29,17 +67,15 @@ def start_repl() -> None:
       _clear_screen()
     else:
       scanned.append(source)
-      lexer: Lexer = Lexer(' '.join(scanned))
+      program_source: str = ' '.join(scanned)
+      lexer: Lexer = Lexer(program_source)
       parser: Parser = Parser(lexer)
       
       program: Program = parser.parse_program()
       env: Environment = Environment()
       
       if len(parser.errors) > 0:
-        _print_parse_errors(parser.errors)
+        _print_parse_errors(parser.errors, parser.error_positions, program_source)
         continue
 
-      evaluated = evaluate(program, env)
-      
-      if evaluated is not None:
-        print(evaluated.inspect())
+      _print_result(evaluate(program, env), program_source)
@@ -0,0 +1,186 @@
+from copy import copy
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import lp.ast as ast
+
+_Node = TypeVar('_Node')
+
+# The variables of one procedimiento, in the order of their slots in its call
+# frames: parameters first, then every name a variable statement in its body
+# binds. Blocks don't open scopes, so si branches count as the body too.
+class Scope:
+  __slots__ = ('names', 'outer')
+
+  def __init__(self, outer: Optional['Scope']) -> None:
+    self.names: Dict[str, int] = {}
+    self.outer = outer
+
+  def declare(self, name: str) -> int:
+    return self.names.setdefault(name, len(self.names))
+
+  def resolve(self, name: str) -> Tuple[int, int]:
+    scope: Optional[Scope] = self
+    depth: int = 0
+
+    while scope is not None:
+      slot = scope.names.get(name)
+      if slot is not None:
+        return depth, slot
+
+      scope = scope.outer
+      depth += 1
+
+    return -1, -1
+
+# Annotates every Identifier with the frame depth and slot of the variable
+# it names, or leaves it at -1 when it can only be a global or a builtin.
+# Globals stay looked up by name: the REPL keeps its Environment across
+# programs, so a later line may define or shadow anything.
+#
+# Walks an explicit stack, so it reaches as deep as the evaluator does.
+# Bodies left lazy by LazyParser or FlatAST stay lazy and are resolved when
+# they are parsed. A node shared by HashConser is resolved once per scope it
+# appears in, copied when it needs other slots than the first time.
+class Resolver:
+
+  def __init__(self) -> None:
+    # Keyed by node and scope; the entries keep both alive, so ids are not
+    # reused while the resolver is.
+    self._resolved: Dict[Tuple[int, int], Tuple[Any, Optional[Scope], Any]] = {}
+    self._seen: Dict[int, Any] = {}
+
+  def program(self, program: ast.Program) -> ast.Program:
+    self._resolve(program.statements, None)
+    program.resolved = True
+
+    return program
+
+  # Resolves a procedimiento whose Program never was, as when evaluate() is
+  # handed a lone expression; the names it doesn't bind stay globals.
+  def function(self, parameters: List[ast.Identifier], body: ast.Block) -> Scope:
+    node: ast.Function = ast.Function(body.token, parameters, body)
+    self._resolve([node], None)
+
+    assert body.scope is not None
+    return body.scope
+
+  def _enter(self, node: _Node, scope: Optional[Scope]) -> Tuple[_Node, bool]:
+    key: Tuple[int, int] = (id(node), id(scope))
+    resolved = self._resolved.get(key)
+    if resolved is not None:
+      return resolved[2], False
+
+    original = node
+    if id(node) in self._seen:
+      node = copy(node)
+    else:
+      self._seen[id(node)] = node
+
+    self._resolved[key] = (original, scope, node)
+    return node, True
+
+  # Resolves the nodes in the list in place; every stack entry is a slot
+  # holding a node, as a list and index or a node and field name.
+  def _resolve(self, statements: List[Any], scope: Optional[Scope]) -> None:
+    stack: List[Tuple[Any, Any, Optional[Scope]]] = [(statements, index, scope) for index in range(len(statements))]
+
+    while stack:
+      container, key, scope = stack.pop()
+      in_list: bool = type(container) == list
+      node = container[key] if in_list else getattr(container, key)
+      if node is None:
+        continue
+
+      node, fresh = self._enter(node, scope)
+      if in_list:
+        container[key] = node
+      else:
+        setattr(container, key, node)
+
+      if not fresh:
+        continue
+
+      node_type = type(node)
+      if node_type == ast.Identifier:
+        if scope is None:
+          node.depth, node.slot = -1, -1
+        else:
+          node.depth, node.slot = scope.resolve(node.value)
+        continue
+      elif node_type == ast.Function:
+        function_scope: Scope = self._enter_function(node, scope)
+        node.parameters = list(node.parameters)
+        stack.extend((node.parameters, index, function_scope) for index in range(len(node.parameters)))
+        continue
+
+      _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+      for field in child_fields:
+        stack.append((node, field, scope))
+
+      for field in list_fields:
+        children = getattr(node, field)
+
+        if children is not None:
+          children = list(children)
+          setattr(node, field, children)
+          stack.extend((children, index, scope) for index in range(len(children)))
+
+  # Lays out the function's frame and returns its scope. A lazy body is
+  # wrapped to be resolved once parsed, any other one is resolved right away.
+  def _enter_function(self, node: ast.Function, outer: Optional[Scope]) -> Scope:
+    scope: Scope = Scope(outer)
+
+    for parameter in node.parameters:
+      scope.declare(parameter.value)
+
+    if node.body is None:
+      return scope
+
+    body: ast.Block = node.body
+
+    if '_parse_statements' in vars(body):
+      parse_statements: Callable[[], List[ast.Statement]] = body._parse_statements
+      body._parse_statements = partial(self._resolve_body, parse_statements, scope)
+      body.scope = scope
+      return scope
+
+    body, fresh = self._enter(body, scope)
+    node.body = body
+    if fresh:
+      body.statements = list(body.statements)
+      body.scope = scope
+      _declare_locals(body.statements, scope)
+      self._resolve(body.statements, scope)
+
+    return scope
+
+  def _resolve_body(self, parse_statements: Callable[[], List[ast.Statement]], scope: Scope) -> List[ast.Statement]:
+    statements: List[ast.Statement] = parse_statements()
+    _declare_locals(statements, scope)
+    self._resolve(statements, scope)
+
+    return statements
+
+def resolve(program: ast.Program) -> ast.Program:
+  return Resolver().program(program)
+
+# Declares the names bound by variable statements anywhere in a body, before
+# anything in it is resolved: a closure may use a local defined after it.
+def _declare_locals(statements: List[ast.Statement], scope: Scope) -> None:
+  stack: List[Any] = list(statements)
+
+  while stack:
+    node = stack.pop()
+    node_type = type(node)
+
+    if node is None or node_type == ast.Function:
+      continue
+    elif node_type == ast.LetStatement and node.name is not None:
+      scope.declare(node.name.value)
+
+    _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+    for field in child_fields:
+      stack.append(getattr(node, field))
+    for field in list_fields:
+      stack.extend(getattr(node, field) or ())
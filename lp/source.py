@@ -0,0 +1,50 @@
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from mmap import mmap, ACCESS_READ
+from os import fstat
+from re import compile
+from typing import Iterator, Pattern, Tuple, Union
+
+from lp.lexer import Buffer
+
+_TEXT_NEWLINE: Pattern[str] = compile('\n')
+_BUFFER_NEWLINE: Pattern[bytes] = compile(b'\n')
+
+@contextmanager
+def map_source(path: str) -> Iterator[Buffer]:
+  with open(path, 'rb') as file:
+    if fstat(file.fileno()).st_size == 0:
+      yield b''
+      return
+    
+    mapped: mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+    try:
+      yield mapped
+    finally:
+      try:
+        mapped.close()
+      except BufferError:
+        # A lexer still scanning the mapping keeps it exported; it is
+        # unmapped once that lexer is collected.
+        pass
+
+class LineIndex:
+  
+  def __init__(self, source: Union[str, Buffer]) -> None:
+    self._starts: array = array('q', [0])
+    
+    if isinstance(source, str):
+      self._starts.extend(match.end() for match in _TEXT_NEWLINE.finditer(source))
+    else:
+      self._starts.extend(match.end() for match in _BUFFER_NEWLINE.finditer(source))
+    
+  def describe(self, position: int) -> str:
+    line, column = self.location(position)
+    
+    return f'línea {line}, columna {column}'
+    
+  def location(self, position: int) -> Tuple[int, int]:
+    line: int = bisect_right(self._starts, position)
+    
+    return line, position - self._starts[line - 1] + 1
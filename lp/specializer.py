@@ -0,0 +1,193 @@
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import lp.ast as ast
+from lp.constant_folding import ConstantFolder
+from lp.inliner import bindings, substitute
+from lp.token import Token, TokenType
+from lp.transformer import Transformer
+
+# Nodes in a procedimiento's body, the largest one copied by default.
+MAX_SIZE: int = 256
+
+# Specializations made for one program, by default; every one is a copy of
+# a body, so this caps how much the program can grow.
+MAX_SPECIALIZATIONS: int = 64
+
+_CONSTANTS = (ast.Integer, ast.Boolean, ast.StringLiteral)
+
+# Calls a copy of a procedimiento specialized for the literal arguments of a
+# call: f(x, 3) becomes f$0(x), where f$0 is f's body with 3 for its second
+# parameter, folded by ConstantFolder. The copy is only made when folding
+# changed something, and is bound by a new top-level variable statement
+# right after f's, so it is there whenever f is.
+#
+# Copies are cached by procedimiento and constant arguments, so calls with
+# the same constants share one, up to max_entries copies. Calls inside a copy
+# are specialized too, so a recursion on a constant, like potencia(x, n - 1)
+# from potencia(x, 3), unrolls until the cache is full.
+#
+# Only procedimientos the inliner could rely on are copied: bound once, by a
+# top-level variable statement, to a name no procedimiento binds, with
+# parameters their body never rebinds. Calls before that statement, or
+# inside the procedimiento itself, are left alone.
+class Specializer(Transformer):
+
+  def __init__(
+    self,
+    program: ast.Program,
+    max_size: int = MAX_SIZE,
+    max_entries: int = MAX_SPECIALIZATIONS
+  ) -> None:
+    super().__init__()
+    self._max_size = max_size
+    self._max_entries = max_entries
+    self._bindings, self._local_names = bindings(program)
+    self._top_level: Set[int] = {id(statement) for statement in program.statements}
+    self._folder: ConstantFolder = ConstantFolder(program)
+    self._functions: Dict[str, Tuple[ast.LetStatement, ast.Function]] = {}
+    self._cache: Dict[Tuple[int, Tuple[Any, ...]], Optional[str]] = {}
+    self._copies: Dict[int, List[ast.LetStatement]] = {}
+    self._specialized: int = 0
+
+  @property
+  def specialized(self) -> int:
+    return self._specialized
+
+  @property
+  def copies(self) -> int:
+    return sum(len(copies) for copies in self._copies.values())
+
+  # Statements are visited in order, so a procedimiento is added once its
+  # own statement is done, in time for the statements after it.
+  def visit_LetStatement(self, node: ast.LetStatement) -> ast.LetStatement:
+    if id(node) in self._top_level:
+      self._add_function(node)
+
+    return node
+
+  def visit_Program(self, node: ast.Program) -> ast.Program:
+    statements: List[ast.Statement] = node.statements
+
+    node.statements = []
+    for statement in statements:
+      node.statements.append(statement)
+      node.statements.extend(self._copies.get(id(statement), ()))
+
+    if self._copies:
+      node.resolved = False
+
+    return node
+
+  def visit_Call(self, node: ast.Call) -> ast.Expression:
+    function = node.function
+
+    if type(function) != ast.Identifier or node.arguments is None:
+      return node
+
+    entry = self._functions.get(function.value)
+    if entry is None or len(entry[1].parameters) != len(node.arguments):
+      return node
+
+    constants: Tuple[Any, ...] = tuple(_constant(argument) for argument in node.arguments)
+    if all(constant is None for constant in constants):
+      return node
+
+    key = (id(entry[0]), constants)
+    if key in self._cache:
+      name = self._cache[key]
+    elif len(self._cache) < self._max_entries:
+      name = self._specialize(key, entry[0], entry[1], node.arguments)
+    else:
+      return node
+
+    if name is None:
+      return node
+
+    self._specialized += 1
+    arguments: List[ast.Expression] = [
+      argument for argument, constant in zip(node.arguments, constants) if constant is None
+    ]
+    callee = ast.Identifier(Token(TokenType.IDENT, name, function.token.position), name)
+
+    return ast.Call(node.token, callee, arguments)
+
+  def _add_function(self, statement: ast.LetStatement) -> None:
+    function = statement.value
+    if statement.name is None or type(function) != ast.Function or function.body is None:
+      return
+
+    name: str = statement.name.value
+    parameters: List[str] = [parameter.value for parameter in function.parameters]
+    if self._bindings[name] != 1 or name in self._local_names or len(set(parameters)) != len(parameters):
+      return
+
+    # Parameters bound again inside would not mean the argument there.
+    size: int = 0
+    stack: List[Any] = list(function.body.statements)
+    while stack:
+      node = stack.pop()
+      node_type = type(node)
+
+      if node is None:
+        continue
+      elif node_type == ast.LetStatement and node.name is not None and node.name.value in parameters or \
+        node_type == ast.Function and any(parameter.value in parameters for parameter in node.parameters):
+        return
+
+      size += 1
+      _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+      stack.extend(getattr(node, field) for field in child_fields)
+      for field in list_fields:
+        stack.extend(getattr(node, field) or ())
+
+    if size <= self._max_size:
+      self._functions[name] = (statement, function)
+
+  def _specialize(
+    self,
+    key: Tuple[int, Tuple[Any, ...]],
+    statement: ast.LetStatement,
+    function: ast.Function,
+    arguments: List[ast.Expression]
+  ) -> Optional[str]:
+    constants: Dict[str, ast.Expression] = {
+      parameter.value: argument
+      for parameter, argument in zip(function.parameters, arguments)
+      if _constant(argument) is not None
+    }
+
+    folded: int = self._folder.folded
+    body: ast.Block = self._folder.visit(substitute(function.body, constants))
+    if self._folder.folded == folded:
+      self._cache[key] = None
+      return None
+
+    assert statement.name is not None
+    name: str = f'{statement.name.value}${self.copies}'
+    self._cache[key] = name
+
+    parameters: List[ast.Identifier] = [
+      parameter for parameter in function.parameters if parameter.value not in constants
+    ]
+    copy: ast.Function = ast.Function(function.token, parameters, body)
+    identifier = ast.Identifier(Token(TokenType.IDENT, name, statement.name.token.position), name)
+    self._copies.setdefault(id(statement), []).append(ast.LetStatement(statement.token, identifier, copy))
+
+    # Registered first, so a call back to this same specialization reuses it.
+    copy.body = self.visit(body)
+
+    return name
+
+def specialize(
+  program: ast.Program,
+  max_size: int = MAX_SIZE,
+  max_entries: int = MAX_SPECIALIZATIONS
+) -> ast.Program:
+  return Specializer(program, max_size, max_entries).visit(program)
+
+# The argument as part of a cache key, or None when it isn't a literal.
+def _constant(node: ast.Expression) -> Optional[Tuple[Any, ...]]:
+  if isinstance(node, _CONSTANTS) and node.value is not None:
+    return (type(node), node.value)
+
+  return None
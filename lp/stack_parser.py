@@ -0,0 +1,293 @@
+from typing import Any, Callable, Dict, Generator, List, Optional
+
+from lp.ast import (
+  Block,
+  Call,
+  Expression,
+  ExpressionStatement,
+  Function,
+  If,
+  Infix,
+  LetStatement,
+  Prefix,
+  ReturnStatement,
+  Statement,
+)
+from lp.lexer import TokenSource
+from lp.parser import Parser, Precedence
+from lp.token import TokenType
+
+# A parse step that needs a nested construct yields the frame parsing it and
+# is resumed with that frame's result.
+Frame = Generator['Frame', Any, Any]
+
+# Every method of Parser that recurses has a generator counterpart here that
+# mirrors it step by step, so both build the same AST and report the same
+# errors, but nesting lives on an explicit stack bounded only by memory.
+class StackParser(Parser):
+
+  def __init__(self, lexer: TokenSource, hash_cons: bool = False) -> None:
+    super().__init__(lexer, hash_cons)
+
+    # Tried before Parser's tables, which keep the functions that don't nest.
+    self._prefix_frames: Dict[TokenType, Callable[[], Frame]] = {
+      TokenType.MINUS: self._prefix_expression_frame,
+      TokenType.NEGATION: self._prefix_expression_frame,
+      TokenType.LPAREN: self._grouped_expression_frame,
+      TokenType.IF: self._if_frame,
+      TokenType.FUNCTION: self._function_frame,
+    }
+    self._infix_frames: Dict[TokenType, Callable[[Expression], Frame]] = {
+      token_type: self._infix_expression_frame for token_type in self._infix_parse_fns
+    }
+    self._infix_frames[TokenType.LPAREN] = self._call_frame
+
+  def _parse_statement(self) -> Optional[Statement]:
+    return self._run(self._statement_frame())
+
+  def _run(self, frame: Frame) -> Any:
+    stack: List[Frame] = [frame]
+    result: Any = None
+
+    while stack:
+      try:
+        child = stack[-1].send(result)
+      except StopIteration as stop:
+        stack.pop()
+        result = stop.value
+      else:
+        stack.append(child)
+        result = None
+
+    return result
+
+  def _statement_frame(self) -> Frame:
+    assert self._current_token is not None
+    if self._current_token.token_type == TokenType.LET:
+      return (yield self._let_statement_frame())
+    elif self._current_token.token_type == TokenType.RETURN:
+      return (yield self._return_statement_frame())
+    else:
+      return (yield self._expression_statement_frame())
+
+  def _expression_frame(self, precedence: Precedence) -> Frame:
+    assert self._current_token is not None
+    prefix_frame = self._prefix_frames.get(self._current_token.token_type)
+    left_expression: Optional[Expression]
+
+    if prefix_frame is not None:
+      left_expression = yield prefix_frame()
+    else:
+      try:
+        prefix_parse_fn = self._prefix_parse_fns[self._current_token.token_type]
+      except KeyError:
+        message = f'No se encontro ninguna funcion para parsear {self._current_token.literal}.'
+
+        self._add_error(message, self._current_token.position)
+        return None
+
+      left_expression = prefix_parse_fn()
+
+    assert self._peek_token is not None
+    while left_expression is not None and \
+      not self._peek_token.token_type == TokenType.SEMICOLON and \
+      precedence < self._peek_precedence():
+      try:
+        infix_frame = self._infix_frames[self._peek_token.token_type]
+      except KeyError:
+        return left_expression
+
+      self._advance_tokens()
+
+      left_expression = yield infix_frame(left_expression)
+
+    return left_expression
+
+  def _expression_statement_frame(self) -> Frame:
+    assert self._current_token is not None
+    expression_statement = ExpressionStatement(self._current_token)
+
+    expression_statement.expression = yield self._expression_frame(Precedence.LOWEST)
+
+    assert self._peek_token is not None
+    if self._peek_token.token_type == TokenType.SEMICOLON:
+      self._advance_tokens()
+
+    return expression_statement
+
+  def _infix_expression_frame(self, left: Expression) -> Frame:
+    assert self._current_token is not None
+    infix = Infix(
+      token=self._current_token,
+      left=left,
+      operator=self._current_token.literal,
+    )
+
+    precedence = self._current_precedence()
+
+    self._advance_tokens()
+
+    infix.right = yield self._expression_frame(precedence)
+
+    return infix
+
+  def _call_frame(self, function: Expression) -> Frame:
+    assert self._current_token is not None
+
+    call = Call(
+      token=self._current_token,
+      function=function
+    )
+    call.arguments = yield self._call_arguments_frame()
+
+    return call
+
+  def _call_arguments_frame(self) -> Frame:
+    arguments: List[Expression] = []
+
+    assert self._peek_token is not None
+    if self._peek_token.token_type == TokenType.RPAREN:
+      self._advance_tokens()
+
+      return arguments
+
+    self._advance_tokens()
+
+    if expression := (yield self._expression_frame(Precedence.LOWEST)):
+      arguments.append(expression)
+
+    while self._peek_token.token_type == TokenType.COMMA:
+      self._advance_tokens()
+      self._advance_tokens()
+
+      if expression := (yield self._expression_frame(Precedence.LOWEST)):
+        arguments.append(expression)
+
+    if not self._expected_token(TokenType.RPAREN):
+      return None
+
+    return arguments
+
+  def _block_frame(self) -> Frame:
+    assert self._current_token is not None
+    block_statement = Block(
+      token=self._current_token,
+      statements=[]
+    )
+
+    self._advance_tokens()
+
+    while not self._current_token.token_type == TokenType.RBRACE \
+      and not self._current_token.token_type == TokenType.EOF:
+        statement = yield self._statement_frame()
+
+        if statement:
+          block_statement.statements.append(statement)
+
+        self._advance_tokens()
+
+    return block_statement
+
+  def _grouped_expression_frame(self) -> Frame:
+    self._advance_tokens()
+
+    expression = yield self._expression_frame(Precedence.LOWEST)
+
+    if not self._expected_token(TokenType.RPAREN):
+      return None
+
+    return expression
+
+  def _let_statement_frame(self) -> Frame:
+    assert self._current_token is not None
+    let_statment: LetStatement = LetStatement(token=self._current_token)
+
+    if not self._expected_token(TokenType.IDENT):
+      return None
+
+    let_statment.name = self._parse_identifier()
+
+    if not self._expected_token(TokenType.ASSING):
+      return None
+
+    self._advance_tokens()
+
+    let_statment.value = yield self._expression_frame(Precedence.LOWEST)
+
+    assert self._peek_token is not None
+    if self._peek_token.token_type == TokenType.SEMICOLON:
+      self._advance_tokens()
+
+    return let_statment
+
+  def _prefix_expression_frame(self) -> Frame:
+    assert self._current_token is not None
+    prefix_expression = Prefix(
+      token=self._current_token,
+      operator=self._current_token.literal
+    )
+
+    self._advance_tokens()
+
+    prefix_expression.right = yield self._expression_frame(Precedence.PREFIX)
+
+    return prefix_expression
+
+  def _return_statement_frame(self) -> Frame:
+    assert self._current_token is not None
+    return_statement = ReturnStatement(token=self._current_token)
+
+    self._advance_tokens()
+
+    return_statement.return_value = yield self._expression_frame(Precedence.LOWEST)
+
+    assert self._peek_token is not None
+    if self._peek_token.token_type == TokenType.SEMICOLON:
+      self._advance_tokens()
+
+    return return_statement
+
+  def _if_frame(self) -> Frame:
+    assert self._current_token is not None
+    if_expression = If(token=self._current_token)
+
+    if not self._expected_token(TokenType.LPAREN):
+      return None
+
+    self._advance_tokens()
+
+    if_expression.condition = yield self._expression_frame(Precedence.LOWEST)
+
+    if not self._expected_token(TokenType.RPAREN):
+      return None
+
+    if not self._expected_token(TokenType.LBRACE):
+      return None
+
+    if_expression.consequence = yield self._block_frame()
+
+    assert self._peek_token is not None
+    if self._peek_token.token_type == TokenType.ELSE:
+      self._advance_tokens()
+      if self._expected_token(TokenType.LBRACE):
+        if_expression.alternative = yield self._block_frame()
+      else:
+        return None
+
+    return if_expression
+
+  def _function_frame(self) -> Frame:
+    assert self._current_token is not None
+    function = Function(self._current_token)
+
+    if not self._expected_token(TokenType.LPAREN):
+      return None
+
+    function.parameters = self._parse_function_parameters()
+
+    if not self._expected_token(TokenType.LBRACE):
+      return None
+
+    function.body = yield self._block_frame()
+
+    return function
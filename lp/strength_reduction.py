@@ -0,0 +1,99 @@
+from typing import Callable, List, Optional
+
+import lp.ast as ast
+from lp.token import Token, TokenType
+from lp.transformer import Transformer
+
+# Tells whether an expression always evaluates to an Integer, without errors
+# and without calling anything.
+IntegerCheck = Callable[[ast.Expression], bool]
+
+# Rewrites arithmetic on an operand known to be an integer into something
+# cheaper: x * 1, x / 1, x + 0 and x - 0 become x, and x * 0 and x % 1
+# become 0 when x can't raise or call anything, since it is no longer
+# evaluated. On anything else those operations end in an Error, or in a
+# concatenation for strings, so without that knowledge nothing is changed.
+# x * 2 stays as it is: x + x would cost one more evaluation here.
+#
+# The default check only knows integer literals and +, -, * over integers;
+# is_integer lets a pass that knows more about the program widen it.
+class StrengthReducer(Transformer):
+
+  def __init__(self, is_integer: Optional[IntegerCheck] = None) -> None:
+    super().__init__()
+    self._is_integer: IntegerCheck = is_integer or self._integer_expression
+    self._reduced: int = 0
+
+  @property
+  def reduced(self) -> int:
+    return self._reduced
+
+  def visit_Infix(self, node: ast.Infix) -> ast.Expression:
+    left, operator, right = node.left, node.operator, node.right
+
+    if right is None:
+      return node
+    elif _is_literal(right, 1) and operator in ('*', '/') or \
+      _is_literal(right, 0) and operator in ('+', '-'):
+      reduced = left if self._is_integer(left) else None
+    elif _is_literal(left, 1) and operator == '*' or _is_literal(left, 0) and operator == '+':
+      reduced = right if self._is_integer(right) else None
+    elif _is_literal(right, 0) and operator == '*' or _is_literal(right, 1) and operator == '%':
+      reduced = _zero(node) if self._is_integer(left) and _is_pure(left) else None
+    elif _is_literal(left, 0) and operator == '*':
+      reduced = _zero(node) if self._is_integer(right) and _is_pure(right) else None
+    else:
+      reduced = None
+
+    if reduced is None:
+      return node
+
+    self._reduced += 1
+    return reduced
+
+  def _integer_expression(self, node: ast.Expression) -> bool:
+    stack: List[Optional[ast.Expression]] = [node]
+
+    while stack:
+      current = stack.pop()
+
+      if type(current) == ast.Integer:
+        if current.value is None:
+          return False
+      elif type(current) == ast.Prefix and current.operator == '-':
+        stack.append(current.right)
+      elif type(current) == ast.Infix and current.operator in ('+', '-', '*'):
+        stack.extend((current.left, current.right))
+      else:
+        return False
+
+    return True
+
+def reduce_strength(program: ast.Program, is_integer: Optional[IntegerCheck] = None) -> ast.Program:
+  return StrengthReducer(is_integer).visit(program)
+
+def _is_literal(node: Optional[ast.Expression], value: int) -> bool:
+  return type(node) == ast.Integer and node.value == value
+
+# Whether dropping the expression can't change what the program does: it has
+# no division or modulo, which may raise, and no call or si, which may do
+# anything.
+def _is_pure(node: ast.Expression) -> bool:
+  stack: List[Optional[ast.Expression]] = [node]
+
+  while stack:
+    current = stack.pop()
+
+    if type(current) == ast.Infix:
+      if current.operator in ('/', '%'):
+        return False
+      stack.extend((current.left, current.right))
+    elif type(current) == ast.Prefix:
+      stack.append(current.right)
+    elif type(current) not in (ast.Integer, ast.Boolean, ast.StringLiteral, ast.Identifier):
+      return False
+
+  return True
+
+def _zero(node: ast.Infix) -> ast.Integer:
+  return ast.Integer(Token(TokenType.INT, '0', node.token.position), 0)
@@ -3,7 +3,8 @@ from enum import (
   Enum,
   unique,
 )
-from typing import Dict, NamedTuple
+from sys import intern
+from typing import Dict, NamedTuple, Tuple
 
 @unique
 class TokenType(Enum):
@@ -42,19 +43,57 @@ class TokenType(Enum):
 class Token(NamedTuple):
   token_type: TokenType
   literal: str
+  position: int = -1
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, tuple):
+      return NotImplemented
+    
+    return self[:2] == other[:2]
+  
+  def __ne__(self, other: object) -> bool:
+    if not isinstance(other, tuple):
+      return NotImplemented
+    
+    return self[:2] != other[:2]
+  
+  def __hash__(self) -> int:
+    return hash(self[:2])
 
   def __str__(self) -> str:
     return f'Type: {self.token_type}, Literal: {self.literal}'
 
+KEYWORDS: Dict[str, TokenType] = {
+  'falso': TokenType.FALSE,
+  'procedimiento': TokenType.FUNCTION,
+  'regresa': TokenType.RETURN,
+  'si': TokenType.IF,
+  'si_no': TokenType.ELSE,
+  'variable': TokenType.LET,
+  'verdadero': TokenType.TRUE,
+}
+
+# Maps every name seen while compiling a source to its token type and its
+# canonical string, so each identifier is shared by all of its tokens, AST
+# nodes and environment keys, and compares by identity.
+Symbol = Tuple[TokenType, str]
+SymbolTable = Dict[str, Symbol]
+
+_KEYWORD_SYMBOLS: SymbolTable = {
+  literal: (token_type, intern(literal)) for literal, token_type in KEYWORDS.items()
+}
+
 def lookup_token_type(literal: str) -> TokenType:
-  keywords: Dict[str, TokenType] = {
-    'falso': TokenType.FALSE,
-    'procedimiento': TokenType.FUNCTION,
-    'regresa': TokenType.RETURN,
-    'si': TokenType.IF,
-    'si_no': TokenType.ELSE,
-    'variable': TokenType.LET,
-    'verdadero': TokenType.TRUE,
-  }
-  
-  return keywords.get(literal, TokenType.IDENT)
\ No newline at end of file
+  return KEYWORDS.get(literal, TokenType.IDENT)
+
+def lookup_symbol(symbols: SymbolTable, name: str) -> Symbol:
+  symbol = symbols.get(name)
+
+  if symbol is None:
+    name = intern(name)
+    symbol = symbols[name] = (TokenType.IDENT, name)
+
+  return symbol
+
+def symbol_table() -> SymbolTable:
+  return dict(_KEYWORD_SYMBOLS)
\ No newline at end of file
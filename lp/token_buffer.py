@@ -0,0 +1,85 @@
+from array import array
+from typing import List, Union
+
+from lp.lexer import (
+  Buffer,
+  BufferLexer,
+  Lexer,
+  Span,
+  token_literal,
+  token_position,
+)
+from lp.token import Token, TokenType
+
+_TOKEN_TYPES: List[TokenType] = [TokenType.ILLEGAL] * (max(t.value for t in TokenType) + 1)
+for _token_type in TokenType:
+  _TOKEN_TYPES[_token_type.value] = _token_type
+
+class TokenBuffer:
+
+  def __init__(self, source: Union[str, Buffer]) -> None:
+    self._source = source
+    self._types: array = array('B')
+    self._starts: array = array('i')
+    self._ends: array = array('i')
+
+    lexer: Union[Lexer, BufferLexer] = Lexer(source) if isinstance(source, str) else BufferLexer(source)
+
+    types_append = self._types.append
+    starts_append = self._starts.append
+    ends_append = self._ends.append
+    next_span = lexer.next_span
+    eof = TokenType.EOF
+
+    while True:
+      token_type, start, end = next_span()
+      types_append(token_type.value)
+      starts_append(start)
+      ends_append(end)
+
+      if token_type is eof:
+        break
+
+  def __len__(self) -> int:
+    return len(self._types)
+
+  def literal(self, index: int) -> str:
+    token_type, start, end = self.span(index)
+
+    return token_literal(self._source, token_type, start, end)
+
+  def reader(self, index: int = 0) -> 'TokenReader':
+    return TokenReader(self, index)
+
+  def span(self, index: int) -> Span:
+    index = min(index, len(self._types) - 1)
+
+    return _TOKEN_TYPES[self._types[index]], self._starts[index], self._ends[index]
+
+  def token(self, index: int) -> Token:
+    token_type, start, end = self.span(index)
+
+    return Token(
+      token_type,
+      token_literal(self._source, token_type, start, end),
+      token_position(token_type, start)
+    )
+
+  def token_type(self, index: int) -> TokenType:
+    return _TOKEN_TYPES[self._types[min(index, len(self._types) - 1)]]
+
+class TokenReader:
+
+  def __init__(self, buffer: TokenBuffer, index: int = 0) -> None:
+    self._buffer = buffer
+    self._index = index
+
+  @property
+  def index(self) -> int:
+    return self._index
+
+  def next_token(self) -> Token:
+    token = self._buffer.token(self._index)
+    self._index += 1
+
+    return token
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from lp.ast import ASTNode, NODE_FIELDS
+
+# A node type's enter and visit methods, None where the subclass has none,
+# and its child and list fields.
+_Hooks = Tuple[Optional[Callable[[Any], None]], Optional[Callable[[Any], Any]], Tuple[str, ...], Tuple[str, ...]]
+
+# Base for AST-to-AST passes. The tree is walked post-order over an explicit
+# stack, like Resolver and HashConser, so programs nested deeper than the
+# recursion limit (see StackParser) can be rewritten too. For each node, an
+# enter_<NodeType> method is called, when the subclass defines one, before
+# its children are visited; then the children are visited left to right and
+# whatever comes back is put in their place; then visit_<NodeType> gets the
+# node and returns the node to use instead, possibly the same one.
+#
+# Each node is visited once per transformer, so a subtree shared by
+# HashConser is only rewritten, and anything derived from it only computed,
+# once. Bodies left lazy by LazyParser or FlatAST are parsed when reached.
+class Transformer:
+
+  def __init__(self) -> None:
+    # Keeps the visited node alive too, so its id can't be reused.
+    self._visited: Dict[int, Tuple[ASTNode, Any]] = {}
+    self._hooks: Dict[type, _Hooks] = {}
+
+  def visit(self, root: Any) -> Any:
+    visited: Dict[int, Tuple[ASTNode, Any]] = self._visited
+    hooks: Dict[type, _Hooks] = self._hooks
+    # The nodes whose children are being visited, innermost last, each with
+    # its children and how many of them are done, those replaced by what
+    # visiting them gave. The first one only holds the root.
+    frames: List[List[Any]] = [[None, [root], 0]]
+
+    while True:
+      frame: List[Any] = frames[-1]
+      children: List[Any] = frame[1]
+      index: int = frame[2]
+
+      if index == len(children):
+        frames.pop()
+        if not frames:
+          return children[0]
+
+        node = frame[0]
+        _replace_children(node, children)
+        visit = hooks[type(node)][1]
+        result = node if visit is None else visit(node)
+        visited[id(node)] = (node, result)
+
+        frame = frames[-1]
+        frame[1][frame[2]] = result
+        frame[2] += 1
+        continue
+
+      node = children[index]
+      known = None if node is None else visited.get(id(node))
+      if node is None or known is not None:
+        if known is not None:
+          children[index] = known[1]
+        frame[2] = index + 1
+        continue
+
+      enter, visit, child_fields, list_fields = hooks.get(type(node)) or self._hooks_for(type(node))
+      if enter is not None:
+        enter(node)
+
+      node_children: List[Any] = [getattr(node, field) for field in child_fields]
+      for field in list_fields:
+        items = getattr(node, field)
+        if items is not None:
+          node_children.extend(items)
+
+      if node_children:
+        frames.append([node, node_children, 0])
+        continue
+
+      # A leaf is done right away.
+      result = node if visit is None else visit(node)
+      visited[id(node)] = (node, result)
+      children[index] = result
+      frame[2] = index + 1
+
+  def _hooks_for(self, node_type: type) -> _Hooks:
+    name: str = node_type.__name__
+    _, child_fields, list_fields = NODE_FIELDS[node_type]
+    hooks: _Hooks = (getattr(self, f'enter_{name}', None), getattr(self, f'visit_{name}', None), child_fields, list_fields)
+    self._hooks[node_type] = hooks
+
+    return hooks
+
+# Puts the visited children back, in the order visit took them.
+def _replace_children(node: Any, visited: List[Any]) -> None:
+  _, child_fields, list_fields = NODE_FIELDS[type(node)]
+  index: int = 0
+
+  for field in child_fields:
+    setattr(node, field, visited[index])
+    index += 1
+
+  for field in list_fields:
+    items = getattr(node, field)
+    if items is not None:
+      setattr(node, field, visited[index:index + len(items)])
+      index += len(items)
@@ -0,0 +1,688 @@
+from types import CodeType
+from typing import Any, Callable, cast, Dict, List, Optional, Tuple, Type
+
+import lp.ast as ast
+from lp.evaluator import (
+  Env,
+  FALSE,
+  NULL,
+  TRUE,
+  _INTEGER_OPERATIONS,
+  _NOT_A_FUNCTION,
+  _STRING_OPERATIONS,
+  _apply_function,
+  _evaluate_bang_operator_expression,
+  _evaluate_global,
+  _evaluate_infix_expression,
+  _evaluate_prefix_expression,
+  _new_error,
+  _unwrap_return_value,
+  evaluate,
+)
+from lp.object import (
+  Builtin,
+  Environment,
+  Error,
+  Function,
+  Object,
+  ObjectType,
+  Return,
+  new_integer,
+  new_string,
+)
+from lp.resolver import resolve
+
+# Code objects kept by one Transpiler, by default.
+MAX_CODES: int = 128
+
+# Generated expressions nested this many levels deep go to a temporary
+# first, which keeps long chains inside CPython's parser limits.
+_SPILL_DEPTH: int = 32
+
+_INTEGER = ObjectType.INTEGER
+_STRING = ObjectType.STRING
+
+_OPERATOR_NAMES: Dict[str, str] = {
+  '+': '_add',
+  '-': '_sub',
+  '*': '_mul',
+  '/': '_div',
+  '%': '_mod',
+  '<': '_lt',
+  '>': '_gt',
+  '==': '_eq',
+  '!=': '_ne',
+  '<=': '_le',
+  '>=': '_ge',
+}
+
+_PYTHON_OPERATORS: Dict[str, str] = {'/': '//'}
+
+_COMPARISONS = frozenset(['<', '>', '==', '!=', '<=', '>='])
+
+# A line of generated source and how far it is indented.
+_Line = Tuple[int, str]
+
+# A procedimiento made by transpiled code: the same Function value, with the
+# Python function its body became. env is the program's globals, since its
+# locals live in Python frames instead.
+class CompiledFunction(Function):
+  __slots__ = ('code',)
+
+  def __init__(self, node: ast.Function, env: Env, code: Callable[..., Object]) -> None:
+    assert node.body is not None
+    super().__init__(node.parameters, node.body, env)
+    self.code = code
+
+# Translates a Program into Python source that does what evaluating it does,
+# compiles it with compile() and runs it, so CPython's own bytecode does the
+# work the evaluator dispatches by hand. Code objects are cached by source,
+# up to max_entries of them, so running a program again only translates it.
+#
+# The values are still lp objects, and everything that can give an Error
+# goes through the evaluator's helpers, so values, Errors and their positions
+# are exactly the evaluator's. Procedimientos become nested defs whose
+# variables are Python locals, so closures share them through cells like
+# they share Frames. source() gives the generated code, for debugging.
+class Transpiler:
+
+  def __init__(self, max_entries: int = MAX_CODES) -> None:
+    self._max_entries = max_entries
+    self._codes: Dict[str, CodeType] = {}
+    self._hits: int = 0
+    self._misses: int = 0
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  def source(self, program: ast.Program) -> str:
+    return _Generator(program).generate()[0]
+
+  # The code object for the program and the constants it runs with.
+  def compile(self, program: ast.Program) -> Tuple[CodeType, Dict[str, Any]]:
+    source, constants = _Generator(program).generate()
+    code = self._codes.get(source)
+
+    if code is not None:
+      self._hits += 1
+      return code, constants
+
+    self._misses += 1
+    code = compile(source, '<lp>', 'exec')
+
+    if len(self._codes) >= self._max_entries:
+      del self._codes[next(iter(self._codes))]
+    self._codes[source] = code
+
+    return code, constants
+
+  # A program nested deeper than the generator's recursion, or than what
+  # CPython compiles, as in si blocks inside each other past its indentation
+  # limit, is evaluated instead, which gives the same result.
+  def run(self, program: ast.Program, env: Environment) -> Optional[Object]:
+    try:
+      code, constants = self.compile(program)
+    except (RecursionError, SyntaxError):
+      return evaluate(program, env)
+
+    namespace: Dict[str, Any] = dict(_RUNTIME)
+    namespace.update(constants)
+    exec(code, namespace)
+
+    return namespace['_programa'](env)
+
+_TRANSPILER: Transpiler = Transpiler()
+
+def transpile(program: ast.Program) -> str:
+  return _TRANSPILER.source(program)
+
+# Runs the program the way evaluate(program, env) does.
+def execute(program: ast.Program, env: Environment) -> Optional[Object]:
+  return _TRANSPILER.run(program, env)
+
+# Writes the source of one program. Statements are emitted in one of three
+# modes: the last value is the result (return), every value is dropped
+# (discard), or the last value goes into a temporary (a target); a Return or
+# an Error ends the list early in all of them, as in the evaluator's blocks.
+class _Generator:
+
+  def __init__(self, program: ast.Program) -> None:
+    if not program.resolved:
+      resolve(program)
+
+    self._program = program
+    self._compilers: _Compilers = _Compilers({
+      type(None): self._nothing,
+      ast.Integer: self._integer,
+      ast.Boolean: self._boolean,
+      ast.StringLiteral: self._string,
+      ast.Prefix: self._operators,
+      ast.Infix: self._operators,
+      ast.If: self._if,
+      ast.Block: self._block,
+      ast.Identifier: self._identifier,
+      ast.Function: self._function,
+      ast.Call: self._call,
+      ast.ParseFailure: self._parse_failure,
+    })
+    self._lines: List[_Line] = []
+    self._indent: int = 0
+    self._depth: int = 0
+    self._constants: Dict[str, Any] = {}
+    self._constant_names: Dict[Any, str] = {}
+    self._temporaries: int = 0
+    # The procedimientos around the code being written, with their numbers.
+    self._functions: List[Tuple[ast.Function, int]] = []
+    self._function_count: int = 0
+    self._function_name: str = ''
+
+  def generate(self) -> Tuple[str, Dict[str, Any]]:
+    self._emit('def _programa(env):')
+    self._indent = 1
+
+    self._statements(self._program.statements, True, None)
+
+    source: str = ''.join(f'{"  " * indent}{text}\n' for indent, text in self._lines)
+    return source, self._constants
+
+  def _emit(self, text: str) -> None:
+    self._lines.append((self._indent, text))
+
+  def _temporary(self) -> str:
+    self._temporaries += 1
+    return f'_t{self._temporaries}'
+
+  def _constant(self, value: Any, key: Any) -> str:
+    name = self._constant_names.get(key)
+
+    if name is None:
+      name = self._constant_names[key] = f'_k{len(self._constant_names)}'
+      self._constants[name] = value
+    return name
+
+  def _statements(self, statements: List[ast.Statement], tail: bool, target: Optional[str]) -> None:
+    depth: int = self._depth
+    self._depth = 0
+    last: int = len(statements) - 1
+
+    # A target only needs a loop to break out of when something before the
+    # last statement can end the list.
+    loop: bool = target is not None and any(
+      type(statement) == ast.ReturnStatement or
+      type(statement) == ast.ExpressionStatement and _can_stop(statement.expression)
+      for statement in statements[:-1]
+    )
+    if loop:
+      self._emit('while True:')
+      self._indent += 1
+
+    if not statements:
+      self._finish('None', tail, target)
+
+    for index, statement in enumerate(statements):
+      is_last: bool = index == last
+
+      if type(statement) == ast.LetStatement:
+        self._let_statement(statement)
+        if is_last:
+          self._finish('None', tail, target)
+      elif type(statement) == ast.ReturnStatement:
+        value: str = self._expression(statement.return_value)
+
+        if target is None:
+          self._emit(f'return {value}')
+        else:
+          self._emit(f'{target} = _Return({value})')
+        break
+      elif type(statement) == ast.ExpressionStatement:
+        expression = statement.expression
+
+        if type(expression) == ast.If and target is None:
+          self._if_statement(expression, tail and is_last)
+        elif type(expression) == ast.Block and target is None:
+          # Like the branch of a si, in the same mode.
+          self._statements(cast(ast.Block, expression).statements, tail and is_last, None)
+        elif is_last:
+          value = self._expression(expression)
+          if tail and type(expression) in (ast.Identifier, ast.If, ast.Block):
+            value = f'_unwrap({value})'
+
+          if tail or target is not None:
+            self._finish(value, tail, target)
+          elif _can_stop(expression):
+            self._stop(value, target)
+        elif _can_stop(expression):
+          self._stop(self._expression(expression), target)
+        else:
+          self._expression(expression)
+      elif is_last:
+        self._finish('None', tail, target)
+
+    if loop:
+      self._emit('break')
+      self._indent -= 1
+
+    self._depth = depth
+
+  def _finish(self, value: str, tail: bool, target: Optional[str]) -> None:
+    if target is not None:
+      self._emit(f'{target} = {value}')
+    elif tail:
+      self._emit(f'return {value}')
+
+  def _stop(self, value: str, target: Optional[str]) -> None:
+    self._emit(f'_v = {value}')
+
+    if target is None:
+      self._emit('if type(_v) in _STOPS: return _unwrap(_v)')
+    else:
+      self._emit('if type(_v) in _STOPS:')
+      self._emit(f'  {target} = _v')
+      self._emit('  break')
+
+  def _let_statement(self, node: ast.LetStatement) -> None:
+    assert node.name is not None
+    # Names the def of a procedimiento bound here, for reading the source.
+    self._function_name = node.name.value if type(node.value) == ast.Function else ''
+    value: str = self._expression(node.value)
+
+    if node.name.depth == 0:
+      self._emit(f'{self._local(0, node.name.slot, node.name.value)} = {value}')
+    else:
+      self._emit(f'env[{node.name.value!r}] = {value}')
+
+  # A si whose value is the statement's: its branches are emitted as
+  # branches of a Python if, in the same mode.
+  def _if_statement(self, node: ast.If, tail: bool) -> None:
+    assert node.consequence is not None
+    self._emit(f'if {self._condition(node.condition)}:')
+    self._branch(node.consequence, tail, None)
+
+    if tail:
+      # Every path through the consequence returns.
+      if node.alternative is None:
+        self._emit('return _NULL')
+      else:
+        self._statements(node.alternative.statements, True, None)
+    elif node.alternative is not None:
+      self._emit('else:')
+      self._branch(node.alternative, False, None)
+
+  def _branch(self, block: ast.Block, tail: bool, target: Optional[str]) -> None:
+    self._indent += 1
+    start: int = len(self._lines)
+
+    self._statements(block.statements, tail, target)
+    if len(self._lines) == start:
+      self._emit('pass')
+
+    self._indent -= 1
+
+  # A Python truth value for the condition of a si.
+  def _condition(self, node: Any) -> str:
+    node_type = type(node)
+
+    if node_type == ast.Boolean and node.value is not None:
+      return 'True' if node.value else 'False'
+    elif node_type == ast.Infix and node.operands and node.operator in _COMPARISONS:
+      left, right = self._operands([node.left, node.right])
+      return f'{left}.value {node.operator} {right}.value'
+    elif node_type == ast.Prefix and node.operator == '!':
+      return f'not ({self._condition(node.right)})'
+
+    return f'((_c := {self._expression(node)}) is not _FALSE and _c is not _NULL)'
+
+  def _expression(self, node: Any) -> str:
+    self._depth += 1
+    code: str = self._compilers[type(node)](node)
+    self._depth -= 1
+
+    if self._depth and self._depth % _SPILL_DEPTH == 0 and not _is_atom(code):
+      temporary: str = self._temporary()
+      self._emit(f'{temporary} = {code}')
+      return temporary
+
+    return code
+
+  # Expressions evaluated left to right. When one of them needs statements
+  # first, the ones before it are moved to temporaries ahead of those, so
+  # they still run first.
+  def _operands(self, nodes: List[Any]) -> List[str]:
+    codes: List[str] = []
+
+    for node in nodes:
+      mark: int = len(self._lines)
+      code: str = self._expression(node)
+
+      if len(self._lines) != mark:
+        earlier: List[_Line] = []
+        for index, previous in enumerate(codes):
+          if not _is_atom(previous):
+            codes[index] = self._temporary()
+            earlier.append((self._indent, f'{codes[index]} = {previous}'))
+        self._lines[mark:mark] = earlier
+
+      codes.append(code)
+
+    return codes
+
+  # A missing node gives None, as in the evaluator.
+  def _nothing(self, node: None) -> str:
+    return 'None'
+
+  def _integer(self, node: ast.Integer) -> str:
+    assert node.value is not None
+    return self._constant(new_integer(node.value), (int, node.value))
+
+  def _boolean(self, node: ast.Boolean) -> str:
+    return '_TRUE' if node.value else '_FALSE'
+
+  def _string(self, node: ast.StringLiteral) -> str:
+    return self._constant(new_string(node.value), (str, node.value))
+
+  def _parse_failure(self, node: ast.ParseFailure) -> str:
+    return self._constant(Error(node.message, node.position), (Error, node.message, node.position))
+
+  # A tree of Prefix and Infix nodes, as deep as a chain of operators is
+  # long, written over an explicit stack: each node gets what _expression
+  # would give it, the depth it is spilled at included. Anything else in the
+  # tree goes through _expression.
+  def _operators(self, root: Any) -> str:
+    depth: int = self._depth
+    codes: List[str] = []
+    # A node, how far below root it is, how many of its operands are done
+    # and, once the left one of an Infix is, where the right one's lines start.
+    stack: List[Tuple[Any, int, int, int]] = [(root, 0, 0, 0)]
+
+    while stack:
+      node, level, done, mark = stack.pop()
+      node_type = type(node)
+
+      if node_type != ast.Prefix and node_type != ast.Infix:
+        self._depth = depth + level - 1
+        codes.append(self._expression(node))
+        continue
+      elif done == 0:
+        stack.append((node, level, 1, 0))
+        stack.append((node.right if node_type == ast.Prefix else node.left, level + 1, 0, 0))
+        continue
+      elif node_type == ast.Infix and done == 1:
+        stack.append((node, level, 2, len(self._lines)))
+        stack.append((node.right, level + 1, 0, 0))
+        continue
+
+      if node_type == ast.Prefix:
+        code: str = self._prefix(node, codes.pop())
+      else:
+        right: str = codes.pop()
+        left: str = codes.pop()
+
+        # As in _operands: the left operand runs before the right one's lines.
+        if len(self._lines) != mark and not _is_atom(left):
+          temporary: str = self._temporary()
+          self._lines.insert(mark, (self._indent, f'{temporary} = {left}'))
+          left = temporary
+        code = self._infix(node, left, right)
+
+      self._depth = depth + level - 1
+      if level and self._depth and self._depth % _SPILL_DEPTH == 0 and not _is_atom(code):
+        temporary = self._temporary()
+        self._emit(f'{temporary} = {code}')
+        code = temporary
+      codes.append(code)
+
+    self._depth = depth
+    return codes[0]
+
+  def _prefix(self, node: ast.Prefix, right: str) -> str:
+    if node.operands:
+      return f'_new_integer(-{right}.value)'
+    elif node.operator == '!':
+      return f'_bang({right})'
+
+    return f'_prefix({node.operator!r}, {right}, {node.token.position})'
+
+  def _infix(self, node: ast.Infix, left: str, right: str) -> str:
+    operator: str = node.operator
+
+    if node.operands == 'INTEGER':
+      if operator in _COMPARISONS:
+        return f'(_TRUE if {left}.value {operator} {right}.value else _FALSE)'
+      return f'_new_integer({left}.value {_PYTHON_OPERATORS.get(operator, operator)} {right}.value)'
+    elif node.operands == 'STRING':
+      if operator in _COMPARISONS:
+        return f'(_TRUE if {left}.value {operator} {right}.value else _FALSE)'
+      return f'_new_string({left}.value + {right}.value)'
+
+    name = _OPERATOR_NAMES.get(operator)
+    if name is None:
+      return f'_infix({operator!r}, {left}, {right}, {node.token.position})'
+
+    return f'{name}({left}, {right}, {node.token.position})'
+
+  def _if(self, node: ast.If) -> str:
+    target: str = self._temporary()
+    condition: str = self._condition(node.condition)
+    lines, indent = self._lines, self._indent
+    branches: List[Tuple[List[_Line], Optional[str]]] = []
+
+    for block in (node.consequence, node.alternative):
+      self._lines, self._indent = [], 0
+
+      if block is None:
+        code: Optional[str] = '_NULL'
+      elif len(block.statements) == 1 and type(block.statements[0]) == ast.ExpressionStatement:
+        code = self._expression(block.statements[0].expression)
+      else:
+        code = None
+        self._statements(block.statements, False, target)
+
+      branches.append((self._lines, code))
+
+    self._lines, self._indent = lines, indent
+    (consequence, then), (alternative, otherwise) = branches
+
+    if not consequence and not alternative and then is not None and otherwise is not None:
+      return f'({then} if {condition} else {otherwise})'
+
+    for index, (branch, code) in enumerate(branches):
+      self._emit(f'if {condition}:' if index == 0 else 'else:')
+      self._lines.extend((indent + 1 + line_indent, text) for line_indent, text in branch)
+      if code is not None:
+        self._lines.append((indent + 1, f'{target} = {code}'))
+
+    return target
+
+  # A block in an expression slot, which an optimization pass may leave,
+  # gives its value like a si branch: a Return when a regresa ends it.
+  def _block(self, node: ast.Block) -> str:
+    statements: List[ast.Statement] = node.statements
+
+    if len(statements) == 1 and type(statements[0]) == ast.ExpressionStatement:
+      return self._expression(statements[0].expression)
+
+    target: str = self._temporary()
+    self._statements(statements, False, target)
+    return target
+
+  def _identifier(self, node: ast.Identifier) -> str:
+    if node.depth < 0:
+      return self._global(node)
+
+    # An empty slot is looked up in the procedimientos around, by name.
+    code: str = self._local(node.depth, node.slot, node.value)
+    fallbacks: List[str] = [code]
+    for function, number in reversed(self._functions[:-1 - node.depth]):
+      assert function.body is not None
+      slot = function.body.scope.names.get(node.value)
+      if slot is not None:
+        fallbacks.append(_local_name(number, slot, node.value))
+
+    fallback: str = self._global(node)
+    for name in reversed(fallbacks[1:]):
+      fallback = f'{name} if {name} is not None else {fallback}'
+
+    return f'({code} if {code} is not None else {fallback})'
+
+  def _global(self, node: ast.Identifier) -> str:
+    return f'(env.get({node.value!r}) or _global(env, {node.value!r}, {node.token.position}))'
+
+  def _local(self, depth: int, slot: int, name: str) -> str:
+    return _local_name(self._functions[-1 - depth][1], slot, name)
+
+  def _function(self, node: ast.Function) -> str:
+    assert node.body is not None
+    statements: List[ast.Statement] = node.body.statements
+    names: Dict[str, int] = node.body.scope.names
+
+    self._function_count += 1
+    number: int = self._function_count
+    name: str = f'f{number}_{_sanitize(self._function_name)}'
+    self._function_name = ''
+
+    parameters: List[str] = [_local_name(number, parameter.slot, parameter.value) for parameter in node.parameters]
+    duplicated: bool = len(set(parameters)) != len(parameters)
+    if duplicated:
+      parameters = [f'_a{index}' for index in range(len(node.parameters))]
+
+    self._emit(f'def {name}({"".join(parameter + "=None, " for parameter in parameters)}*_):')
+    self._functions.append((node, number))
+    depth, self._depth = self._depth, 0
+    self._indent += 1
+
+    bound = {parameter.slot for parameter in node.parameters}
+    unset: List[str] = [_local_name(number, slot, local) for local, slot in names.items() if slot not in bound]
+    if duplicated:
+      unset.extend(_local_name(number, parameter.slot, parameter.value) for parameter in node.parameters)
+    if unset:
+      self._emit(' = '.join(dict.fromkeys(unset)) + ' = None')
+
+    # The last argument given for a repeated parameter is the one it keeps.
+    if duplicated:
+      for index, parameter in enumerate(node.parameters):
+        local: str = _local_name(number, parameter.slot, parameter.value)
+        self._emit(f'if _a{index} is not None: {local} = _a{index}')
+
+    self._statements(statements, True, None)
+
+    self._indent -= 1
+    self._depth = depth
+    self._functions.pop()
+
+    return f'_CompiledFunction({self._constant(node, id(node))}, env, {name})'
+
+  def _call(self, node: ast.Call) -> str:
+    assert node.arguments is not None
+    codes: List[str] = self._operands([node.function] + node.arguments)
+
+    return f'_call({codes[0]}, {node.token.position}{"".join(", " + code for code in codes[1:])})'
+
+def _local_name(number: int, slot: int, name: str) -> str:
+  return f'v{number}_{slot}_{_sanitize(name)}'
+
+def _sanitize(name: str) -> str:
+  return ''.join(character if ('a' + character).isidentifier() else '_' for character in name)
+
+def _is_atom(code: str) -> bool:
+  return code in ('None', '_TRUE', '_FALSE', '_NULL') or \
+    code[:2] in ('_t', '_k') and code[2:].isdigit()
+
+# Whether evaluating the expression can give a Return or an Error.
+class _Compilers(Dict[Type, Callable[[Any], str]]):
+
+  def __missing__(self, node_type: Type) -> Callable[[Any], str]:
+    raise ValueError(f'Nodo desconocido para el transpilador: {node_type.__name__}')
+
+def _can_stop(node: Any) -> bool:
+  node_type = type(node)
+
+  if node_type in (ast.Integer, ast.Boolean, ast.StringLiteral, ast.Function):
+    return False
+  elif node_type == ast.Prefix:
+    return not node.operands and node.operator != '!'
+  elif node_type == ast.Infix:
+    return not node.operands
+
+  return True
+
+def _global(env: Environment, name: str, position: int) -> Object:
+  value = _evaluate_global(name, env)
+
+  if type(value) == Error and value.position < 0:
+    value.position = position
+  return value
+
+def _call(fn: Any, position: int, *args: Object) -> Object:
+  if type(fn) == CompiledFunction:
+    result = fn.code(*args)
+    # A body that gives no value at all fails, as in the evaluator.
+    assert result is not None
+  elif type(fn) == Builtin:
+    result = fn.fn(*args)
+  elif type(fn) == Function:
+    result = _apply_function(fn, list(args))
+  else:
+    result = _new_error(_NOT_A_FUNCTION, [fn.object_type.name])
+
+  if type(result) == Error and result.position < 0:
+    result.position = position
+  return result
+
+def _infix(operator: str, left: Object, right: Object, position: int) -> Object:
+  result = _evaluate_infix_expression(operator, left, right)
+
+  if type(result) == Error and result.position < 0:
+    result.position = position
+  return result
+
+def _prefix(operator: str, right: Object, position: int) -> Object:
+  result = _evaluate_prefix_expression(operator, right)
+
+  if type(result) == Error and result.position < 0:
+    result.position = position
+  return result
+
+# The generic operator for generated code: both operand types are checked
+# here, with the evaluator's integer and string operations as fast paths.
+def _operator(operator: str) -> Callable[[Object, Object, int], Object]:
+  integer_operation = _INTEGER_OPERATIONS.get(operator)
+  string_operation = _STRING_OPERATIONS.get(operator)
+
+  def operation(left: Any, right: Any, position: int) -> Object:
+    left_type = left.object_type
+    right_type = right.object_type
+
+    if left_type is _INTEGER and right_type is _INTEGER and integer_operation is not None:
+      return integer_operation(left.value, right.value)
+    elif left_type is _STRING and right_type is _STRING and string_operation is not None:
+      return string_operation(left.value, right.value)
+
+    return _infix(operator, left, right, position)
+
+  return operation
+
+# What generated code can use besides its constants.
+_RUNTIME: Dict[str, Any] = {
+  '__builtins__': {},
+  '_TRUE': TRUE,
+  '_FALSE': FALSE,
+  '_NULL': NULL,
+  '_STOPS': frozenset([Return, Error]),
+  '_Return': Return,
+  '_CompiledFunction': CompiledFunction,
+  '_new_integer': new_integer,
+  '_new_string': new_string,
+  '_bang': _evaluate_bang_operator_expression,
+  '_unwrap': _unwrap_return_value,
+  '_global': _global,
+  '_call': _call,
+  '_infix': _infix,
+  '_prefix': _prefix,
+  'type': type,
+  **{name: _operator(operator) for operator, name in _OPERATOR_NAMES.items()},
+}
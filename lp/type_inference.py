@@ -0,0 +1,462 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple, TypeVar, Union, cast
+
+import lp.ast as ast
+from lp.resolver import resolve
+
+# Types are the names of the ObjectType every evaluation of an expression
+# gives, None when it isn't known.
+INTEGER: str = 'INTEGER'
+STRING: str = 'STRING'
+BOOLEAN: str = 'BOOLEAN'
+
+# Not known yet: only reached from calls that haven't been seen, so never
+# evaluated unless some round says otherwise.
+_PENDING: str = 'PENDING'
+
+_INTEGER_OPERATORS = frozenset(['+', '-', '*', '/', '%'])
+_COMPARISONS = frozenset(['<', '>', '==', '!=', '<=', '>='])
+_STRING_OPERATORS = frozenset(['+', '==', '!='])
+
+# Expressions whose type is known without walking anything else.
+_LEAVES = (ast.Identifier, ast.Integer, ast.Boolean, ast.StringLiteral)
+
+# A variable, as the id of the procedimiento it is local to, 0 for the
+# globals, and its name.
+_Key = Tuple[int, str]
+
+# The nodes that get their operands marked.
+_Marked = Union[ast.Prefix, ast.Infix]
+
+_Node = TypeVar('_Node', bound=ast.ASTNode)
+
+# Tasks of the walk in TypeInference._statements, by their first item.
+_EXPRESSION, _STATEMENTS, _BIND, _DISCARD, _PREFIX, _INFIX, _CALL, _FINISH = range(8)
+
+# Proves which Infix and Prefix nodes always get an Integer, or always a
+# String, for their operands, and marks them in their operands field so the
+# evaluator can skip checking. Besides literals and operators, it knows the
+# type of:
+#
+# - a variable with a single variable statement in its procedimiento, or in
+#   the globals, made directly in a body or the program and read in a later
+#   statement there, so the binding has always happened before the read;
+# - a parameter of a procedimiento bound by a single top-level variable
+#   statement whose name is only ever called, with as many arguments as it
+#   has parameters: every call is in the program, and the parameter has the
+#   type all of them agree on, worked out over rounds until no call changes
+#   it.
+#
+# Anything else keeps the evaluator's generic path. A node shared by
+# HashConser is marked only when every place it appears agrees.
+class TypeInference:
+
+  def __init__(self) -> None:
+    self._bindings: Counter = Counter()
+    self._closed: Dict[str, ast.Function] = {}
+    self._parameters: Dict[int, List[Optional[str]]] = {}
+    self._arguments: Dict[int, List[Optional[str]]] = {}
+    self._types: Dict[int, Tuple[ast.ASTNode, Optional[str]]] = {}
+    self._marks: Dict[int, Tuple[_Marked, Optional[str]]] = {}
+    self._marking: bool = False
+
+  @property
+  def operations(self) -> int:
+    return len(self._marks)
+
+  @property
+  def specialized(self) -> int:
+    return sum(1 for _, mark in self._marks.values() if mark in (INTEGER, STRING))
+
+  def program(self, program: ast.Program) -> ast.Program:
+    if not program.resolved:
+      resolve(program)
+
+    self._find_closed_functions(program)
+    self._parameters = {
+      id(function): [_PENDING] * len(function.parameters) for function in self._closed.values()
+    }
+
+    while True:
+      self._arguments = {key: [_PENDING] * len(types) for key, types in self._parameters.items()}
+      self._statements(program.statements, [], {}, True)
+
+      if self._arguments == self._parameters:
+        break
+      self._parameters = self._arguments
+
+    self._marking = True
+    self._statements(program.statements, [], {}, True)
+
+    for node, mark in self._marks.values():
+      node.operands = mark if mark in (INTEGER, STRING) else ''
+
+    return program
+
+  # The type the expression always has, as far as it was proven; only asked
+  # about nodes inside the program given to program().
+  def type_of(self, node: ast.Expression) -> Optional[str]:
+    known = self._types.get(id(node))
+    if known is not None:
+      return known[1]
+
+    return _literal_type(node)
+
+  def is_integer(self, node: ast.Expression) -> bool:
+    return self.type_of(node) == INTEGER
+
+  def _find_closed_functions(self, program: ast.Program) -> None:
+    uses: Counter = Counter()
+    arities: Dict[str, Set[int]] = {}
+    occurrences: Counter = Counter()
+    stack: List[Tuple[Any, int]] = [(statement, 0) for statement in program.statements]
+
+    while stack:
+      node, scope = stack.pop()
+      node_type = type(node)
+
+      if node is None:
+        continue
+      elif node_type == ast.Identifier:
+        uses[node.value] += 1
+        continue
+      elif node_type == ast.LetStatement:
+        if node.name is not None:
+          self._bindings[(scope, node.name.value)] += 1
+        stack.append((node.value, scope))
+        continue
+      elif node_type == ast.Function:
+        occurrences[id(node)] += 1
+        stack.append((node.body, id(node)))
+        continue
+      elif node_type == ast.Call and type(node.function) == ast.Identifier and node.arguments is not None:
+        arities.setdefault(node.function.value, set()).add(len(node.arguments))
+        uses[node.function.value] -= 1
+
+      _, child_fields, list_fields = ast.NODE_FIELDS[node_type]
+      stack.extend((getattr(node, field), scope) for field in child_fields)
+      for field in list_fields:
+        stack.extend((child, scope) for child in getattr(node, field) or ())
+
+    candidates: Dict[str, ast.Function] = {}
+    for statement in program.statements:
+      if type(statement) != ast.LetStatement or type(statement.value) != ast.Function:
+        continue
+
+      assert statement.name is not None
+      name: str = statement.name.value
+      function: ast.Function = statement.value
+      parameters: List[str] = [parameter.value for parameter in function.parameters]
+
+      if self._bindings[(0, name)] == 1 and uses[name] == 0 and \
+        arities.get(name, set()) <= {len(parameters)} and len(set(parameters)) == len(parameters):
+        candidates[name] = function
+
+    # A procedimiento also reachable some other way can't be told apart.
+    bound: Counter = Counter(id(function) for function in candidates.values())
+    self._closed = {
+      name: function for name, function in candidates.items()
+      if occurrences[id(function)] == bound[id(function)]
+    }
+
+  # Walks a list of statements; direct says whether it is the program or a
+  # procedimiento's body, the lists whose variable statements are trusted.
+  # The walk runs over an explicit stack of tasks, so it reaches as deep as
+  # StackParser nests; each expression task leaves the expression's type on
+  # the results stack, in evaluation order, for the task waiting on it.
+  def _statements(
+    self,
+    statements: List[ast.Statement],
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]],
+    direct: bool
+  ) -> None:
+    stack: List[Tuple[Any, ...]] = []
+    results: List[Optional[str]] = []
+    _push_statements(stack, statements, functions, known, direct)
+
+    while stack:
+      task = stack.pop()
+      kind: int = task[0]
+
+      if kind == _EXPRESSION and type(task[1]) in _LEAVES:
+        results.append(self._leaf(task[1], task[2], task[3]))
+      elif kind == _EXPRESSION:
+        self._expression(stack, results, task[1], task[2], task[3])
+      elif kind == _STATEMENTS:
+        self._statement(stack, *task[1:])
+      elif kind == _BIND:
+        value_type = results.pop()
+        if task[2] is not None:
+          task[2][task[1]] = value_type
+      elif kind == _DISCARD:
+        results.pop()
+      elif kind == _PREFIX:
+        self._prefix(results, task[1], results.pop())
+      elif kind == _INFIX:
+        right = results.pop()
+        self._infix(results, task[1], results.pop(), right)
+      elif kind == _CALL:
+        start: int = len(results) - len(task[1].arguments)
+        arguments: List[Optional[str]] = results[start:]
+        del results[start:]
+        self._call(stack, results, task[1], arguments, task[2], task[3])
+      else:
+        self._finish(results, task[1], None)
+
+  # Queues the statement at index, and the ones after it.
+  def _statement(
+    self,
+    stack: List[Tuple[Any, ...]],
+    statements: List[ast.Statement],
+    index: int,
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]],
+    direct: bool
+  ) -> None:
+    if index == len(statements):
+      return
+
+    stack.append((_STATEMENTS, statements, index + 1, functions, known, direct))
+    statement = statements[index]
+    statement_type = type(statement)
+
+    if statement_type == ast.LetStatement:
+      let = cast(ast.LetStatement, statement)
+      assert let.name is not None
+      key: _Key = (id(functions[-1]) if functions else 0, let.name.value)
+
+      # The binding is known from the next statement on.
+      stack.append((_BIND, key, known if direct and self._bindings[key] == 1 else None))
+      stack.append((_EXPRESSION, let.value, functions, known))
+    elif statement_type == ast.ReturnStatement:
+      stack.append((_DISCARD,))
+      stack.append((_EXPRESSION, cast(ast.ReturnStatement, statement).return_value, functions, known))
+    elif statement_type == ast.ExpressionStatement:
+      stack.append((_DISCARD,))
+      stack.append((_EXPRESSION, cast(ast.ExpressionStatement, statement).expression, functions, known))
+
+  # Queues the parts of the expression, in the order they are evaluated, and
+  # a task that gives its type after. Operands and arguments that are leaves
+  # are typed right away instead, the order they are in making no difference.
+  def _expression(
+    self,
+    stack: List[Tuple[Any, ...]],
+    results: List[Optional[str]],
+    node: Optional[ast.Expression],
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]]
+  ) -> None:
+    node_type = type(node)
+
+    if node is None:
+      results.append(None)
+    elif node_type == ast.Prefix:
+      prefix = cast(ast.Prefix, node)
+      if type(prefix.right) in _LEAVES:
+        self._prefix(results, prefix, self._leaf(prefix.right, functions, known))
+      else:
+        stack.append((_PREFIX, node))
+        stack.append((_EXPRESSION, prefix.right, functions, known))
+    elif node_type == ast.Infix:
+      infix = cast(ast.Infix, node)
+      if type(infix.left) in _LEAVES and type(infix.right) in _LEAVES:
+        self._infix(
+          results,
+          infix,
+          self._leaf(infix.left, functions, known),
+          self._leaf(infix.right, functions, known)
+        )
+      else:
+        stack.append((_INFIX, node))
+        stack.append((_EXPRESSION, infix.right, functions, known))
+        stack.append((_EXPRESSION, infix.left, functions, known))
+    elif node_type == ast.If:
+      if_expression = cast(ast.If, node)
+      stack.append((_FINISH, node))
+      for block in (if_expression.alternative, if_expression.consequence):
+        if block is not None:
+          _push_statements(stack, block.statements, functions, known, False)
+      stack.append((_DISCARD,))
+      stack.append((_EXPRESSION, if_expression.condition, functions, known))
+    elif node_type == ast.Function:
+      stack.append((_FINISH, node))
+      self._function(stack, cast(ast.Function, node), functions, known)
+    elif node_type == ast.Call:
+      call = cast(ast.Call, node)
+      arguments: List[ast.Expression] = call.arguments or []
+      if all(type(argument) in _LEAVES for argument in arguments):
+        self._call(stack, results, call, [self._leaf(argument, functions, known) for argument in arguments], functions, known)
+      else:
+        stack.append((_CALL, call, functions, known))
+        stack.extend([(_EXPRESSION, argument, functions, known) for argument in reversed(arguments)])
+    elif node_type in _LEAVES:
+      results.append(self._leaf(node, functions, known))
+    else:
+      self._finish(results, node, _literal_type(node))
+
+  def _prefix(self, results: List[Optional[str]], node: ast.Prefix, right: Optional[str]) -> None:
+    result: Optional[str] = None
+    mark: Optional[str] = None
+
+    if right == _PENDING:
+      result = mark = _PENDING
+    elif node.operator == '!':
+      result = BOOLEAN
+    elif node.operator == '-' and right == INTEGER:
+      result = mark = INTEGER
+
+    self._mark(node, mark)
+    self._finish(results, node, result)
+
+  def _infix(
+    self,
+    results: List[Optional[str]],
+    node: ast.Infix,
+    left: Optional[str],
+    right: Optional[str]
+  ) -> None:
+    operator: str = node.operator
+    result: Optional[str] = None
+    mark: Optional[str] = None
+
+    if left == _PENDING or right == _PENDING:
+      result = mark = _PENDING
+    elif left == right == INTEGER and (operator in _INTEGER_OPERATORS or operator in _COMPARISONS):
+      result = INTEGER if operator in _INTEGER_OPERATORS else BOOLEAN
+      mark = INTEGER
+    elif left == right == STRING and operator in _STRING_OPERATORS:
+      result = STRING if operator == '+' else BOOLEAN
+      mark = STRING
+    elif operator in ('==', '!='):
+      # Anything else is compared by identity, errors too.
+      result = BOOLEAN
+
+    self._mark(node, mark)
+    self._finish(results, node, result)
+
+  def _finish(self, results: List[Optional[str]], node: ast.ASTNode, result: Optional[str]) -> None:
+    if self._marking:
+      _join_into(self._types, node, result)
+
+    results.append(result)
+
+  def _leaf(
+    self,
+    node: Any,
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]]
+  ) -> Optional[str]:
+    if type(node) == ast.Identifier:
+      result = self._identifier_type(cast(ast.Identifier, node), functions, known)
+    else:
+      result = _literal_type(node)
+
+    if self._marking:
+      _join_into(self._types, node, result)
+
+    return result
+
+  def _identifier_type(
+    self,
+    node: ast.Identifier,
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]]
+  ) -> Optional[str]:
+    if node.depth < 0:
+      return known.get((0, node.value))
+
+    return known.get((id(functions[-1 - node.depth]), node.value))
+
+  def _function(
+    self,
+    stack: List[Tuple[Any, ...]],
+    node: ast.Function,
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]]
+  ) -> None:
+    if node.body is None:
+      return
+
+    known = dict(known)
+    parameters = self._parameters.get(id(node))
+    if parameters is not None:
+      for parameter, parameter_type in zip(node.parameters, parameters):
+        if self._bindings[(id(node), parameter.value)] == 0:
+          known[(id(node), parameter.value)] = parameter_type
+
+    _push_statements(stack, node.body.statements, functions + [node], known, True)
+
+  # Runs once the arguments' types are known.
+  def _call(
+    self,
+    stack: List[Tuple[Any, ...]],
+    results: List[Optional[str]],
+    node: ast.Call,
+    arguments: List[Optional[str]],
+    functions: List[ast.Function],
+    known: Dict[_Key, Optional[str]]
+  ) -> None:
+    function = node.function
+
+    if type(function) != ast.Identifier or function.depth >= 0 or function.value not in self._closed:
+      if type(function) in _LEAVES:
+        self._leaf(function, functions, known)
+        self._finish(results, node, None)
+      else:
+        stack.append((_FINISH, node))
+        stack.append((_DISCARD,))
+        stack.append((_EXPRESSION, function, functions, known))
+      return
+
+    parameters = self._arguments[id(self._closed[function.value])]
+    for index, argument in enumerate(arguments):
+      parameters[index] = _join(parameters[index], argument)
+
+    self._finish(results, node, None)
+
+  def _mark(self, node: _Marked, mark: Optional[str]) -> None:
+    if self._marking:
+      _join_into(self._marks, node, mark)
+
+# A direct list of statements gets its own copy of what is known, which its
+# variable statements add to.
+def _push_statements(
+  stack: List[Tuple[Any, ...]],
+  statements: List[ast.Statement],
+  functions: List[ast.Function],
+  known: Dict[_Key, Optional[str]],
+  direct: bool
+) -> None:
+  stack.append((_STATEMENTS, statements, 0, functions, dict(known) if direct else known, direct))
+
+def infer_types(program: ast.Program) -> ast.Program:
+  return TypeInference().program(program)
+
+def _literal_type(node: Any) -> Optional[str]:
+  node_type = type(node)
+
+  if node_type == ast.Integer and node.value is not None:
+    return INTEGER
+  elif node_type == ast.StringLiteral:
+    return STRING
+  elif node_type == ast.Boolean and node.value is not None:
+    return BOOLEAN
+
+  return None
+
+def _join(left: Optional[str], right: Optional[str]) -> Optional[str]:
+  if left == _PENDING:
+    return right
+  elif right == _PENDING or left == right:
+    return left
+
+  return None
+
+def _join_into(
+  table: Dict[int, Tuple[_Node, Optional[str]]],
+  node: _Node,
+  value: Optional[str]
+) -> None:
+  previous = table.get(id(node))
+  table[id(node)] = (node, value if previous is None else _join(previous[1], value))
@@ -0,0 +1,241 @@
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+from lp.ast import Program
+from lp.compiler import Bytecode, Compiler, Opcode
+from lp.evaluator import (
+  Env,
+  FALSE,
+  NULL,
+  TRUE,
+  _NOT_A_FUNCTION,
+  _evaluate_global,
+  _evaluate_infix_expression,
+  _evaluate_prefix_expression,
+  _evaluate_unset_local,
+  _extend_function_environment,
+  _new_error,
+)
+from lp.object import (
+  Builtin,
+  Error,
+  Function,
+  Object,
+  ObjectType,
+  Return,
+  new_integer,
+)
+
+_INTEGER = ObjectType.INTEGER
+_STRING = ObjectType.STRING
+_RETURN = ObjectType.RETURN
+_ERROR = ObjectType.ERROR
+
+# Plain ints, cheaper to compare against than the enum members.
+_CONSTANT = Opcode.CONSTANT.value
+_NONE = Opcode.NONE.value
+_POP = Opcode.POP.value
+_GET_LOCAL = Opcode.GET_LOCAL.value
+_GET_OUTER = Opcode.GET_OUTER.value
+_GET_GLOBAL = Opcode.GET_GLOBAL.value
+_SET_LOCAL = Opcode.SET_LOCAL.value
+_SET_GLOBAL = Opcode.SET_GLOBAL.value
+_INFIX = Opcode.INFIX.value
+_TYPED_INFIX = Opcode.TYPED_INFIX.value
+_PREFIX = Opcode.PREFIX.value
+_BANG = Opcode.BANG.value
+_TYPED_MINUS = Opcode.TYPED_MINUS.value
+_JUMP = Opcode.JUMP.value
+_JUMP_IF_FALSE = Opcode.JUMP_IF_FALSE.value
+_STOP = Opcode.STOP.value
+_RETURN_WRAP = Opcode.RETURN_WRAP.value
+_FUNCTION = Opcode.FUNCTION.value
+_CALL = Opcode.CALL.value
+_RETURN_OPCODE = Opcode.RETURN.value
+_HALT = Opcode.HALT.value
+
+# Where a call returns to: the caller's instructions, constants, positions,
+# next instruction and environment.
+_Call = Tuple[array, List[Any], Dict[int, int], int, Env]
+
+# Runs Bytecode from lp.compiler on one operand stack. Calls to procedimientos
+# push the caller on a call stack of the VM's own instead of recursing in
+# Python, so lp recursion is only bounded by memory. Values, Errors and their
+# positions are exactly the evaluator's, whose helpers it shares, and
+# procedimientos are lp.object.Function values closing over the same Frames.
+class VM:
+
+  def __init__(self, compiler: Optional[Compiler] = None) -> None:
+    self._compiler: Compiler = Compiler() if compiler is None else compiler
+
+  def run(self, bytecode: Bytecode, env: Env) -> Optional[Object]:
+    compile_body = self._compiler.compile_body
+    instructions: array = bytecode.instructions
+    constants: List[Any] = bytecode.constants
+    positions: Dict[int, int] = bytecode.positions
+    stack: List[Any] = []
+    push = stack.append
+    pop = stack.pop
+    calls: List[_Call] = []
+    ip: int = 0
+    # The Environment at the top level and a Frame inside procedimientos,
+    # where all the opcodes reading it as one run.
+    frame: Any = env
+
+    # Ordered by how often each opcode runs.
+    while True:
+      opcode: int = instructions[ip]
+
+      if opcode == _GET_LOCAL:
+        value: Any = frame.values[instructions[ip + 1]]
+
+        if value is None:
+          value = _evaluate_unset_local(constants[instructions[ip + 2]], frame.outer)
+          if type(value) == Error and value.position < 0:
+            value.position = positions[ip]
+
+        push(value)
+        ip += 3
+      elif opcode == _CONSTANT:
+        push(constants[instructions[ip + 1]])
+        ip += 2
+      elif opcode == _TYPED_INFIX:
+        right: Any = pop()
+        stack[-1] = constants[instructions[ip + 1]](stack[-1].value, right.value)
+        ip += 2
+      elif opcode == _INFIX:
+        right = pop()
+        left: Any = stack[-1]
+        operator, integer_operation, string_operation = constants[instructions[ip + 1]]
+        left_type = left.object_type
+        right_type = right.object_type
+
+        if left_type is _INTEGER and right_type is _INTEGER and integer_operation is not None:
+          stack[-1] = integer_operation(left.value, right.value)
+        elif left_type is _STRING and right_type is _STRING and string_operation is not None:
+          stack[-1] = string_operation(left.value, right.value)
+        else:
+          value = stack[-1] = _evaluate_infix_expression(operator, left, right)
+          if type(value) == Error and value.position < 0:
+            value.position = positions[ip]
+
+        ip += 2
+      elif opcode == _JUMP_IF_FALSE:
+        value = pop()
+
+        if value is NULL or value is FALSE:
+          ip = instructions[ip + 1]
+        else:
+          ip += 2
+      elif opcode == _CALL:
+        count: int = instructions[ip + 1]
+        start: int = len(stack) - count
+        fn: Any = stack[start - 1]
+        args: List[Object] = stack[start:]
+        del stack[start - 1:]
+
+        if type(fn) == Function:
+          calls.append((instructions, constants, positions, ip + 2, frame))
+          body: Bytecode = compile_body(fn.body)
+          frame = _extend_function_environment(fn, args)
+          instructions, constants, positions = body.instructions, body.constants, body.positions
+          ip = 0
+          continue
+        elif type(fn) == Builtin:
+          value = fn.fn(*args)
+        else:
+          value = _new_error(_NOT_A_FUNCTION, [fn.object_type.name])
+
+        if type(value) == Error and value.position < 0:
+          value.position = positions[ip]
+
+        push(value)
+        ip += 2
+      elif opcode == _RETURN_OPCODE:
+        value = pop()
+        assert value is not None
+
+        if type(value) == Return:
+          value = value.value
+        instructions, constants, positions, ip, frame = calls.pop()
+
+        # Located at the call, two words back.
+        if type(value) == Error and value.position < 0:
+          value.position = positions[ip - 2]
+
+        push(value)
+      elif opcode == _STOP:
+        value = stack[-1]
+
+        if value is not None and (value.object_type is _RETURN or value.object_type is _ERROR):
+          ip = instructions[ip + 1]
+        else:
+          pop()
+          ip += 2
+      elif opcode == _JUMP:
+        ip = instructions[ip + 1]
+      elif opcode == _GET_OUTER:
+        outer: Any = frame.display[instructions[ip + 1] - 1]
+        value = outer.values[instructions[ip + 2]]
+
+        if value is None:
+          value = _evaluate_unset_local(constants[instructions[ip + 3]], outer.outer)
+          if type(value) == Error and value.position < 0:
+            value.position = positions[ip]
+
+        push(value)
+        ip += 4
+      elif opcode == _GET_GLOBAL:
+        value = _evaluate_global(constants[instructions[ip + 1]], frame.globals)
+
+        if type(value) == Error and value.position < 0:
+          value.position = positions[ip]
+
+        push(value)
+        ip += 2
+      elif opcode == _SET_LOCAL:
+        frame.values[instructions[ip + 1]] = pop()
+        ip += 2
+      elif opcode == _SET_GLOBAL:
+        frame[constants[instructions[ip + 1]]] = pop()
+        ip += 2
+      elif opcode == _FUNCTION:
+        function: Any = constants[instructions[ip + 1]]
+        push(Function(function.parameters, function.body, frame))
+        ip += 2
+      elif opcode == _TYPED_MINUS:
+        stack[-1] = new_integer(-stack[-1].value)
+        ip += 1
+      elif opcode == _BANG:
+        value = stack[-1]
+        stack[-1] = TRUE if value is FALSE or value is NULL else FALSE
+        ip += 1
+      elif opcode == _PREFIX:
+        value = stack[-1] = _evaluate_prefix_expression(constants[instructions[ip + 1]], stack[-1])
+
+        if type(value) == Error and value.position < 0:
+          value.position = positions[ip]
+        ip += 2
+      elif opcode == _RETURN_WRAP:
+        stack[-1] = Return(stack[-1])
+        ip += 1
+      elif opcode == _NONE:
+        push(None)
+        ip += 1
+      elif opcode == _POP:
+        pop()
+        ip += 1
+      elif opcode == _HALT:
+        value = pop()
+
+        if type(value) == Return:
+          return value.value
+        return value
+      else:
+        raise ValueError(f'Instruccion desconocida: {opcode}')
+
+# Runs the program the way evaluate(program, env) does.
+def execute(program: Program, env: Env) -> Optional[Object]:
+  compiler: Compiler = Compiler()
+
+  return VM(compiler).run(compiler.compile(program), env)
@@ -1,10 +1,70 @@
-from lp.repl import start_repl
+from argparse import ArgumentParser
+from pathlib import Path
+from sys import exit, stderr
+
+from lp.cache import ProgramCache
+from lp.engines import ENGINES
+from lp.lexer import Lexer
+from lp.optimizer import LEVELS, Optimizer, verify
+from lp.parser import Parser
+from lp.repl import run_script, start_repl
+from lp.transpiler import transpile
 
 def main() -> None:
-  print('Bienvenido al nuestro lenguaje de progración.')
-  print('Escribe una oración para comenzar.')
+  parser = ArgumentParser()
+  parser.add_argument('script', nargs='?', help='archivo .lp a ejecutar')
+  parser.add_argument('--cache', metavar='DIRECTORIO', help='guarda los programas parseados en DIRECTORIO')
+  parser.add_argument('--cache-size', type=int, default=64 * 2**20, help='tamaño maximo del cache en bytes')
+  parser.add_argument(
+    '-O', dest='level', type=int, choices=sorted(LEVELS), default=0,
+    help='nivel de optimizacion: -O0 ninguna, -O1 basicas, -O2 todas'
+  )
+  parser.add_argument('--pases', action='store_true', help='muestra el tiempo y los nodos cambiados por cada pase')
+  parser.add_argument(
+    '--verificar', action='store_true',
+    help='compara el resultado del programa optimizado con el del original'
+  )
+  parser.add_argument(
+    '--motor', choices=sorted(ENGINES), default='arbol',
+    help='como ejecutar el programa: arbol recorre el AST, adaptativo lo recorre especializando sus nodos, '
+         'closures lo compila a funciones de Python, vm lo compila a bytecode para una maquina de pila, '
+         'python lo traduce a codigo Python'
+  )
+  parser.add_argument(
+    '--mostrar-python', action='store_true',
+    help='muestra el codigo Python que genera el motor python, sin ejecutarlo'
+  )
+  args = parser.parse_args()
+  
+  if args.script is None:
+    print('Bienvenido al nuestro lenguaje de progración.')
+    print('Escribe una oración para comenzar.')
+    
+    start_repl()
+    return
+  
+  source: str = Path(args.script).read_text(encoding='utf-8')
+  
+  if args.verificar:
+    difference = verify(source, args.level)
+    print(difference or 'verificado: mismos resultados', file=stderr)
+    exit(1 if difference else 0)
+  
+  cache = ProgramCache(args.cache, args.cache_size) if args.cache else None
+  optimizer = Optimizer(args.level)
+  
+  if args.mostrar_python:
+    print(transpile(optimizer.optimize(Parser(Lexer(source)).parse_program())), end='')
+    return
+  
+  run_script(source, cache, optimizer, ENGINES[args.motor])
+  
+  if cache is not None:
+    print(f'cache: {cache.hits} aciertos, {cache.misses} fallos', file=stderr)
   
-  start_repl()
+  if args.pases:
+    for report in optimizer.reports:
+      print(f'{report.name:<24} {report.seconds * 1000:>9.3f} ms {report.changed:>8} nodos', file=stderr)
 
 if __name__ == '__main__':
   main()
@@ -0,0 +1,117 @@
+from os import DirEntry, scandir, utime
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from benchmarks.workload import functions_program, sample_program
+from lp.cache import ProgramCache
+from lp.lexer import Lexer
+from lp.parser import Parser
+from tests.helpers import dump_ast
+
+class CacheTest(TestCase):
+  
+  def setUp(self) -> None:
+    self._directory = TemporaryDirectory()
+    
+  def tearDown(self) -> None:
+    self._directory.cleanup()
+  
+  def test_hit_after_miss(self) -> None:
+    source: str = sample_program(2_000)
+    cache: ProgramCache = ProgramCache(self._directory.name)
+    
+    first = cache.parse_program(source)
+    second = ProgramCache(self._directory.name).parse_program(source)
+    
+    self.assertEqual((cache.hits, cache.misses), (0, 1))
+    self.assertEqual(dump_ast(second), dump_ast(first))
+    self.assertEqual(dump_ast(second), dump_ast(Parser(Lexer(source)).parse_program()))
+    
+  def test_errors_are_cached(self) -> None:
+    source: str = 'variable x = ;\n"\0" @'
+    parser: Parser = Parser(Lexer(source))
+    parser.parse_program()
+    
+    ProgramCache(self._directory.name).parse_program(source)
+    cache: ProgramCache = ProgramCache(self._directory.name)
+    cache.parse_program(source)
+    
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.errors, parser.errors)
+    self.assertEqual(cache.error_positions, parser.error_positions)
+    
+  def test_corrupt_entry_is_a_miss(self) -> None:
+    cache: ProgramCache = ProgramCache(self._directory.name)
+    cache.parse_program('1 + 2;')
+    
+    path: Path = Path(self._directory.name) / (cache.key('1 + 2;') + '.lpc')
+    path.write_bytes(path.read_bytes()[:-3])
+    
+    self.assertIsNone(cache.load('1 + 2;'))
+    self.assertFalse(path.exists())
+    self.assertEqual(cache.misses, 2)
+    
+  def test_flipped_bytes_are_a_miss(self) -> None:
+    source: str = functions_program(300) + 'f_0(1, 2, 3, 4);'
+    expected: str = dump_ast(Parser(Lexer(source)).parse_program())
+    cache: ProgramCache = ProgramCache(self._directory.name)
+    cache.parse_program(source)
+
+    path: Path = Path(self._directory.name) / (cache.key(source) + '.lpc')
+    data: bytes = path.read_bytes()
+    random: Random = Random(5)
+
+    for _ in range(100):
+      corrupt: bytearray = bytearray(data)
+      corrupt[random.randrange(len(corrupt))] ^= 1 << random.randrange(8)
+      path.write_bytes(corrupt)
+
+      loaded: ProgramCache = ProgramCache(self._directory.name)
+      self.assertEqual(dump_ast(loaded.parse_program(source)), expected)
+      self.assertEqual((loaded.hits, loaded.misses), (0, 1))
+      self.assertEqual(path.read_bytes(), data)
+
+  def test_entries_removed_by_other_runs(self) -> None:
+    ProgramCache(self._directory.name).parse_program('1;')
+
+    with patch('lp.cache.utime', side_effect=FileNotFoundError):
+      cache: ProgramCache = ProgramCache(self._directory.name)
+      self.assertIsNotNone(cache.load('1;'))
+      self.assertEqual(cache.hits, 1)
+
+    # Every entry is gone by the time eviction looks at it.
+    def scandir_after_removal(directory: Path) -> List[DirEntry]:
+      entries: List[DirEntry] = list(scandir(directory))
+      for entry in entries:
+        Path(entry.path).unlink()
+      return entries
+
+    small: ProgramCache = ProgramCache(self._directory.name, max_bytes=0)
+    with patch('lp.cache.scandir', scandir_after_removal):
+      small.parse_program('2;')
+
+    self.assertEqual(small.evictions, 0)
+
+  def test_least_recently_used_entries_are_evicted(self) -> None:
+    sources = [sample_program(1_000) + f'{n};' for n in range(3)]
+    cache: ProgramCache = ProgramCache(self._directory.name)
+    
+    for age, source in enumerate(sources):
+      cache.parse_program(source)
+      path = Path(self._directory.name) / (cache.key(source) + '.lpc')
+      utime(path, (age, age))
+      
+    cache.load(sources[0])
+    size: int = path.stat().st_size
+    
+    small: ProgramCache = ProgramCache(self._directory.name, max_bytes=size + size // 2)
+    small.parse_program('1;')
+    
+    self.assertEqual(small.evictions, 2)
+    self.assertIsNotNone(small.load(sources[0]))
+    self.assertIsNone(small.load(sources[1]))
+    self.assertIsNone(small.load(sources[2]))
@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from benchmarks.workload import SHAPES
+from lp.ast import Program
+from lp.closure_compiler import Code, compile_program, execute
+from lp.evaluator import evaluate
+from lp.lazy_parser import LazyParser
+from lp.lexer import Lexer
+from lp.object import Environment, Error, Object
+from lp.optimizer import Optimizer
+from lp.parser import Parser
+from tests import evaluator_test
+
+class ClosureCompilerTest(TestCase):
+
+  def test_same_results_as_evaluate(self) -> None:
+    for shape, generate in SHAPES.items():
+      with self.subTest(shape=shape):
+        source: str = generate(5_000) + 'f_0(1, 2, 3, 4) + 1 + verdadero;'
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+        assert expected is not None and result is not None
+        self.assertEqual(result.inspect(), expected.inspect())
+        self.assertEqual(getattr(result, 'position', None), getattr(expected, 'position', None))
+
+  def test_compiled_once_run_many_times(self) -> None:
+    source: str = 'variable f = procedimiento(n) { si (n < 2) { n } si_no { f(n - 1) + f(n - 2) } }; f(x);'
+    code: Code = compile_program(Parser(Lexer(source)).parse_program())
+
+    for x, expected in [(10, '55'), (15, '610')]:
+      env: Environment = Environment()
+      env['x'] = execute(Parser(Lexer(str(x))).parse_program(), Environment())
+      self.assertEqual(code(env).inspect(), expected)  # type: ignore
+
+    error = code(Environment())
+    self.assertIsInstance(error, Error)
+    self.assertEqual(error.position, source.index('x);'))  # type: ignore
+
+  def test_lazy_bodies_compile_when_called(self) -> None:
+    source: str = 'variable usada = procedimiento(x) { x * 2 }; variable sin_usar = procedimiento(x) { x + }; usada(21);'
+    program: Program = LazyParser(Lexer(source)).parse_program()
+
+    self.assertEqual(execute(program, Environment()).inspect(), '42')  # type: ignore
+    self.assertIn('_parse_statements', vars(program.statements[1].value.body))  # type: ignore
+
+  def test_optimized_programs(self) -> None:
+    source: str = 'variable f = procedimiento(x, n) { si (n == 0) { 1 } si_no { x * f(x, n - 1) } }; f(3, 4) + f(2, 5);'
+    program: Program = Optimizer(2).optimize(Parser(Lexer(source)).parse_program())
+
+    self.assertEqual(execute(program, Environment()).inspect(), '113')  # type: ignore
+
+# Runs every evaluator test through the compiled closures instead.
+class CompiledEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    evaluated = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+    assert evaluated is not None
+    return evaluated
@@ -0,0 +1,69 @@
+from array import array
+from typing import List
+from unittest import TestCase
+
+from lp.ast import Program
+from lp.compiler import Bytecode, Compiler, Opcode, disassemble
+from lp.lazy_parser import LazyParser
+from lp.lexer import Lexer
+from lp.parser import Parser
+
+class CompilerTest(TestCase):
+
+  def test_disassemble(self) -> None:
+    source: str = 'variable x = 5; x + 10 * 2;'
+    bytecode: Bytecode = Compiler().compile(Parser(Lexer(source)).parse_program())
+
+    self.assertEqual(disassemble(bytecode), '\n'.join([
+      '0000 CONSTANT      0 (5)',
+      '0002 SET_GLOBAL    1 (x)',
+      '0004 GET_GLOBAL    1 (x)',
+      '0006 CONSTANT      2 (10)',
+      '0008 CONSTANT      3 (2)',
+      '0010 INFIX         4 (*)',
+      '0012 INFIX         5 (+)',
+      '0014 HALT',
+    ]))
+
+  def test_compact_code_and_shared_constants(self) -> None:
+    source: str = '1 + 1; "a" + "a"; 1 == verdadero;'
+    bytecode: Bytecode = Compiler().compile(Parser(Lexer(source)).parse_program())
+
+    self.assertIsInstance(bytecode.instructions, array)
+    self.assertEqual([
+      constant.inspect() if hasattr(constant, 'inspect') else constant[0]
+      for constant in bytecode.constants
+    ], ['1', '+', 'a', 'verdadero', '=='])
+
+  def test_statements_stop_on_return_and_errors(self) -> None:
+    source: str = 'variable f = procedimiento(x) { regresa x; x; }; f(1); 2'
+    compiler: Compiler = Compiler()
+    program: Program = Parser(Lexer(source)).parse_program()
+    opcodes = _opcodes(compiler.compile(program))
+
+    self.assertEqual(opcodes.count(Opcode.STOP), 1)
+    self.assertEqual(opcodes[-1], Opcode.HALT)
+
+    body = _opcodes(compiler.compile_body(program.statements[0].value.body))  # type: ignore
+    self.assertEqual(body, [Opcode.GET_LOCAL, Opcode.RETURN_WRAP, Opcode.JUMP, Opcode.RETURN])
+
+  def test_positions_of_instructions_that_can_fail(self) -> None:
+    source: str = 'x + -verdadero'
+    bytecode: Bytecode = Compiler().compile(Parser(Lexer(source)).parse_program())
+
+    self.assertEqual(sorted(bytecode.positions.values()), [0, 2, 4])
+
+  def test_bodies_compiled_once_on_demand(self) -> None:
+    source: str = 'variable usada = procedimiento(x) { x * 2 }; variable sin_usar = procedimiento(x) { x + };'
+    compiler: Compiler = Compiler()
+    program: Program = LazyParser(Lexer(source)).parse_program()
+    compiler.compile(program)
+
+    self.assertIn('_parse_statements', vars(program.statements[0].value.body))  # type: ignore
+
+    body = program.statements[0].value.body  # type: ignore
+    self.assertIs(compiler.compile_body(body), compiler.compile_body(body))
+    self.assertIn('_parse_statements', vars(program.statements[1].value.body))  # type: ignore
+
+def _opcodes(bytecode: Bytecode) -> List[Opcode]:
+  return [Opcode[line.split()[1]] for line in disassemble(bytecode).splitlines()]
@@ -0,0 +1,90 @@
+from typing import List, Tuple
+
+from unittest import TestCase
+
+from benchmarks.workload import duplicated_program
+from lp.ast import Program
+from lp.constant_folding import ConstantFolder, fold_constants
+from lp.engines import ENGINES
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.parser import Parser
+from tests import evaluator_test
+
+class ConstantFoldingTest(TestCase):
+
+  def test_folding(self) -> None:
+    tests: List[Tuple[str, str]] = [
+      ('2 * (5 - 3);', '4'),
+      ('"a" + "b";', 'ab'),
+      ('!verdadero;', 'falso'),
+      ('-7 / 2;', '-4'),
+      ('1 < 2 == verdadero;', 'verdadero'),
+      ('longitud("hola") * x;', '(4 * x)'),
+      ('si (1 < 2) { x } si_no { y };', 'x'),
+      ('si (1 > 2) { x } si_no { regresa y; };', 'si verdadero regresa y;'),
+      ('si (1) { variable a = 3; a };', 'si 1 variable a = 3;a'),
+      ('(si (verdadero) { 1 } si_no { 2 }) + 3;', '4'),
+    ]
+
+    for source, expected in tests:
+      self.assertEqual(str(self._fold(source)), expected)
+
+  def test_runtime_behaviour_is_kept(self) -> None:
+    tests: List[str] = [
+      '5 + verdadero;',
+      '-"a";',
+      '1 / 0;',
+      'longitud(1);',
+      'si (falso) { x };',
+      'variable longitud = procedimiento(x) { 1 }; longitud("hola");',
+      'procedimiento(longitud) { longitud("hola") };',
+    ]
+
+    for source in tests:
+      self.assertEqual(str(self._fold(source)), str(Parser(Lexer(source)).parse_program()))
+
+  def test_shared_subtrees_are_folded_once(self) -> None:
+    program = Parser(Lexer(duplicated_program(2_000)), hash_cons=True).parse_program()
+    folder: ConstantFolder = ConstantFolder(program)
+    folder.visit(program)
+
+    # Both branches of every body share the same longitud("generado") node.
+    self.assertEqual(folder.folded, 1)
+
+  def test_folded_programs_on_every_engine(self) -> None:
+    tests: List[str] = [
+      'si (1) { variable a = 3; a };',
+      'si (verdadero) { regresa 5; } "x";',
+      'variable b = si (falso) { 1 } si_no { variable c = 2; c + 1 }; b * 2;',
+      'variable f = procedimiento(x) { si (1 < 2) { variable y = x; y * 2 } si_no { 0 } }; f(4) + 1;',
+      'variable g = procedimiento() { si (verdadero) { regresa 1; 2 }; 3 }; g();',
+      'si (1) { 5 + verdadero; 1 };',
+      'si ("a") { };',
+    ]
+
+    for source in tests:
+      expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+      for engine, execute in ENGINES.items():
+        with self.subTest(source=source, engine=engine):
+          result = execute(self._fold(source), Environment())
+
+          self.assertEqual(str(result and result.inspect()), str(expected and expected.inspect()))
+
+  def _fold(self, source: str) -> Program:
+    return fold_constants(Parser(Lexer(source)).parse_program())
+
+# Runs every evaluator test again on folded programs.
+class FoldedEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    program: Program = self._fold(source)
+    evaluated = evaluate(program, Environment())
+
+    assert evaluated is not None
+    return evaluated
+
+  def _fold(self, source: str) -> Program:
+    return fold_constants(Parser(Lexer(source)).parse_program())
@@ -161,6 +161,20 @@ class EvaluatorTest(TestCase):
       evaluated = cast(Error, evaluated)
       self.assertEquals(evaluated.message, expected)
   
+  def test_error_positions(self) -> None:
+    tests: List[Tuple[str, int]] = [
+      ('5 + verdadero;', 2),
+      ('variable a = 1;\n-verdadero;', 16),
+      ('variable a = 1;\n  foobar;', 18),
+      ('longitud(1);', 8),
+    ]
+    
+    for source, expected in tests:
+      evaluated = self._evaluate_tests(source)
+      
+      self.assertIsInstance(evaluated, Error)
+      self.assertEqual(cast(Error, evaluated).position, expected)
+  
   def test_assignment_evaluation(self) -> None:
     tests: List[Tuple[str, int]] = [
       ('variable a = 5; a;', 5),
@@ -0,0 +1,120 @@
+from random import Random
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from benchmarks.workload import functions_program, nested_program, sample_program
+from lp.cache import ProgramCache
+from lp.evaluator import evaluate
+from lp.flat_ast import FlatAST, NodeKind
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+from lp.stack_parser import StackParser
+from tests.helpers import dump_ast
+
+_MALFORMED: str = 'variable x = ; si (x) { 1 } si_no { -x } procedimiento(a, b) { a(b) }; "s"; f(1'
+
+class FlatASTTest(TestCase):
+  
+  def test_round_trip(self) -> None:
+    for source in [sample_program(3_000), nested_program(3_000, depth=5), functions_program(3_000), _MALFORMED]:
+      program = Parser(Lexer(source)).parse_program()
+      flat: FlatAST = FlatAST(program)
+      
+      self.assertEqual(dump_ast(flat.program()), dump_ast(program))
+      
+  def test_parse(self) -> None:
+    for source in [sample_program(3_000), functions_program(3_000), _MALFORMED]:
+      with self.subTest(source=source[:40]):
+        parser: Parser = Parser(Lexer(source))
+        flat: FlatAST = FlatAST.parse(parser)
+        expected: Parser = Parser(Lexer(source))
+
+        self.assertEqual(flat.to_bytes(), FlatAST(expected.parse_program()).to_bytes())
+        self.assertEqual(parser.errors, expected.errors)
+
+  def test_str(self) -> None:
+    source: str = sample_program(3_000)
+    program = Parser(Lexer(source)).parse_program()
+    
+    self.assertEqual(str(FlatAST(program)), str(program))
+    
+  def test_evaluate(self) -> None:
+    source: str = sample_program(3_000) + 'suma_1(5, 3);'
+    program = Parser(Lexer(source)).parse_program()
+    expected = evaluate(program, Environment())
+    evaluated = evaluate(FlatAST(program).program(), Environment())
+    
+    assert expected is not None and evaluated is not None
+    self.assertEqual(evaluated.inspect(), expected.inspect())
+    
+  def test_views(self) -> None:
+    flat: FlatAST = FlatAST(Parser(Lexer('variable a = -b * 2;')).parse_program())
+    
+    let = flat.statements[0]
+    self.assertEqual(let.kind, NodeKind.LET)
+    self.assertEqual(let.token.position, 0)
+    
+    name, value = let.children
+    assert name is not None and value is not None
+    self.assertEqual(str(name), 'a')
+    self.assertEqual(value.kind, NodeKind.INFIX)
+    self.assertEqual(str(value), '((-b) * 2)')
+    self.assertEqual([child.kind for child in value.children if child], [NodeKind.PREFIX, NodeKind.INTEGER])
+    self.assertEqual(str(value.materialize()), '((-b) * 2)')
+    self.assertLess(flat.nbytes(), 1_000)
+    
+  def test_bytes_round_trip(self) -> None:
+    program = Parser(Lexer(sample_program(3_000) + _MALFORMED + '"ñ"')).parse_program()
+    flat: FlatAST = FlatAST(program)
+    loaded: FlatAST = FlatAST.from_bytes(flat.to_bytes())
+    
+    self.assertEqual(len(loaded), len(flat))
+    self.assertEqual(dump_ast(loaded.program()), dump_ast(program))
+    
+    with self.assertRaises(ValueError):
+      FlatAST.from_bytes(flat.to_bytes() + b'\0')
+
+  # Without the cache's checksum: any flipped byte is either rejected or
+  # leaves rows that every one of materializes.
+  def test_corrupt_bytes(self) -> None:
+    data: bytes = FlatAST(Parser(Lexer(functions_program(300) + _MALFORMED)).parse_program()).to_bytes()
+    random: Random = Random(13)
+
+    for _ in range(300):
+      corrupt: bytearray = bytearray(data)
+      corrupt[random.randrange(len(corrupt))] ^= 1 << random.randrange(8)
+
+      try:
+        flat: FlatAST = FlatAST.from_bytes(bytes(corrupt))
+      except ValueError:
+        continue
+
+      flat.program()
+      for index in range(len(flat)):
+        flat.materialize(index)
+
+  def test_child_after_its_parent(self) -> None:
+    flat: FlatAST = FlatAST(Parser(Lexer('-1;')).parse_program())
+    flat._children[0] = 1
+
+    with self.assertRaises(ValueError):
+      FlatAST.from_bytes(flat.to_bytes())
+
+  def test_deep_nesting(self) -> None:
+    depth: int = 5_000
+    source: str = '(' * depth + '-' * depth + '1' + ')' * depth + ';' + \
+      'si (x) { ' * depth + 'f(1)' + ' }' * depth
+    flat: FlatAST = FlatAST(StackParser(Lexer(source)).parse_program())
+    loaded: FlatAST = FlatAST.from_bytes(flat.to_bytes())
+
+    self.assertTrue(str(loaded).startswith('(-' * depth + '1' + ')' * depth + 'si x '))
+    self.assertEqual(FlatAST(loaded.program()).to_bytes(), flat.to_bytes())
+
+    with TemporaryDirectory() as directory:
+      cache: ProgramCache = ProgramCache(directory)
+      cache.store(source, flat, [], [])
+      entry = cache.load(source)
+
+    assert entry is not None
+    self.assertEqual(entry[0].to_bytes(), flat.to_bytes())
@@ -0,0 +1,54 @@
+from unittest import TestCase
+
+from benchmarks.workload import addition_chain_program, duplicated_program, sample_program
+from lp.ast import ExpressionStatement, Function, LetStatement
+from lp.evaluator import evaluate
+from lp.hash_cons import HashConser
+from lp.lexer import Lexer
+from lp.object import Environment
+from lp.parser import Parser
+from lp.stack_parser import StackParser
+
+class HashConsTest(TestCase):
+
+  def test_identical_subtrees_are_shared(self) -> None:
+    program = Parser(Lexer('a + b * 2; a + b * 2; a + b * 3;'), hash_cons=True).parse_program()
+    first, second, third = program.statements
+
+    assert isinstance(first, ExpressionStatement) and isinstance(third, ExpressionStatement)
+    self.assertIs(first, second)
+    self.assertIsNot(first, third)
+    self.assertIs(first.expression.left, third.expression.left)  # type: ignore
+
+  def test_function_bodies_are_shared(self) -> None:
+    program = Parser(Lexer(duplicated_program(2_000)), hash_cons=True).parse_program()
+    values = [statement.value for statement in program.statements if isinstance(statement, LetStatement)]
+
+    assert all(isinstance(value, Function) for value in values)
+    self.assertGreater(len(values), 1)
+    self.assertTrue(all(value is values[0] for value in values))
+
+  def test_program_is_unchanged(self) -> None:
+    source: str = sample_program(5_000) + 'suma_3(4, 8);'
+    program = Parser(Lexer(source)).parse_program()
+    shared = Parser(Lexer(source), hash_cons=True).parse_program()
+    expected = evaluate(program, Environment())
+    evaluated = evaluate(shared, Environment())
+
+    self.assertEqual(str(shared), str(program))
+    assert expected is not None and evaluated is not None
+    self.assertEqual(evaluated.inspect(), expected.inspect())
+
+  def test_counts(self) -> None:
+    conser: HashConser = HashConser()
+    conser.program(Parser(Lexer('f(1, 1); f(1, 1);')).parse_program())
+
+    # f, 1 and the call, plus the statement wrapping it.
+    self.assertEqual(conser.visited, 10)
+    self.assertEqual(conser.unique, 4)
+
+  def test_deep_nesting(self) -> None:
+    source: str = addition_chain_program(1, terms=5_000)
+    program = StackParser(Lexer(source), hash_cons=True).parse_program()
+
+    self.assertEqual(len(program.statements), 1)
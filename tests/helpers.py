@@ -0,0 +1,17 @@
+from typing import Any
+
+from lp.ast import ASTNode, Block
+
+def dump_ast(value: Any) -> Any:
+  if isinstance(value, ASTNode):
+    if isinstance(value, Block):
+      # Fills in bodies left for later by LazyParser or FlatAST.
+      value.statements
+    
+    return type(value).__name__, {
+      name: dump_ast(attribute) for name, attribute in vars(value).items()
+    }
+  elif isinstance(value, list):
+    return [dump_ast(item) for item in value]
+  
+  return value
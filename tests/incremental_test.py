@@ -0,0 +1,96 @@
+from random import Random
+from typing import List, Tuple
+from unittest import TestCase
+
+from lp.incremental import IncrementalDocument
+from lp.lexer import Lexer
+from lp.parser import Parser
+from tests.helpers import dump_ast
+
+_SOURCE: str = '''
+variable a = 5;
+variable suma = procedimiento(x, y) {
+  regresa x + y;
+};
+si (a > 1) { suma(a, 2) } si_no { "nada" }
+a
+-1;
+variable b = !verdadero;
+longitud("hola");
+'''
+
+class IncrementalTest(TestCase):
+  
+  def test_edits_match_full_parse(self) -> None:
+    edits: List[Tuple[int, int, str]] = [
+      (_SOURCE.index('5;'), 1, '50'),
+      (_SOURCE.index('a\n-1'), 0, 'variable '),
+      (_SOURCE.index('!verdadero'), 1, '!='),
+      (_SOURCE.index('};'), 1, ''),
+      (0, 0, 'variable c = 1;'),
+      (len(_SOURCE), 0, ' c * 2'),
+      (_SOURCE.index('"hola"'), 1, ''),
+    ]
+    
+    for offset, removed, inserted in edits:
+      document: IncrementalDocument = IncrementalDocument(_SOURCE)
+      document.edit(offset, removed, inserted)
+      
+      self._assert_matches_full_parse(document)
+      
+  def test_untouched_statements_are_reused(self) -> None:
+    document: IncrementalDocument = IncrementalDocument(_SOURCE)
+    before = document.program.statements
+    
+    offset = _SOURCE.index('"nada"') + 1
+    after = document.edit(offset, 4, 'algo').statements
+    
+    self.assertIs(after[0], before[0])
+    self.assertIsNot(after[2], before[2])
+    self.assertIs(after[-1], before[-1])
+    self.assertIs(after[-2], before[-2])
+    self._assert_matches_full_parse(document)
+    
+  def test_random_edit_sequence(self) -> None:
+    random: Random = Random(7)
+    fragments: List[str] = ['', ';', '}', '{', '(', ')', 'x', ' + 1', '"', '-', '=', 'si', 'variable z = 3;']
+    document: IncrementalDocument = IncrementalDocument(_SOURCE)
+    
+    for _ in range(300):
+      offset = random.randint(0, len(document.source))
+      removed = random.randint(0, min(3, len(document.source) - offset))
+      document.edit(offset, removed, random.choice(fragments))
+      
+      self._assert_matches_full_parse(document)
+  
+  def test_edit_merging_with_the_previous_token(self) -> None:
+    document: IncrementalDocument = IncrementalDocument('a =b')
+    document.edit(3, 1, '=')
+
+    self.assertEqual(document.error_positions, [4])
+    self._assert_matches_full_parse(document)
+
+  # Short documents and one-character fragments, so edits often land next to
+  # a token they can merge with.
+  def test_random_edits_across_seeds(self) -> None:
+    fragments: List[str] = ['', ' ', ';', '=', '!', '<', '>', 'a', '1', '"', '(', ')', '{', '}', 'si', 'variable ']
+
+    for seed in range(200):
+      random: Random = Random(seed)
+      document: IncrementalDocument = IncrementalDocument('variable a = 1; a == b; !c')
+
+      with self.subTest(seed=seed):
+        for _ in range(20):
+          offset = random.randint(0, len(document.source))
+          removed = random.randint(0, min(2, len(document.source) - offset))
+          document.edit(offset, removed, random.choice(fragments))
+
+          self._assert_matches_full_parse(document)
+
+  def _assert_matches_full_parse(self, document: IncrementalDocument) -> None:
+    parser: Parser = Parser(Lexer(document.source))
+    program = parser.parse_program()
+    
+    self.assertEqual(dump_ast(document.program), dump_ast(program))
+    self.assertEqual(document.errors, parser.errors)
+    self.assertEqual(document.error_positions, parser.error_positions)
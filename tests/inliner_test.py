@@ -0,0 +1,77 @@
+from typing import List, Tuple
+
+from unittest import TestCase
+
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.inliner import Inliner, inline
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.parser import Parser
+from tests import evaluator_test
+
+_HELPERS: str = '''
+variable doble = procedimiento(x) { x * 2 };
+variable incrementa = procedimiento(x) { regresa x + 1; };
+variable cuadrado = procedimiento(x) { x * x };
+'''
+
+class InlinerTest(TestCase):
+
+  def test_inlining(self) -> None:
+    tests: List[Tuple[str, str]] = [
+      ('doble(3);', '(3 * 2)'),
+      ('incrementa(doble(n));', '((n * 2) + 1)'),
+      ('cuadrado(a);', '(a * a)'),
+      ('procedimiento(n) { cuadrado(n) + doble(n * 3) };', 'procedimiento(n) ((n * n) + ((n * 3) * 2))'),
+      ('variable cuarto = procedimiento(x) { doble(doble(x)) }; cuarto(1);', '((1 * 2) * 2)'),
+    ]
+
+    for source, expected in tests:
+      program: Program = inline(Parser(Lexer(_HELPERS + source)).parse_program())
+      self.assertEqual(str(program.statements[-1]), expected)
+
+  def test_calls_left_alone(self) -> None:
+    tests: List[str] = [
+      # Costly argument used twice, or not at all.
+      'cuadrado(f(1));',
+      'variable primero = procedimiento(x, y) { x }; primero(1, f(2));',
+      # Wrong number of arguments.
+      'doble(1, 2);',
+      # Recursive, bound twice, or with a body that binds or returns.
+      'variable f = procedimiento(x) { f(x) }; f(1);',
+      'variable f = procedimiento(x) { x }; variable f = 1; f(1);',
+      'variable f = procedimiento(x) { si (x) { regresa 1; } }; f(1);',
+      # Reads a name a procedimiento binds, so it could mean another variable.
+      'variable f = procedimiento(x) { x + y }; procedimiento(y) { f(1) };',
+    ]
+
+    for source in tests:
+      program: Program = Parser(Lexer(source)).parse_program()
+      expected: str = str(program)
+
+      self.assertEqual(str(inline(program)), expected)
+
+  def test_call_before_binding(self) -> None:
+    program: Program = inline(Parser(Lexer('f(1); variable f = procedimiento(x) { x }; f(1);')).parse_program())
+
+    self.assertEqual([str(statement) for statement in program.statements[::2]], ['f(1)', '1'])
+
+  def test_limits(self) -> None:
+    for options in [{'max_size': 2}, {'exclude': ['doble']}]:
+      program: Program = Parser(Lexer(_HELPERS + 'doble(3);')).parse_program()
+      inliner: Inliner = Inliner(program, **options)  # type: ignore
+      inliner.visit(program)
+
+      self.assertEqual(str(program.statements[-1]), 'doble(3)')
+      self.assertEqual(inliner.inlined, 0)
+
+# Runs every evaluator test again on programs with their helpers inlined.
+class InlinedEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    program: Program = inline(Parser(Lexer(source)).parse_program())
+    evaluated = evaluate(program, Environment())
+
+    assert evaluated is not None
+    return evaluated
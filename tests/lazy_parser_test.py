@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from benchmarks.workload import functions_program, nested_program, sample_program
+from lp.ast import Block, Function, LetStatement
+from lp.engines import ENGINES
+from lp.evaluator import evaluate
+from lp.lazy_parser import LazyParser
+from lp.lexer import Lexer
+from lp.object import Environment, Error, Integer
+from lp.optimizer import Optimizer
+from lp.parser import Parser
+from tests.helpers import dump_ast
+
+_SOURCE: str = '''
+variable usada = procedimiento(x) {
+  variable doble = procedimiento(y) { y * 2 };
+  doble(x) + 1;
+};
+variable sin_usar = procedimiento(x) {
+  regresa x + ;
+};
+usada(20);
+'''
+
+class LazyParserTest(TestCase):
+  
+  def test_checked_program_matches_eager_parse(self) -> None:
+    for source in [sample_program(5_000), functions_program(5_000, statements=3), nested_program(5_000, depth=10)]:
+      parser: Parser = Parser(Lexer(source))
+      program = parser.parse_program()
+      lazy_parser: LazyParser = LazyParser(Lexer(source))
+      lazy_program = lazy_parser.parse_program()
+      
+      self.assertEqual(lazy_parser.check(), [])
+      self.assertEqual(dump_ast(lazy_program), dump_ast(program))
+      
+  def test_bodies_are_parsed_on_first_call(self) -> None:
+    parser: LazyParser = LazyParser(Lexer(_SOURCE))
+    program = parser.parse_program()
+    
+    self.assertEqual(parser.errors, [])
+    used_body = self._body(program.statements[0])
+    unused_body = self._body(program.statements[1])
+    self.assertNotIn('statements', vars(used_body))
+    
+    evaluated = evaluate(program, Environment())
+    
+    assert isinstance(evaluated, Integer)
+    self.assertEqual(evaluated.value, 41)
+    self.assertIn('statements', vars(used_body))
+    self.assertNotIn('statements', vars(unused_body))
+    self.assertEqual(parser.errors, [])
+    
+  def test_check_reports_errors_in_unused_bodies(self) -> None:
+    parser: LazyParser = LazyParser(Lexer(_SOURCE))
+    parser.parse_program()
+    
+    self.assertEqual(parser.check(), ['No se encontro ninguna funcion para parsear ;.'])
+    self.assertEqual(parser.error_positions, [_SOURCE.index('x + ;') + 4])
+    
+  def test_full_check(self) -> None:
+    parser: LazyParser = LazyParser(Lexer(_SOURCE), full_check=True)
+    parser.parse_program()
+    
+    self.assertEqual(parser.errors, ['No se encontro ninguna funcion para parsear ;.'])
+    
+  def test_errors_in_called_bodies(self) -> None:
+    source: str = 'variable f = procedimiento(x) { regresa x + ; }; f(1);'
+
+    for level in (0, 2):
+      for engine, execute in ENGINES.items():
+        with self.subTest(level=level, engine=engine):
+          parser: LazyParser = LazyParser(Lexer(source))
+          program = Optimizer(level).optimize(parser.parse_program())
+          evaluated = execute(program, Environment())
+
+          assert isinstance(evaluated, Error)
+          self.assertEqual(evaluated.message, 'No se encontro ninguna funcion para parsear ;.')
+          self.assertEqual(evaluated.position, source.index('+ ;') + 2)
+          self.assertEqual(parser.errors, [evaluated.message])
+
+  def _body(self, statement: object) -> Block:
+    assert isinstance(statement, LetStatement)
+    assert isinstance(statement.value, Function)
+    assert statement.value.body is not None
+    
+    return statement.value.body
@@ -1,12 +1,16 @@
+from os import remove
+from tempfile import NamedTemporaryFile
 from unittest import TestCase
 from typing import List
 
 from lp.token import (
   Token,
-  TokenType
+  TokenType,
+  symbol_table,
 )
 
-from lp.lexer import Lexer
+from lp.lexer import BufferLexer, Lexer, Span
+from lp.source import map_source
 
 class TexerTest(TestCase):
   def test_illegal(self) -> None:
@@ -254,3 +258,128 @@ class TexerTest(TestCase):
     ]
     
     self.assertEquals(tokens, expected_token)
+
+  def test_identifier_and_number_at_end_of_source(self) -> None:
+    source: str = 'resultado 42'
+    lexer: Lexer = Lexer(source)
+    
+    tokens: List[Token] = []
+    for _ in range(3):
+      tokens.append(lexer.next_token())
+      
+    expected_tokens: List[Token] = [
+      Token(TokenType.IDENT, 'resultado'),
+      Token(TokenType.INT, '42'),
+      Token(TokenType.EOF, ''),
+    ]
+    
+    self.assertEqual(tokens, expected_tokens)
+    
+  def test_unterminated_string(self) -> None:
+    source: str = 'variable a = "sin cerrar'
+    lexer: Lexer = Lexer(source)
+    
+    tokens: List[Token] = []
+    for _ in range(5):
+      tokens.append(lexer.next_token())
+      
+    expected_tokens: List[Token] = [
+      Token(TokenType.LET, 'variable'),
+      Token(TokenType.IDENT, 'a'),
+      Token(TokenType.ASSING, '='),
+      Token(TokenType.STRING, 'sin cerrar'),
+      Token(TokenType.EOF, ''),
+    ]
+    
+    self.assertEqual(tokens, expected_tokens)
+
+  def test_buffer_spans(self) -> None:
+    source: bytes = 'variable año = "é";'.encode('utf-8')
+    lexer: BufferLexer = BufferLexer(source)
+    
+    spans: List[Span] = []
+    for _ in range(6):
+      spans.append(lexer.next_span())
+      
+    expected_spans: List[Span] = [
+      (TokenType.LET, 0, 8),
+      (TokenType.IDENT, 9, 13),
+      (TokenType.ASSING, 14, 15),
+      (TokenType.STRING, 17, 19),
+      (TokenType.SEMICOLON, 20, 21),
+      (TokenType.EOF, 21, 21),
+    ]
+    
+    self.assertEqual(spans, expected_spans)
+    self.assertEqual(lexer.literal(TokenType.IDENT, 9, 13), 'año')
+    
+  def test_buffer_tokens_match_text_tokens(self) -> None:
+    source: str = '''
+      variable suma_ñ = procedimiento(x, y) {
+        regresa x + y >= 10 != falso;
+      };
+      si (suma_ñ(1, 2) <= 3) { "hola" } si_no { !verdadero % 2 }
+      variables si_nos ¡@
+    '''
+    lexer: Lexer = Lexer(source)
+    buffer_lexer: BufferLexer = BufferLexer(memoryview(source.encode('utf-8')))
+    
+    while (token := lexer.next_token()).token_type != TokenType.EOF:
+      self.assertEqual(buffer_lexer.next_token(), token)
+      
+    self.assertEqual(buffer_lexer.next_token(), Token(TokenType.EOF, ''))
+    
+  def test_mapped_source(self) -> None:
+    with NamedTemporaryFile('wb', suffix='.lp', delete=False) as file:
+      file.write('regresa "mapeado";'.encode('utf-8'))
+      
+    try:
+      with map_source(file.name) as buffer:
+        lexer: BufferLexer = BufferLexer(buffer)
+        
+        tokens: List[Token] = []
+        for _ in range(4):
+          tokens.append(lexer.next_token())
+          
+        del lexer
+    finally:
+      remove(file.name)
+      
+    expected_tokens: List[Token] = [
+      Token(TokenType.RETURN, 'regresa'),
+      Token(TokenType.STRING, 'mapeado'),
+      Token(TokenType.SEMICOLON, ';'),
+      Token(TokenType.EOF, ''),
+    ]
+    
+    self.assertEqual(tokens, expected_tokens)
+
+  def test_token_positions(self) -> None:
+    source: str = 'variable a = "b";\n  a >= 10;'
+    lexer: Lexer = Lexer(source)
+    
+    positions: List[int] = []
+    for _ in range(10):
+      positions.append(lexer.next_token().position)
+      
+    self.assertEqual(positions, [0, 9, 11, 13, 16, 20, 22, 25, 27, 28])
+
+  def test_identifiers_are_interned(self) -> None:
+    source: str = 'variable total = total + valor; variable valor = total;'
+    symbols = symbol_table()
+    
+    literals: List[str] = []
+    for lexer in [Lexer(source, symbols=symbols), Lexer(source, symbols=symbols)]:
+      for _ in range(12):
+        token = lexer.next_token()
+        if token.token_type == TokenType.IDENT:
+          literals.append(token.literal)
+    
+    totals: List[str] = [literal for literal in literals if literal == 'total']
+    
+    self.assertEqual(len(totals), 6)
+    for literal in totals:
+      self.assertIs(literal, totals[0])
+    self.assertIs(BufferLexer(source.encode()).literal(TokenType.IDENT, 9, 14), totals[0])
+    self.assertEqual(symbols['variable'], (TokenType.LET, 'variable'))
+    self.assertEqual(symbols['valor'], (TokenType.IDENT, 'valor'))
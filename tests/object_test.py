@@ -0,0 +1,38 @@
+from unittest import TestCase
+
+from lp.builtins import BUILTINS
+from lp.object import (
+  Boolean,
+  Error,
+  Integer,
+  ObjectType,
+  Return,
+  String,
+  new_integer,
+  new_string,
+)
+
+class ObjectTest(TestCase):
+  
+  def test_type_tags(self) -> None:
+    objects = [
+      (Integer(1), ObjectType.INTEGER),
+      (Boolean(True), ObjectType.BOOLEAN),
+      (String('a'), ObjectType.STRING),
+      (Return(Integer(1)), ObjectType.RETURN),
+      (Error('a'), ObjectType.ERROR),
+      (BUILTINS['longitud'], ObjectType.BUILTIN),
+    ]
+    
+    for obj, object_type in objects:
+      self.assertEqual(obj.object_type, object_type)
+      self.assertEqual(obj.type(), object_type)
+      self.assertFalse(hasattr(obj, '__dict__'))
+      
+  def test_cached_values(self) -> None:
+    self.assertIs(new_integer(7), new_integer(3 + 4))
+    self.assertIs(new_integer(-5), new_integer(-5))
+    self.assertIsNot(new_integer(1_000), new_integer(1_000))
+    self.assertEqual(new_integer(1_000).value, 1_000)
+    self.assertIs(new_string(''), new_string(''))
+    self.assertEqual(new_string('hola').value, 'hola')
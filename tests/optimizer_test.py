@@ -0,0 +1,152 @@
+from typing import List, Tuple
+
+from unittest import TestCase
+
+from benchmarks.workload import SHAPES
+from lp.ast import ExpressionStatement, Integer, Program
+from lp.common_subexpressions import eliminate_common_subexpressions
+from lp.dead_code import eliminate_dead_code
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.optimizer import LEVELS, Optimizer, verify
+from lp.parser import Parser
+from lp.stack_parser import StackParser
+from lp.strength_reduction import StrengthReducer, reduce_strength
+from tests import evaluator_test
+
+class OptimizerTest(TestCase):
+
+  def test_common_subexpressions(self) -> None:
+    tests: List[Tuple[str, str]] = [
+      (
+        'procedimiento(a, b) { regresa (a + b) * (a + b) - f(a + b); };',
+        'procedimiento(a, b) variable $0 = (a + b);regresa (($0 * $0) - f($0));',
+      ),
+      (
+        'procedimiento(a) { variable c = -a * -a; c };',
+        'procedimiento(a) variable $0 = (-a);variable c = ($0 * $0);c',
+      ),
+      # Only evaluated in one branch, rebound in between, or not in a procedimiento.
+      ('procedimiento(a) { si (a * 2) { a * 2 } };', 'procedimiento(a) si (a * 2) (a * 2)'),
+      (
+        'procedimiento(a) { (a * 2) + si (a) { variable a = 1; } + (a * 2) };',
+        'procedimiento(a) (((a * 2) + si a variable a = 1;) + (a * 2))',
+      ),
+      ('(a + b) * (a + b);', '((a + b) * (a + b))'),
+    ]
+
+    for source, expected in tests:
+      program: Program = eliminate_common_subexpressions(Parser(Lexer(source)).parse_program())
+      self.assertEqual(str(program), expected)
+
+  def test_strength_reduction(self) -> None:
+    tests: List[Tuple[str, str]] = [
+      ('(2 * x) * 1;', '((2 * x) * 1)'),
+      ('x + 0;', '(x + 0)'),
+      ('(-(2 - 3)) * 1;', '(-(2 - 3))'),
+      ('0 + (4 * 5);', '(4 * 5)'),
+      ('(1 + 2) % 1;', '0'),
+    ]
+
+    for source, expected in tests:
+      program: Program = reduce_strength(Parser(Lexer(source)).parse_program())
+      self.assertEqual(str(program), expected)
+
+  def test_dead_code(self) -> None:
+    tests: List[Tuple[str, str]] = [
+      ('regresa 1; 2;', 'regresa 1;'),
+      ('procedimiento(x) { si (x) { regresa 1; } si_no { foo; regresa 2; } 3; };', 'procedimiento(x) si x regresa 1;si_no fooregresa 2;'),
+      ('procedimiento(x) { si (x) { regresa 1; } 3; };', 'procedimiento(x) si x regresa 1;3'),
+    ]
+
+    for source, expected in tests:
+      program: Program = eliminate_dead_code(Parser(Lexer(source)).parse_program())
+      self.assertEqual(str(program), expected)
+
+  def test_reports(self) -> None:
+    source: str = 'variable doble = procedimiento(x) { x * 2 }; doble(3); regresa 1; 2;'
+    optimizer: Optimizer = Optimizer(2)
+    optimizer.optimize(Parser(Lexer(source)).parse_program())
+
+    self.assertEqual([report.name for report in optimizer.reports], LEVELS[2])
+    self.assertEqual([report.changed for report in optimizer.reports], [1, 1, 0, 0, 1, 0, 0])
+    self.assertTrue(all(report.seconds >= 0 for report in optimizer.reports))
+
+  def test_levels(self) -> None:
+    source: str = 'procedimiento(a) { regresa (a + 1) * (a + 1); 2 * 3; };'
+    program: Program = Parser(Lexer(source)).parse_program()
+
+    self.assertEqual(str(Optimizer(0).optimize(program)), str(Parser(Lexer(source)).parse_program()))
+    self.assertEqual(str(Optimizer(1).optimize(program)), 'procedimiento(a) regresa ((a + 1) * (a + 1));')
+    self.assertEqual(str(Optimizer(2).optimize(program)), 'procedimiento(a) variable $0 = (a + 1);regresa ($0 * $0);')
+
+    with self.assertRaises(ValueError):
+      Optimizer(passes=['desconocido'])
+
+  def test_strength_reduction_uses_inferred_types(self) -> None:
+    source: str = 'variable f = procedimiento(x, s) { x * 1 + longitud(s + "") }; f(2, "a");'
+    program: Program = Optimizer(1).optimize(Parser(Lexer(source)).parse_program())
+
+    self.assertEqual(str(program), 'variable f = procedimiento(x, s) (x + longitud((s + )));f(2, a)')
+
+  def test_strength_reduction_keeps_what_can_raise(self) -> None:
+    tests: List[Tuple[str, str]] = [
+      ('(1 / 0) * 0;', '((1 / 0) * 0)'),
+      ('0 * (7 % 0);', '(0 * (7 % 0))'),
+    ]
+
+    for source, expected in tests:
+      program: Program = Optimizer(2).optimize(Parser(Lexer(source)).parse_program())
+      self.assertEqual(str(program), expected)
+
+    with self.assertRaises(ZeroDivisionError):
+      evaluate(Optimizer(2).optimize(Parser(Lexer('(1 / 0) * 0;')).parse_program()), Environment())
+
+    # Even when every operand is known to give an integer.
+    for source, expected in [
+      ('f(x) * 0 + (x * 0);', '(f(x) * 0)'),
+      ('(a - -b) % 1 + (a / b) * 1;', '(a / b)'),
+    ]:
+      program = StrengthReducer(lambda node: True).visit(Parser(Lexer(source)).parse_program())
+      self.assertEqual(str(program), expected)
+
+  # Nested far deeper than the recursion limit, which the passes leave as is.
+  def test_deep_nesting(self) -> None:
+    depth: int = 3_000
+    source: str = (
+      'variable f = procedimiento(x) { x * 1 };' +
+      '-' * depth + 'f(2 + 0);' +
+      'si (a) { ' * depth + 'a + 0;' + ' }' * depth +
+      'procedimiento(y) { ' + '(y * 2 + ' * depth + 'y * 2' + ')' * depth + ' };'
+    )
+
+    for level in LEVELS:
+      with self.subTest(level=level):
+        optimizer: Optimizer = Optimizer(level)
+        program: Program = optimizer.optimize(StackParser(Lexer(source)).parse_program())
+
+        self.assertEqual(len(program.statements), 4)
+        self.assertEqual([report.name for report in optimizer.reports], LEVELS[level])
+        if level == 2:
+          # f inlined, then folded with the negations.
+          statement = program.statements[1]
+          assert isinstance(statement, ExpressionStatement) and isinstance(statement.expression, Integer)
+          self.assertEqual(statement.expression.value, 2)
+
+  def test_verify_workloads(self) -> None:
+    for shape, generate in SHAPES.items():
+      with self.subTest(shape=shape):
+        self.assertIsNone(verify(generate(3_000) + 'f_0(3, 4);'))
+
+# Verification mode over the evaluator's corpus: every test program gives
+# the same result optimized at -O2 as parsed.
+class OptimizedEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    self.assertIsNone(verify(source))
+    program: Program = Optimizer(2).optimize(Parser(Lexer(source)).parse_program())
+    evaluated = evaluate(program, Environment())
+
+    assert evaluated is not None
+    return evaluated
@@ -0,0 +1,58 @@
+from random import Random
+from typing import List
+from unittest import TestCase
+
+from benchmarks.workload import sample_program
+from lp.lexer import Lexer
+from lp.parallel import ParallelParser, split_source, statement_boundaries
+from lp.parser import Parser
+from tests.helpers import dump_ast
+
+class ParallelTest(TestCase):
+  
+  def test_statement_boundaries(self) -> None:
+    source: str = 'variable a = 1; f(x; y); "a;b"; x + ; procedimiento() { 1; };;'
+    
+    self.assertEqual(statement_boundaries(source), [15, 24, 31, len(source)])
+    
+  def test_split_source(self) -> None:
+    source: str = sample_program(2_000)
+    chunks = split_source(source, 4)
+    
+    self.assertGreater(len(chunks), 1)
+    self.assertEqual(chunks[0][0], 0)
+    self.assertEqual(chunks[-1][1], len(source))
+    
+    for (_, end), (start, _) in zip(chunks, chunks[1:]):
+      self.assertEqual(end, start)
+      
+  def test_matches_sequential_parse(self) -> None:
+    self._assert_matches_sequential_parse(sample_program(5_000), workers=2)
+    
+  def test_malformed_chunks_match_sequential_parse(self) -> None:
+    random: Random = Random(11)
+    fragments: List[str] = [';', '}', '{', '(', ')', 'x', ' + 1', '"', '-', '!', '=', ' * 2', 'si', 'regresa', 'variable z = 3;', 'variable', '; ;']
+    
+    for _ in range(200):
+      source = ''.join(random.choice(fragments) for _ in range(40))
+      
+      self._assert_matches_sequential_parse(source, workers=1, chunks_per_worker=8)
+
+    # Each parse starts a process pool, so fewer but longer sources.
+    for _ in range(5):
+      source = ''.join(random.choice(fragments) for _ in range(400))
+
+      self._assert_matches_sequential_parse(source, workers=2, chunks_per_worker=8)
+
+  def test_brace_closing_a_paren(self) -> None:
+    for workers in (1, 2):
+      self._assert_matches_sequential_parse('"a"(},;,variable<1;', workers=workers, chunks_per_worker=8)
+      
+  def _assert_matches_sequential_parse(self, source: str, **options: int) -> None:
+    parser: Parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    parallel: ParallelParser = ParallelParser(source, **options)
+    
+    self.assertEqual(dump_ast(parallel.parse_program()), dump_ast(program))
+    self.assertEqual(parallel.errors, parser.errors)
+    self.assertEqual(parallel.error_positions, parser.error_positions)
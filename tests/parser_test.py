@@ -114,6 +114,7 @@ class ParserTest(TestCase):
     program: Program = parser.parse_program()
     
     self.assertEquals(len(parser.errors), 1)
+    self.assertEqual(parser.error_positions, [11])
     
   def test_return_statement(self) -> None:
     source: str = '''
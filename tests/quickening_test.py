@@ -0,0 +1,100 @@
+from typing import List
+from unittest import TestCase
+
+from benchmarks.workload import SHAPES
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.lazy_parser import LazyParser
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.optimizer import Optimizer
+from lp.parser import Parser
+from lp.quickening import Quickener, execute
+from tests import evaluator_test
+
+class QuickeningTest(TestCase):
+
+  def test_same_results_as_evaluate(self) -> None:
+    for shape, generate in SHAPES.items():
+      with self.subTest(shape=shape):
+        source: str = generate(5_000) + 'f_0(1, 2, 3, 4) + 1 + verdadero;'
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+        assert expected is not None and result is not None
+        self.assertEqual(result.inspect(), expected.inspect())
+        self.assertEqual(getattr(result, 'position', None), getattr(expected, 'position', None))
+
+  def test_specializes_after_warmup(self) -> None:
+    source: str = '''
+      variable suma = procedimiento(a, b) { a + b };
+      variable f = procedimiento(n) { si (n == 0) { 0 } si_no { suma(n, f(n - 1)) } };
+      f(10);
+    '''
+    quickener: Quickener = Quickener()
+
+    self.assertEqual(quickener.evaluate(Parser(Lexer(source)).parse_program(), Environment()).inspect(), '55')  # type: ignore
+    # n == 0, n - 1 and a + b, and the calls to suma and f.
+    self.assertEqual(quickener.specialized, 5)
+    self.assertEqual(quickener.deoptimized, 0)
+
+  def test_deoptimizes_when_a_guard_fails(self) -> None:
+    source: str = '''
+      variable junta = procedimiento(a, b) { a + b };
+      variable aplica = procedimiento(f, x) { f(x) };
+      junta(1, 2); junta(3, 4); junta("a", "b"); junta(1, 2);
+      aplica(procedimiento(x) { x }, 1) + aplica(procedimiento(x) { x }, 2) + aplica(procedimiento(x) { x * 10 }, 3);
+    '''
+    quickener: Quickener = Quickener()
+    expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+    result = quickener.evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+    self.assertEqual(result.inspect(), expected.inspect())  # type: ignore
+    self.assertEqual(quickener.deoptimized, 2)
+
+  def test_errors_behind_a_failed_guard(self) -> None:
+    source: str = 'variable f = procedimiento(a, b) { a + b }; f(1, 2); f(3, 4); f(1, verdadero);'
+    expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+    result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+    self.assertEqual(result.inspect(), expected.inspect())  # type: ignore
+    self.assertEqual(result.position, expected.position)  # type: ignore
+
+  def test_polymorphic_nodes_stay_generic(self) -> None:
+    source: str = '''
+      variable junta = procedimiento(a, b) { a + b };
+      variable alterna = procedimiento(n) {
+        si (n == 0) { "" } si_no { junta(1, 1); junta(1, 1); junta("a", "b"); alterna(n - 1) }
+      };
+      alterna(20);
+    '''
+    quickener: Quickener = Quickener(max_deoptimizations=3)
+    quickener.evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+    self.assertEqual(quickener.deoptimized, 3)
+
+  def test_lazy_and_optimized_programs(self) -> None:
+    source: str = 'variable f = procedimiento(x, n) { si (n == 0) { 1 } si_no { x * f(x, n - 1) } }; f(3, 4) + f(2, 5);'
+
+    for program in [LazyParser(Lexer(source)).parse_program(), Optimizer(2).optimize(Parser(Lexer(source)).parse_program())]:
+      self.assertEqual(execute(program, Environment()).inspect(), '113')  # type: ignore
+
+  def test_variants_kept_between_runs(self) -> None:
+    source: str = 'variable f = procedimiento(a) { a + 1 }; f(1) + f(2) + f(3);'
+    program: Program = Parser(Lexer(source)).parse_program()
+    quickeners: List[Quickener] = [Quickener() for _ in range(3)]
+
+    for quickener in quickeners:
+      self.assertEqual(quickener.evaluate(program, Environment()).inspect(), '9')  # type: ignore
+
+    # The nodes run once per run finish warming up in the second one.
+    self.assertEqual([quickener.specialized for quickener in quickeners], [1, 5, 0])
+
+# Runs every evaluator test through the quickening evaluator instead.
+class QuickenedEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    evaluated = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+    assert evaluated is not None
+    return evaluated
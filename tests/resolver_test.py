@@ -0,0 +1,108 @@
+from typing import List, Tuple
+
+from unittest import TestCase
+
+from benchmarks.workload import addition_chain_program
+from lp.ast import ASTNode, Function, Identifier, Infix, Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Error, Integer, Object
+from lp.parser import Parser
+from lp.resolver import resolve
+from lp.stack_parser import StackParser
+
+class ResolverTest(TestCase):
+
+  def test_slots(self) -> None:
+    program: Program = resolve(Parser(Lexer('''
+      variable g = 1;
+      variable f = procedimiento(a, b) {
+        variable c = a;
+        procedimiento(d) { a + c + d + g + longitud };
+      };
+    ''')).parse_program())
+
+    identifiers: List[Tuple[str, int, int]] = [
+      (node.value, node.depth, node.slot) for node in self._identifiers(program.statements[1])
+    ]
+    self.assertEqual(identifiers, [
+      ('f', -1, -1),
+      ('a', 0, 0), ('b', 0, 1),
+      ('c', 0, 2), ('a', 0, 0),
+      ('d', 0, 0),
+      ('a', 1, 0), ('c', 1, 2), ('d', 0, 0), ('g', -1, -1), ('longitud', -1, -1),
+    ])
+
+  def test_evaluation(self) -> None:
+    tests: List[Tuple[str, int]] = [
+      ('variable resta = procedimiento(a, b) { a - b }; resta(10, 3);', 7),
+      # Read before its variable statement, x is still the global one.
+      ('variable x = 1; variable f = procedimiento() { variable y = x; variable x = 2; y * 10 + x }; f();', 12),
+      ('variable f = procedimiento() { variable g = procedimiento() { h() }; variable h = procedimiento() { 5 }; g() }; f();', 5),
+      ('variable f = procedimiento(n) { si (n > 0) { variable m = n * 2; } m }; f(4);', 8),
+      ('variable sumador = procedimiento(a) { procedimiento(b) { procedimiento(c) { a + b + c } } }; sumador(1)(2)(3);', 6),
+    ]
+
+    for source, expected in tests:
+      evaluated = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+      assert isinstance(evaluated, Integer)
+      self.assertEqual(evaluated.value, expected)
+
+  def test_missing_argument(self) -> None:
+    evaluated = self._evaluate('procedimiento(x, y) { y }(1);')
+
+    assert isinstance(evaluated, Error)
+    self.assertEqual(evaluated.message, 'Identificador no encontrado: y')
+
+  def test_shared_nodes_in_different_scopes(self) -> None:
+    source: str = 'variable x = 10; variable f = procedimiento(x) { x + 1 }; f(1) * (x + 1);'
+    program: Program = resolve(Parser(Lexer(source), hash_cons=True).parse_program())
+
+    function = program.statements[1].value  # type: ignore
+    outer = program.statements[2].expression.right  # type: ignore
+    assert isinstance(function, Function) and isinstance(outer, Infix)
+    inner = function.body.statements[0].expression  # type: ignore
+    assert isinstance(outer.left, Identifier)
+    self.assertEqual((inner.left.depth, outer.left.depth), (0, -1))
+
+    evaluated = evaluate(program, Environment())
+    assert isinstance(evaluated, Integer)
+    self.assertEqual(evaluated.value, 22)
+
+  def test_unresolved_expressions(self) -> None:
+    tests: List[Tuple[str, int]] = [
+      ('procedimiento(x) { x + 1 }(2);', 3),
+      ('procedimiento(a) { variable b = a * 2; procedimiento(c) { a + b + c } }(1)(3);', 6),
+      ('procedimiento() { g }();', 7),
+    ]
+
+    for source, expected in tests:
+      statement = Parser(Lexer(source)).parse_program().statements[0]
+      environment: Environment = Environment()
+      environment['g'] = Integer(7)
+
+      evaluated = evaluate(statement, environment)
+      assert isinstance(evaluated, Integer)
+      self.assertEqual(evaluated.value, expected)
+
+  def test_deep_nesting(self) -> None:
+    program: Program = StackParser(Lexer(addition_chain_program(1, terms=5_000))).parse_program()
+
+    self.assertTrue(resolve(program).resolved)
+
+  def _evaluate(self, source: str) -> Object:
+    evaluated = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+    assert evaluated is not None
+    return evaluated
+
+  def _identifiers(self, node: object) -> List[Identifier]:
+    if isinstance(node, Identifier):
+      return [node]
+    elif isinstance(node, list):
+      return [identifier for item in node for identifier in self._identifiers(item)]
+    elif isinstance(node, ASTNode):
+      return [identifier for value in vars(node).values() for identifier in self._identifiers(value)]
+
+    return []
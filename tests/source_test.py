@@ -0,0 +1,20 @@
+from unittest import TestCase
+
+from lp.source import LineIndex
+
+class SourceTest(TestCase):
+  
+  def test_line_index(self) -> None:
+    source: str = 'variable a = 1;\n\n  a + verdadero;'
+    lines: LineIndex = LineIndex(source)
+    
+    self.assertEqual(lines.location(0), (1, 1))
+    self.assertEqual(lines.location(9), (1, 10))
+    self.assertEqual(lines.location(16), (2, 1))
+    self.assertEqual(lines.location(21), (3, 5))
+    self.assertEqual(lines.describe(21), 'línea 3, columna 5')
+    
+  def test_line_index_over_bytes(self) -> None:
+    lines: LineIndex = LineIndex('año;\nb;'.encode('utf-8'))
+    
+    self.assertEqual(lines.location(6), (2, 1))
@@ -0,0 +1,83 @@
+from typing import List, Tuple
+
+from unittest import TestCase
+
+from lp.ast import Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.parser import Parser
+from lp.specializer import specialize, Specializer
+from tests import evaluator_test
+
+_POTENCIA: str = '''
+variable potencia = procedimiento(x, n) { si (n == 0) { 1 } si_no { x * potencia(x, n - 1) } };
+'''
+
+class SpecializerTest(TestCase):
+
+  def test_specialization(self) -> None:
+    program: Program = specialize(Parser(Lexer(_POTENCIA + '''
+      variable formatear = procedimiento(formato, fila) { si (formato == "csv") { fila + "," } si_no { fila } };
+      procedimiento(a) { formatear("csv", a) + formatear("csv", a) + potencia(a, 2) };
+    ''')).parse_program())
+
+    self.assertEqual([str(statement) for statement in program.statements], [
+      'variable potencia = procedimiento(x, n) si (n == 0) 1si_no (x * potencia(x, (n - 1)));',
+      'variable potencia$1 = procedimiento(x) (x * potencia$2(x));',
+      'variable potencia$2 = procedimiento(x) (x * potencia$3(x));',
+      'variable potencia$3 = procedimiento(x) 1;',
+      'variable formatear = procedimiento(formato, fila) si (formato == csv) (fila + ,)si_no fila;',
+      'variable formatear$0 = procedimiento(fila) (fila + ,);',
+      'procedimiento(a) ((formatear$0(a) + formatear$0(a)) + potencia$1(a))',
+    ])
+
+  def test_calls_left_alone(self) -> None:
+    tests: List[str] = [
+      # Nothing to fold, no literal argument, or the wrong number of them.
+      'variable f = procedimiento(x, y) { x + y }; f(a, 1);',
+      _POTENCIA + 'potencia(a, b);',
+      _POTENCIA + 'potencia(2);',
+      # Called before it is bound, bound twice, or binding its parameter again.
+      'f(1); variable f = procedimiento(x) { x + 1 };',
+      'variable f = procedimiento(x) { x + 1 }; variable f = 1; f(1);',
+      'variable f = procedimiento(x) { variable x = 2; x + 1 }; f(1);',
+      'variable f = procedimiento(x) { procedimiento(x) { x + 1 } }; f(1);',
+    ]
+
+    for source in tests:
+      with self.subTest(source=source):
+        program: Program = Parser(Lexer(source)).parse_program()
+        expected: str = str(program)
+
+        self.assertEqual(str(specialize(program)), expected)
+
+  def test_cache(self) -> None:
+    program: Program = Parser(Lexer(_POTENCIA + 'potencia(2, 10) + potencia(2, 10) + potencia(3, 1);')).parse_program()
+    specializer: Specializer = Specializer(program, max_entries=4)
+    specializer.visit(program)
+
+    # Four copies for 2^10, the last one calling potencia(2, 6); 3^1 finds
+    # the cache full.
+    self.assertEqual(specializer.copies, 4)
+    self.assertEqual(specializer.specialized, 5)
+    self.assertEqual(str(program.statements[4]), 'variable potencia$3 = procedimiento() (2 * potencia(2, 6));')
+    self.assertEqual(str(program.statements[-1]), '((potencia$0() + potencia$0()) + potencia(3, 1))')
+    self.assertEqual(evaluate(program, Environment()).value, 2051)  # type: ignore
+
+  def test_size_limit(self) -> None:
+    program: Program = Parser(Lexer(_POTENCIA + 'potencia(2, 1);')).parse_program()
+    specializer: Specializer = Specializer(program, max_size=5)
+    specializer.visit(program)
+
+    self.assertEqual(specializer.specialized, 0)
+
+# Runs every evaluator test again on programs with their calls specialized.
+class SpecializedEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    program: Program = specialize(Parser(Lexer(source)).parse_program())
+    evaluated = evaluate(program, Environment())
+
+    assert evaluated is not None
+    return evaluated
@@ -0,0 +1,77 @@
+from random import Random
+from typing import List
+from unittest import TestCase
+
+from benchmarks.workload import (
+  addition_chain_program,
+  functions_program,
+  nested_program,
+  sample_program,
+  string_program,
+)
+from lp.ast import Block, ExpressionStatement, If, Prefix
+from lp.lexer import Lexer
+from lp.parser import Parser
+from lp.stack_parser import StackParser
+from tests.helpers import dump_ast
+
+class StackParserTest(TestCase):
+  
+  def test_matches_recursive_parser(self) -> None:
+    sources: List[str] = [
+      sample_program(5_000),
+      nested_program(5_000, depth=20),
+      addition_chain_program(5_000, terms=100),
+      functions_program(5_000),
+      string_program(5_000, length=100),
+    ]
+    
+    for source in sources:
+      self._assert_matches_recursive_parser(source)
+        
+  def test_malformed_input_matches_recursive_parser(self) -> None:
+    random: Random = Random(5)
+    fragments: List[str] = [
+      ';', '}', '{', '(', ')', 'x', ' + 1', '"', '-', '!', '=', ' * 2', ',',
+      'si', 'si_no', 'regresa', 'procedimiento', 'variable z = 3;', 'f(1, 2)',
+    ]
+    
+    for _ in range(300):
+      self._assert_matches_recursive_parser(''.join(random.choice(fragments) for _ in range(30)))
+      
+  def test_deep_nesting(self) -> None:
+    depth: int = 5_000
+    source: str = '(' * depth + '-' * depth + '1' + ')' * depth + ';' + \
+      'si (x) { ' * depth + '1' + ' }' * depth
+    parser: StackParser = StackParser(Lexer(source))
+    program = parser.parse_program()
+    
+    self.assertEqual(parser.errors, [])
+    self.assertEqual(len(program.statements), 2)
+    
+    statement = program.statements[0]
+    assert isinstance(statement, ExpressionStatement)
+    expression = statement.expression
+    prefixes: int = 0
+    while isinstance(expression, Prefix):
+      expression = expression.right
+      prefixes += 1
+    self.assertEqual(prefixes, depth)
+    
+    statement = program.statements[1]
+    ifs: int = 0
+    while isinstance(statement, ExpressionStatement) and isinstance(statement.expression, If):
+      consequence = statement.expression.consequence
+      assert isinstance(consequence, Block)
+      statement = consequence.statements[0]
+      ifs += 1
+    self.assertEqual(ifs, depth)
+      
+  def _assert_matches_recursive_parser(self, source: str) -> None:
+    parser: Parser = Parser(Lexer(source))
+    program = parser.parse_program()
+    stack_parser: StackParser = StackParser(Lexer(source))
+    
+    self.assertEqual(dump_ast(stack_parser.parse_program()), dump_ast(program))
+    self.assertEqual(stack_parser.errors, parser.errors)
+    self.assertEqual(stack_parser.error_positions, parser.error_positions)
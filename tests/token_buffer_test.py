@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+from lp.lexer import Lexer
+from lp.parser import Parser
+from lp.token import Token, TokenType
+from lp.token_buffer import TokenBuffer
+
+class TokenBufferTest(TestCase):
+  
+  def test_columns(self) -> None:
+    buffer: TokenBuffer = TokenBuffer('variable x = "hola";')
+    
+    self.assertEqual(len(buffer), 6)
+    self.assertEqual(buffer.span(1), (TokenType.IDENT, 9, 10))
+    self.assertEqual(buffer.span(3), (TokenType.STRING, 14, 18))
+    self.assertEqual(buffer.token(3), Token(TokenType.STRING, 'hola'))
+    self.assertEqual(buffer.token_type(5), TokenType.EOF)
+    self.assertEqual(buffer.token_type(50), TokenType.EOF)
+    
+  def test_bytes_source(self) -> None:
+    source: str = 'variable número = 10 >= 9;'
+    text_buffer: TokenBuffer = TokenBuffer(source)
+    bytes_buffer: TokenBuffer = TokenBuffer(source.encode('utf-8'))
+    
+    self.assertEqual(len(text_buffer), len(bytes_buffer))
+    for index in range(len(text_buffer)):
+      self.assertEqual(text_buffer.token(index), bytes_buffer.token(index))
+      
+  def test_parse_from_buffer(self) -> None:
+    source: str = '''
+      variable suma = procedimiento(x, y) {
+        regresa x + y * 2;
+      };
+      si (suma(1, 2) > 3) { "mayor" } si_no { -suma(1, 1) }
+    '''
+    expected: str = str(Parser(Lexer(source)).parse_program())
+    buffer: TokenBuffer = TokenBuffer(source)
+    
+    for _ in range(2):
+      parser: Parser = Parser(buffer.reader())
+      program = parser.parse_program()
+      
+      self.assertEqual(len(parser.errors), 0)
+      self.assertEqual(str(program), expected)
+      
+  def test_reader_from_index(self) -> None:
+    buffer: TokenBuffer = TokenBuffer('variable a = 1; variable b = 2;')
+    reader = buffer.reader(5)
+    
+    self.assertEqual(reader.next_token(), Token(TokenType.LET, 'variable'))
+    self.assertEqual(reader.next_token(), Token(TokenType.IDENT, 'b'))
+    self.assertEqual(reader.index, 7)
@@ -0,0 +1,210 @@
+from typing import Any, Callable, cast, List, Optional
+from unittest import TestCase
+
+from benchmarks.workload import SHAPES
+from lp.ast import ASTNode, ExpressionStatement, If, Program
+from lp.engines import ENGINES
+from lp.evaluator import evaluate
+from lp.lazy_parser import LazyParser
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.optimizer import Optimizer
+from lp.parser import Parser
+from lp.stack_parser import StackParser
+from lp.transpiler import Transpiler, execute, transpile
+from tests import evaluator_test
+
+# Programs whose value depends on the corners of the evaluator's semantics;
+# each one must give the same value, or the same Error at the same position,
+# or fail the same way, as calling a procedimiento whose body gives nothing.
+_SEMANTICS = [
+  '7 / 2; -7 / 2; -7 % 3; 7 / -2',
+  '1 + verdadero',
+  '-"a"',
+  '"a" - "b"',
+  'verdadero + falso; 5',
+  '5(1)',
+  'longitud(1)',
+  'longitud("a", "b")',
+  'x',
+  '1 == "1"; verdadero == verdadero',
+  'variable f = procedimiento() { 1 + verdadero; 2 }; f() + 3',
+  'variable f = procedimiento() { g }; f()',
+  'variable f = procedimiento(x) { variable y = si (x) { regresa 1; }; y }; f(verdadero)',
+  'variable f = procedimiento(x) { 1 + si (x) { regresa 1; } }; f(verdadero)',
+  'variable f = procedimiento(x) { variable y = si (x) { regresa 1; }; y; 2 }; f(verdadero)',
+  'variable f = procedimiento(x) { si (x) { 1 + verdadero; 3 } si_no { 4 }; 5 }; f(verdadero)',
+  'si (verdadero) { regresa 3; 4 }; 5',
+  'si (falso) { 1 }',
+  'si (1 + verdadero) { 1 } si_no { 2 }',
+  'si (nulo_no_existe) { 1 }',
+  'variable x = si (falso) { 1 }; x',
+  'variable x = 1;',
+  '',
+  'variable f = procedimiento(x, y) { y }; f(1)',
+  'variable f = procedimiento() { }; f()',
+  'variable f = procedimiento() { variable a = 1; }; f()',
+  'variable y = 3; variable f = procedimiento(x, y) { y }; f(1)',
+  'variable f = procedimiento(x, x) { x }; f(1, 2) + f(1)',
+  'variable f = procedimiento(x) { x }; f(1, 2, 3)',
+  'variable f = procedimiento() { variable a = b; variable b = 2; a }; variable b = 1; f()',
+  'variable contador = procedimiento() { variable n = 1; variable g = procedimiento() { n }; variable n = 2; g() }; contador()',
+  'variable f = procedimiento() { si (verdadero) { variable z = 5; } z }; f()',
+  'variable w = si (verdadero) { variable q = 4; q + 1 } si_no { 0 }; w + q',
+  'variable f = procedimiento(g) { g(2) }; f(procedimiento(x) { x * 10 })',
+  'procedimiento(x) { x }',
+  '!5; !!verdadero; !nulo_desconocido',
+  'variable f = procedimiento(n) { si (n) { regresa 1 + verdadero; } 2 }; f(1); 3',
+  '"a" + longitud("abc")',
+  'si (1) { variable a = 3; a }',
+  'si (verdadero) { regresa 5; } "x"',
+  'variable f = procedimiento() { si (1) { variable a = 2; regresa a; } 3 }; f() + 1',
+  'variable b = si (verdadero) { variable a = 3; a * 2 }; b',
+  'variable f = procedimiento() { 1 + si (1) { regresa 4; } }; f()',
+]
+
+class TranspilerTest(TestCase):
+
+  def test_same_semantics_as_evaluate(self) -> None:
+    for source in _SEMANTICS:
+      with self.subTest(source=source):
+        expected = _outcome(evaluate, Parser(Lexer(source)).parse_program())
+        result = _outcome(execute, Parser(Lexer(source)).parse_program())
+
+        self.assertEqual(result, expected)
+
+  # Every engine, on the programs the optimizer gives at each level.
+  def test_same_semantics_when_optimized(self) -> None:
+    for source in _SEMANTICS:
+      expected = _outcome(evaluate, Parser(Lexer(source)).parse_program())
+
+      for level in (1, 2):
+        for engine, run in ENGINES.items():
+          with self.subTest(source=source, level=level, engine=engine):
+            program: Program = Optimizer(level).optimize(Parser(Lexer(source)).parse_program())
+
+            self.assertEqual(_outcome(run, program), expected)
+
+  def test_blocks_in_expression_slots(self) -> None:
+    for source in _SEMANTICS[-5:]:
+      with self.subTest(source=source):
+        program: Program = _unwrap_branches(Parser(Lexer(source)).parse_program())
+
+        self.assertEqual(_describe(execute(program, Environment())), _describe(_evaluate(source)))
+
+  def test_unknown_nodes(self) -> None:
+    program: Program = Parser(Lexer('1;')).parse_program()
+    statements: List[Any] = program.statements
+    statements.append(ExpressionStatement(program.statements[0].token, cast(Any, Program([]))))
+
+    with self.assertRaises(ValueError):
+      transpile(program)
+
+  def test_same_results_as_evaluate(self) -> None:
+    for shape, generate in SHAPES.items():
+      with self.subTest(shape=shape):
+        source: str = generate(5_000) + 'f_0(1, 2, 3, 4) + 1 + verdadero;'
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+        self.assertEqual(_describe(result), _describe(expected))
+
+  def test_optimized_programs(self) -> None:
+    source: str = '''
+      variable f = procedimiento(x, n) { si (n == 0) { 1 } si_no { x * f(x, n - 1) } };
+      variable g = procedimiento(a, b) { si (a < b) { a / b } si_no { -(a % b) } };
+      f(3, 4) + f(2, 5) + g(7, 2) + g(-7, 2);
+    '''
+
+    for level in (1, 2):
+      with self.subTest(level=level):
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        program: Program = Optimizer(level).optimize(Parser(Lexer(source)).parse_program())
+
+        self.assertEqual(_describe(execute(program, Environment())), _describe(expected))
+
+  def test_globals_stay_in_the_environment(self) -> None:
+    env: Environment = Environment()
+    execute(Parser(Lexer('variable doble = procedimiento(x) { x * 2 }; variable y = 4;')).parse_program(), env)
+
+    self.assertEqual(execute(Parser(Lexer('doble(y)')).parse_program(), env).inspect(), '8')  # type: ignore
+    self.assertEqual(evaluate(Parser(Lexer('doble')).parse_program(), env).inspect(), env['doble'].inspect())  # type: ignore
+
+  def test_deep_expressions(self) -> None:
+    source: str = ' + '.join(str(term) for term in range(700)) + ' + (1' + ' * (1' * 100 + ')' * 101
+
+    self.assertEqual(execute(Parser(Lexer(source)).parse_program(), Environment()).inspect(), '244651')  # type: ignore
+
+  # Deeper than the generator or CPython's compiler go: evaluated instead.
+  def test_deep_nesting(self) -> None:
+    for source in [
+      'variable x = verdadero; ' + 'si (x) { ' * 150 + '1 + x' + ' }' * 150,
+      'variable f = procedimiento(x) { x }; ' + 'f(' * 300 + '1' + ')' * 300,
+    ]:
+      with self.subTest(source=source[:40]):
+        result = execute(StackParser(Lexer(source)).parse_program(), Environment())
+        expected = evaluate(StackParser(Lexer(source)).parse_program(), Environment())
+
+        self.assertEqual(_describe(result), _describe(expected))
+
+  def test_code_objects_cached(self) -> None:
+    transpiler: Transpiler = Transpiler(max_entries=1)
+    first: str = 'variable f = procedimiento(x) { x + 1 }; f(1)'
+    second: str = 'variable f = procedimiento(x) { x + 2 }; f(1)'
+
+    for source, expected in [(first, '2'), (first, '2'), (second, '3'), (first, '2')]:
+      self.assertEqual(transpiler.run(Parser(Lexer(source)).parse_program(), Environment()).inspect(), expected)  # type: ignore
+
+    self.assertEqual((transpiler.hits, transpiler.misses), (1, 3))
+
+  def test_lazy_programs(self) -> None:
+    source: str = 'variable f = procedimiento(x) { x * 2 }; f(21);'
+
+    self.assertEqual(execute(LazyParser(Lexer(source)).parse_program(), Environment()).inspect(), '42')  # type: ignore
+
+  def test_source(self) -> None:
+    source: str = 'variable doble = procedimiento(x) { x * 2 }; doble(4);'
+    python: str = transpile(Parser(Lexer(source)).parse_program())
+
+    self.assertTrue(python.startswith('def _programa(env):\n'))
+    self.assertIn('  def f1_doble(v1_0_x=None, *_):\n', python)
+    self.assertIn("  env['doble'] = _CompiledFunction(", python)
+
+# Runs every evaluator test through the generated Python instead.
+class TranspiledEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    evaluated = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+    assert evaluated is not None
+    return evaluated
+
+def _evaluate(source: str) -> Optional[Object]:
+  return evaluate(Parser(Lexer(source)).parse_program(), Environment())
+
+# Swaps every si for the block of its consequence, as an optimization pass
+# may leave one in an expression slot.
+def _unwrap_branches(node: Any) -> Any:
+  if isinstance(node, If):
+    return _unwrap_branches(node.consequence)
+  elif isinstance(node, list):
+    return [_unwrap_branches(item) for item in node]
+  elif isinstance(node, ASTNode):
+    for name, value in vars(node).items():
+      if isinstance(value, (ASTNode, list)):
+        setattr(node, name, _unwrap_branches(value))
+
+  return node
+
+# What running the program gives, described, or the exception it fails with.
+def _outcome(run: Callable[[Program, Environment], Optional[Object]], program: Program) -> object:
+  try:
+    return _describe(run(program, Environment()))
+  except AssertionError as error:
+    return type(error)
+
+def _describe(result: object) -> object:
+  if result is None:
+    return None
+
+  return (result.object_type, result.inspect(), getattr(result, 'position', None))  # type: ignore
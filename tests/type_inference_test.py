@@ -0,0 +1,110 @@
+from typing import Any, List, Tuple
+
+from unittest import TestCase
+
+from lp.ast import Infix, NODE_FIELDS, Prefix, Program
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Object
+from lp.optimizer import verify
+from lp.parser import Parser
+from lp.type_inference import infer_types, TypeInference
+from tests import evaluator_test
+
+class TypeInferenceTest(TestCase):
+
+  def test_marks(self) -> None:
+    tests: List[Tuple[str, List[Tuple[str, str]]]] = [
+      ('-(1 + 2) * 3;', [('((-(1 + 2)) * 3)', 'INTEGER'), ('(-(1 + 2))', 'INTEGER'), ('(1 + 2)', 'INTEGER')]),
+      ('"a" + "b" == "ab";', [('((a + b) == ab)', 'STRING'), ('(a + b)', 'STRING')]),
+      ('(1 < 2) == verdadero; !1;', [('((1 < 2) == verdadero)', ''), ('(1 < 2)', 'INTEGER'), ('(!1)', '')]),
+      ('1 + "a"; -"a"; verdadero + 1;', [('(1 + a)', ''), ('(-a)', ''), ('(verdadero + 1)', '')]),
+      # Bound once, directly in the program, and read afterwards.
+      ('variable a = 5; a * 2;', [('(a * 2)', 'INTEGER')]),
+      ('a * 2; variable a = 5;', [('(a * 2)', '')]),
+      ('variable a = 5; variable a = "a"; a * 2;', [('(a * 2)', '')]),
+      ('si (verdadero) { variable a = 5; } a * 2;', [('(a * 2)', '')]),
+      ('variable f = procedimiento() { a * 2 }; variable a = 5; f();', [('(a * 2)', '')]),
+      ('variable a = 5; variable f = procedimiento() { a * 2 }; f();', [('(a * 2)', 'INTEGER')]),
+      # Locals follow the same rule inside their procedimiento.
+      (
+        'variable f = procedimiento() { variable b = 1; b - 1; si (b) { variable c = 1; } c - 1 };',
+        [('(b - 1)', 'INTEGER'), ('(c - 1)', '')],
+      ),
+    ]
+
+    for source, expected in tests:
+      with self.subTest(source=source):
+        self.assertEqual(self._marks(source), expected)
+
+  def test_parameters(self) -> None:
+    tests: List[Tuple[str, List[Tuple[str, str]]]] = [
+      (
+        'variable f = procedimiento(x, s) { x * 2 + longitud(s + s) }; f(1, "a"); f(2, "b");',
+        [('((x * 2) + longitud((s + s)))', ''), ('(x * 2)', 'INTEGER'), ('(s + s)', 'STRING')],
+      ),
+      ('variable f = procedimiento(x) { x * 2 }; f(1); f("a");', [('(x * 2)', '')]),
+      # Called with too few arguments, passed around, or never called.
+      ('variable f = procedimiento(x) { x * 2 }; f(1); f();', [('(x * 2)', '')]),
+      ('variable f = procedimiento(x) { x * 2 }; f(1); variable g = f;', [('(x * 2)', '')]),
+      ('variable f = procedimiento(x) { x * 2 };', [('(x * 2)', '')]),
+      ('variable f = procedimiento(x) { variable x = "a"; x * 2 }; f(1);', [('(x * 2)', '')]),
+      # Recursive calls take the type the outside ones give.
+      (
+        'variable f = procedimiento(n) { si (n < 1) { 0 } si_no { f(n - 1) } }; f(10);',
+        [('(n < 1)', 'INTEGER'), ('(n - 1)', 'INTEGER')],
+      ),
+      (
+        'variable f = procedimiento(n) { si (n < 1) { 0 } si_no { f(verdadero) } }; f(10);',
+        [('(n < 1)', '')],
+      ),
+    ]
+
+    for source, expected in tests:
+      with self.subTest(source=source):
+        self.assertEqual(self._marks(source), expected)
+
+  def test_shared_nodes_need_every_place_to_agree(self) -> None:
+    source: str = 'a + 1; variable a = 1; a + 1;'
+    program: Program = infer_types(Parser(Lexer(source), hash_cons=True).parse_program())
+
+    self.assertIs(program.statements[0].expression, program.statements[2].expression)  # type: ignore
+    self.assertEqual(program.statements[2].expression.operands, '')  # type: ignore
+
+  def test_report(self) -> None:
+    inference: TypeInference = TypeInference()
+    inference.program(Parser(Lexer('variable a = 1; a + 1; a + b; !a;')).parse_program())
+
+    self.assertEqual((inference.specialized, inference.operations), (1, 3))
+
+  def _marks(self, source: str) -> List[Tuple[str, str]]:
+    program: Program = infer_types(Parser(Lexer(source)).parse_program())
+    marks: List[Tuple[str, str]] = []
+    stack: List[Any] = list(reversed(program.statements))
+
+    while stack:
+      node = stack.pop()
+      if node is None:
+        continue
+      elif type(node) in (Infix, Prefix):
+        marks.append((str(node), node.operands))
+
+      _, child_fields, list_fields = NODE_FIELDS[type(node)]
+      children: List[Any] = [getattr(node, field) for field in child_fields]
+      for field in list_fields:
+        children.extend(getattr(node, field) or ())
+      stack.extend(reversed(children))
+
+    return marks
+
+# The evaluator's corpus, evaluated through the specialized paths wherever
+# the types were proven.
+class TypedEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    self.assertIsNone(verify(source, passes=['type_inference']))
+    program: Program = infer_types(Parser(Lexer(source)).parse_program())
+    evaluated = evaluate(program, Environment())
+
+    assert evaluated is not None
+    return evaluated
@@ -0,0 +1,157 @@
+from typing import Any, List
+from unittest import TestCase
+
+from benchmarks.workload import SHAPES
+from lp.ast import ASTNode, If, Program
+from lp.compiler import Bytecode, Compiler
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Error, Object
+from lp.optimizer import Optimizer
+from lp.parser import Parser
+from lp.vm import VM, execute
+from tests import evaluator_test
+
+class VMTest(TestCase):
+
+  def test_same_results_as_evaluate(self) -> None:
+    for shape, generate in SHAPES.items():
+      with self.subTest(shape=shape):
+        source: str = generate(5_000) + 'f_0(1, 2, 3, 4) + 1 + verdadero;'
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+        assert expected is not None and result is not None
+        self.assertEqual(result.inspect(), expected.inspect())
+        self.assertEqual(getattr(result, 'position', None), getattr(expected, 'position', None))
+
+  def test_compiled_once_run_many_times(self) -> None:
+    source: str = 'variable f = procedimiento(n) { si (n < 2) { n } si_no { f(n - 1) + f(n - 2) } }; f(x);'
+    compiler: Compiler = Compiler()
+    bytecode: Bytecode = compiler.compile(Parser(Lexer(source)).parse_program())
+    vm: VM = VM(compiler)
+
+    for x, expected in [(10, '55'), (15, '610')]:
+      env: Environment = Environment()
+      env['x'] = execute(Parser(Lexer(str(x))).parse_program(), Environment())
+      self.assertEqual(vm.run(bytecode, env).inspect(), expected)  # type: ignore
+
+    error = vm.run(bytecode, Environment())
+    self.assertIsInstance(error, Error)
+    self.assertEqual(error.position, source.index('x);'))  # type: ignore
+
+  def test_recursion_deeper_than_python(self) -> None:
+    source: str = 'variable cuenta = procedimiento(n) { si (n == 0) { 0 } si_no { 1 + cuenta(n - 1) } }; cuenta(20000);'
+
+    self.assertEqual(execute(Parser(Lexer(source)).parse_program(), Environment()).inspect(), '20000')  # type: ignore
+
+  def test_closures_and_builtins(self) -> None:
+    source: str = '''
+      variable sumador = procedimiento(base) { procedimiento(x) { base + x } };
+      variable mas_dos = sumador(2);
+      variable compone = procedimiento(f, g) { procedimiento(x) { f(g(x)) } };
+      compone(mas_dos, longitud)("hola") + mas_dos(1);
+    '''
+
+    self.assertEqual(execute(Parser(Lexer(source)).parse_program(), Environment()).inspect(), '9')  # type: ignore
+
+  def test_errors_located_like_evaluate(self) -> None:
+    tests = [
+      'variable f = procedimiento() { 1 + verdadero; 2 }; f() + 3;',
+      'variable f = procedimiento() { g }; f();',
+      '5(1);',
+      'longitud(1, 2);',
+      '-"a";',
+    ]
+
+    for source in tests:
+      with self.subTest(source=source):
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+        self.assertEqual(result.inspect(), expected.inspect())  # type: ignore
+        self.assertEqual(result.position, expected.position)  # type: ignore
+
+  def test_returns_inside_expressions(self) -> None:
+    tests = [
+      'variable f = procedimiento(x) { variable y = si (x) { regresa 1; }; 2 }; f(verdadero);',
+      'variable f = procedimiento(x) { 1 + si (x) { regresa 1; } }; f(verdadero);',
+      'si (verdadero) { regresa 3; 4 }; 5',
+      'variable x = 1;',
+      '',
+    ]
+
+    for source in tests:
+      with self.subTest(source=source):
+        expected = evaluate(Parser(Lexer(source)).parse_program(), Environment())
+        result = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+        self.assertEqual(None if result is None else result.inspect(), None if expected is None else expected.inspect())
+
+  def test_optimized_programs(self) -> None:
+    source: str = 'variable f = procedimiento(x, n) { si (n == 0) { 1 } si_no { x * f(x, n - 1) } }; f(3, 4) + f(2, 5);'
+    program: Program = Optimizer(2).optimize(Parser(Lexer(source)).parse_program())
+
+    self.assertEqual(execute(program, Environment()).inspect(), '113')  # type: ignore
+
+  def test_blocks_in_expression_slots(self) -> None:
+    tests = [
+      ('si (1) { variable a = 3; a };', '3'),
+      ('si (verdadero) { regresa 5; } "x";', '5'),
+      ('variable b = si (1) { variable a = 3; a * 2 }; b;', '6'),
+      ('variable f = procedimiento() { 1 + si (1) { regresa 4; } }; f();', 'Error: Discrepancia de tipos: INTEGER + RETURN'),
+    ]
+
+    for source, expected in tests:
+      with self.subTest(source=source):
+        program: Program = self._unwrap_branches(Parser(Lexer(source)).parse_program())
+        evaluated = evaluate(self._unwrap_branches(Parser(Lexer(source)).parse_program()), Environment())
+        result = execute(program, Environment())
+
+        assert evaluated is not None and result is not None
+        self.assertEqual((result.inspect(), evaluated.inspect()), (expected, expected))
+
+  def test_unknown_nodes(self) -> None:
+    program: Program = Parser(Lexer('1;')).parse_program()
+    statements: List[Any] = program.statements
+    statements.append(Program([]))
+
+    with self.assertRaises(ValueError):
+      Compiler().compile(program)
+
+  # Swaps every si for the block of its consequence, as an optimization pass
+  # may leave one in an expression slot.
+  def _unwrap_branches(self, node: Any) -> Any:
+    if isinstance(node, If):
+      return self._unwrap_branches(node.consequence)
+    elif isinstance(node, list):
+      return [self._unwrap_branches(item) for item in node]
+    elif isinstance(node, ASTNode):
+      for name, value in vars(node).items():
+        if isinstance(value, (ASTNode, list)):
+          setattr(node, name, self._unwrap_branches(value))
+
+    return node
+
+# Runs every evaluator test through the bytecode VM instead.
+class VMEvaluatorTest(evaluator_test.EvaluatorTest):
+
+  def _evaluate_tests(self, source: str) -> Object:
+    evaluated = execute(Parser(Lexer(source)).parse_program(), Environment())
+
+    assert evaluated is not None
+    return evaluated
+
+# And on optimized programs, which can hold what the parser never gives.
+class OptimizedVMEvaluatorTest(evaluator_test.EvaluatorTest):
+  level: int = 1
+
+  def _evaluate_tests(self, source: str) -> Object:
+    program: Program = Optimizer(self.level).optimize(Parser(Lexer(source)).parse_program())
+    evaluated = execute(program, Environment())
+
+    assert evaluated is not None
+    return evaluated
+
+class FullyOptimizedVMEvaluatorTest(OptimizedVMEvaluatorTest):
+  level: int = 2
@@ -0,0 +1,21 @@
+from unittest import TestCase
+
+from benchmarks.workload import SHAPES
+from lp.evaluator import evaluate
+from lp.lexer import Lexer
+from lp.object import Environment, Error
+from lp.parser import Parser
+
+class WorkloadTest(TestCase):
+  
+  def test_shapes_generate_valid_programs(self) -> None:
+    for shape, generate in SHAPES.items():
+      with self.subTest(shape=shape):
+        source: str = generate(20_000)
+        parser: Parser = Parser(Lexer(source))
+        program = parser.parse_program()
+        
+        self.assertGreaterEqual(len(source), 20_000)
+        self.assertEqual(parser.errors, [])
+        self.assertGreater(len(program.statements), 1)
+        self.assertNotIsInstance(evaluate(program, Environment()), Error)